@@ -0,0 +1,83 @@
+"""Artifact loading off the event loop, cached by mtime and size."""
+
+import asyncio
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from path_validation import validate_artifact_path
+
+# Files at least this large are decoded straight from a memory map
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+
+DEFAULT_MAX_ENTRIES = 32
+
+
+def read_text(path: str, size: int | None = None) -> str:
+    """Read a UTF-8 file, memory-mapping it when it is large."""
+    if size is None:
+        size = os.stat(path).st_size
+    if size < MMAP_THRESHOLD_BYTES:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return str(m, "utf-8")
+
+
+class ArtifactCache:
+    """LRU of artifact contents keyed by resolved path.
+
+    An entry is reused only while the file's (mtime_ns, size) is unchanged,
+    so edits between review cycles are always picked up. Lookups run in a
+    worker thread together with path validation, so the resolve/exists/stat
+    syscalls and any read never block the event loop.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[tuple[int, int], str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, path: str, project_root: str, timings: dict | None) -> tuple[str, str]:
+        started = time.monotonic()
+        validated = validate_artifact_path(path, project_root=project_root)
+        st = os.stat(validated)
+        validated_at = time.monotonic()
+        if timings is not None:
+            timings["path_validation"] = (validated_at - started) * 1000
+        version = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(validated)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(validated)
+                self.hits += 1
+                if timings is not None:
+                    timings["artifact_read"] = (time.monotonic() - validated_at) * 1000
+                return validated, entry[1]
+        content = read_text(validated, st.st_size)
+        if timings is not None:
+            timings["artifact_read"] = (time.monotonic() - validated_at) * 1000
+        with self._lock:
+            self.misses += 1
+            self._entries[validated] = (version, content)
+            self._entries.move_to_end(validated)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return validated, content
+
+    async def load(self, path: str, project_root: str, timings: dict | None = None) -> tuple[str, str]:
+        """Validate `path` and return (resolved path, contents).
+
+        Raises ValueError or FileNotFoundError like validate_artifact_path.
+        If `timings` is given, "path_validation" and "artifact_read" (ms) are
+        set in it.
+        """
+        return await asyncio.to_thread(self._load, path, project_root, timings)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
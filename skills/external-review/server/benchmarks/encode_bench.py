@@ -0,0 +1,85 @@
+"""Request encoding benchmark: per-attempt json= bodies vs shared templates.
+
+Encodes the bodies one review sends for `--models` models × `--attempts`
+attempts over an artifact of `--size-kb`, both the old way (a fresh dict
+serialized by the stdlib for every attempt) and through the provider
+templates (artifact escaped once, bytes spliced per body).
+
+    python -m benchmarks.encode_bench [--size-kb 1024] [--models 5] [--attempts 3]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from providers import wire
+from providers.wire import Slot, TemplateCache
+
+
+def _body(model: str, prompt, artifact) -> dict:
+    return {
+        "model": model,
+        "messages": [{"role": "system", "content": prompt}, {"role": "user", "content": artifact}],
+        "temperature": 0.2,
+        "max_tokens": 4096,
+    }
+
+
+def per_attempt(prompt: str, artifact: str, models: int, attempts: int) -> int:
+    total = 0
+    for i in range(models):
+        for _ in range(attempts):
+            total += len(json.dumps(_body(f"model-{i}", prompt, artifact)).encode("utf-8"))
+    return total
+
+
+def templated(prompt: str, artifact: str, models: int, attempts: int) -> int:
+    wire.clear_encode_cache()
+    cache = TemplateCache()
+    total = 0
+    for i in range(models):
+        # Providers render once per call and reuse the bytes for each attempt
+        content = cache.get(_body(f"model-{i}", Slot("prompt"), Slot("artifact"))).render(
+            prompt=prompt, artifact=artifact,
+        )
+        total += len(content) * attempts
+    return total
+
+
+def measure(fn, *args, runs: int) -> tuple[float, float]:
+    """(best ms over `runs`, peak MiB allocated in one run)."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Request body encoding benchmark")
+    parser.add_argument("--size-kb", type=int, default=1024)
+    parser.add_argument("--models", type=int, default=5)
+    parser.add_argument("--attempts", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    prompt = "Review this design document for gaps and risks.\n" * 40
+    line = 'Section text with "quotes", a \\ backslash, unicode é and\ttabs.\n'
+    artifact = line * (args.size_kb * 1024 // len(line))
+    counts = (args.models, args.attempts)
+
+    print(f"{args.size_kb} KiB artifact, {args.models} models × {args.attempts} attempts "
+          f"(JSON backend: {wire.BACKEND})")
+    for name, fn in (("per-attempt json.dumps", per_attempt), ("shared template", templated)):
+        ms, mib = measure(fn, prompt, artifact, *counts, runs=args.runs)
+        print(f"  {name:<24} {ms:8.1f} ms   peak {mib:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
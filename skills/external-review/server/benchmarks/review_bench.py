@@ -0,0 +1,219 @@
+"""End-to-end `review` benchmarks against the local stub LLM server.
+
+Each scenario points a temporary models.yaml at the stub (alternating
+OpenAI-compatible and Gemini models), then drives the real `review` tool —
+config loading, artifact I/O, providers, pooling, streaming and retries —
+with a fixed number of calls at a given concurrency. Reports throughput and
+p50/p95/p99 latency per scenario.
+
+    python -m benchmarks.review_bench               # all scenarios
+    python -m benchmarks.review_bench --scenario three-models --json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import yaml
+
+import external_review_server as srv
+from benchmarks.stub_server import StubLLMServer, StubProfile
+from latency import percentile
+
+PROMPT = (
+    "You are reviewing a design document. List concrete issues by severity "
+    "(critical, major, minor) with the section they refer to.\n"
+) * 20
+
+
+@dataclass
+class Scenario:
+    name: str
+    models: int = 1
+    artifact_kb: int = 8
+    concurrency: int = 1
+    calls: int = 20
+    stream: bool = True
+    profile: StubProfile = field(default_factory=StubProfile)
+
+
+SCENARIOS = [
+    Scenario("single-model", models=1, artifact_kb=8, concurrency=1, calls=20),
+    Scenario("three-models", models=3, artifact_kb=8, concurrency=1, calls=20),
+    Scenario("large-artifact", models=3, artifact_kb=256, concurrency=4, calls=20),
+    Scenario("high-concurrency", models=2, artifact_kb=16, concurrency=16, calls=64),
+    Scenario("non-streaming", models=2, artifact_kb=16, concurrency=8, calls=32, stream=False),
+    Scenario(
+        "flaky-provider", models=2, artifact_kb=16, concurrency=8, calls=32,
+        profile=StubProfile(error_rate=0.05, rate_limit_rate=0.05, seed=7),
+    ),
+]
+
+
+def make_artifact(kb: int) -> str:
+    """Markdown with ~1 KB sections, so delta/chunking code sees realistic structure."""
+    paragraph = "The service validates each request, records an audit event and returns a summary. " * 12
+    sections = [f"## Section {i}\n\n{paragraph}\n" for i in range(max(kb, 1))]
+    return "# Design\n\n" + "\n".join(sections)
+
+
+def write_configs(root: Path, base_url: str, scenario: Scenario) -> tuple[Path, Path, list[str]]:
+    models = {}
+    for i in range(scenario.models):
+        if i % 2 == 0:
+            models[f"stub-openai-{i}"] = {
+                "provider": "openai_compat", "endpoint": f"{base_url}/v1",
+                "model": f"stub-chat-{i}", "api_key": "sk-stub",
+                "pricing": {"input_per_1m": 1.0, "output_per_1m": 2.0},
+            }
+        else:
+            models[f"stub-gemini-{i}"] = {
+                "provider": "google", "endpoint": f"{base_url}/v1beta",
+                "model": f"stub-gemini-{i}", "api_key": "stub-key",
+                "pricing": {"input_per_1m": 1.0, "output_per_1m": 2.0},
+            }
+    models_path = root / "models.yaml"
+    models_path.write_text(yaml.dump({"models": models, "settings": {}}))
+
+    config_path = root / "config.yaml"
+    config_path.write_text(yaml.dump({
+        "version": "bench",
+        "execution": {
+            "timeout_seconds": 30,
+            "retry_attempts": 2,
+            "stream": scenario.stream,
+            "prompt_cache_ttl_seconds": 0,
+        },
+        "http": {"http2": False},
+        # Let the flaky scenario measure retries rather than a tripped breaker
+        "circuit_breaker": {"failure_threshold": 10_000, "health_check_interval_seconds": 0},
+        "cache": {"enabled": False},
+    }))
+    return models_path, config_path, list(models)
+
+
+async def _reset_server_state() -> None:
+    await srv._close_client_pool()
+    srv._models_config = None
+    srv._breakers = None
+    srv._review_cache = None
+    srv._snapshots.clear()
+    srv._latency_tracker.clear()
+
+
+async def run_scenario(scenario: Scenario) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        async with StubLLMServer(scenario.profile) as stub:
+            models_path, config_path, model_ids = write_configs(root, stub.base_url, scenario)
+            artifact = root / "docs" / "design.md"
+            artifact.parent.mkdir()
+            artifact.write_text(make_artifact(scenario.artifact_kb))
+
+            previous_cwd = os.getcwd()
+            saved = srv.MODELS_YAML, srv.SKILL_CONFIG_YAML
+            os.chdir(root)
+            srv.MODELS_YAML, srv.SKILL_CONFIG_YAML = models_path, config_path
+            await _reset_server_state()
+            try:
+                # One untimed call warms connections and imports
+                await srv.review(models=model_ids, artifact_path=str(artifact), prompt=PROMPT, cache="bypass")
+
+                semaphore = asyncio.Semaphore(scenario.concurrency)
+                latencies: list[float] = []
+                statuses: Counter = Counter()
+
+                async def one_call() -> None:
+                    async with semaphore:
+                        call_start = time.perf_counter()
+                        result = await srv.review(
+                            models=model_ids, artifact_path=str(artifact), prompt=PROMPT, cache="bypass",
+                        )
+                        latencies.append((time.perf_counter() - call_start) * 1000)
+                        statuses.update(r["status"] for r in result["reviews"])
+
+                requests_before = stub.stats.requests
+                start = time.perf_counter()
+                await asyncio.gather(*(one_call() for _ in range(scenario.calls)))
+                wall = time.perf_counter() - start
+            finally:
+                await _reset_server_state()
+                srv.MODELS_YAML, srv.SKILL_CONFIG_YAML = saved
+                os.chdir(previous_cwd)
+
+    model_calls = scenario.calls * scenario.models
+    return {
+        "scenario": scenario.name,
+        "models": scenario.models,
+        "artifact_kb": scenario.artifact_kb,
+        "concurrency": scenario.concurrency,
+        "calls": scenario.calls,
+        "stream": scenario.stream,
+        "wall_s": round(wall, 3),
+        "reviews_per_s": round(scenario.calls / wall, 2),
+        "model_calls_per_s": round(model_calls / wall, 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "p99": round(percentile(latencies, 99), 1),
+        },
+        "statuses": dict(statuses),
+        "http_requests": stub.stats.requests - requests_before,
+        "stub_profile": asdict(scenario.profile),
+    }
+
+
+def _print_table(results: list[dict]) -> None:
+    header = f"{'scenario':<18}{'models':>7}{'KB':>6}{'conc':>6}{'rev/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}  statuses"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        lat = r["latency_ms"]
+        statuses = ", ".join(f"{k}={v}" for k, v in sorted(r["statuses"].items()))
+        print(
+            f"{r['scenario']:<18}{r['models']:>7}{r['artifact_kb']:>6}{r['concurrency']:>6}"
+            f"{r['reviews_per_s']:>8}{lat['p50']:>9}{lat['p95']:>9}{lat['p99']:>9}  {statuses}"
+        )
+
+
+async def _main(args) -> None:
+    selected = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    if not selected:
+        raise SystemExit(f"Unknown scenario; choose from: {', '.join(s.name for s in SCENARIOS)}")
+    results = []
+    for scenario in selected:
+        if args.latency_ms is not None:
+            scenario.profile.latency_ms = args.latency_ms
+        results.append(await run_scenario(scenario))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark review end to end against a local stub LLM server")
+    parser.add_argument("--scenario", action="append", help="scenario name (repeatable; default: all)")
+    parser.add_argument("--latency-ms", type=float, help="override the stub's median latency")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--list", action="store_true", help="list scenarios and exit")
+    args = parser.parse_args()
+    if args.list:
+        for s in SCENARIOS:
+            print(f"{s.name:<18} models={s.models} artifact_kb={s.artifact_kb} "
+                  f"concurrency={s.concurrency} calls={s.calls} stream={s.stream}")
+        return
+    # FastMCP turns on INFO logging, which would print every stub request
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Startup benchmark: time from spawning the stdio server to its MCP responses.
+
+Measures, per run, the time to the `initialize` response and to the first
+`tools/list` response (when the tools are usable by the client).
+
+    python benchmarks/startup.py [--runs 10] [--python PATH]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SERVER = Path(__file__).resolve().parent.parent / "external_review_server.py"
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "1.0"},
+    },
+}
+INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+LIST_TOOLS = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
+
+
+def _send(proc: subprocess.Popen, message: dict) -> None:
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+
+
+def _wait_for(proc: subprocess.Popen, request_id: int) -> dict:
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Server exited before answering request {request_id}")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def measure(python: str) -> tuple[float, float]:
+    """Spawn the server once; returns (ms to initialize, ms to tools/list)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [python, str(SERVER)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        cwd=SERVER.parent,
+        env=os.environ.copy(),
+    )
+    try:
+        _send(proc, INITIALIZE)
+        _wait_for(proc, 1)
+        initialized_ms = (time.perf_counter() - start) * 1000
+        _send(proc, INITIALIZED)
+        _send(proc, LIST_TOOLS)
+        tools = _wait_for(proc, 2)
+        tools_ms = (time.perf_counter() - start) * 1000
+        if not tools.get("result", {}).get("tools"):
+            raise RuntimeError(f"Unexpected tools/list response: {tools}")
+    finally:
+        proc.stdin.close()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return initialized_ms, tools_ms
+
+
+def _summary(label: str, values: list[float]) -> str:
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+    return (
+        f"{label:<12} min {ordered[0]:7.1f} ms   median {statistics.median(ordered):7.1f} ms   "
+        f"p95 {p95:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--python", default=sys.executable, help="interpreter to run the server with")
+    args = parser.parse_args()
+
+    # First spawn warms the OS page cache and writes bytecode; don't count it
+    measure(args.python)
+    results = [measure(args.python) for _ in range(args.runs)]
+    print(f"{args.runs} runs of {SERVER.name}")
+    print(_summary("initialize", [r[0] for r in results]))
+    print(_summary("tools/list", [r[1] for r in results]))
+
+
+if __name__ == "__main__":
+    main()
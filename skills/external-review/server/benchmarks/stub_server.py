@@ -0,0 +1,274 @@
+"""Local stub LLM server speaking the OpenAI and Gemini wire formats.
+
+Serves, on one port:
+  POST {prefix}/chat/completions                        (OpenAI-compatible, optional SSE)
+  POST {prefix}/models/{model}:generateContent          (Gemini)
+  POST {prefix}/models/{model}:streamGenerateContent    (Gemini SSE)
+  GET  {prefix}/models                                  (health checks)
+
+Latency, output size and failure rates come from a StubProfile, so the real
+provider request path (pooling, streaming, retries, rate limiting) can be
+benchmarked offline.
+
+    python -m benchmarks.stub_server --port 8765 --latency-ms 800 --error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+from dataclasses import dataclass, field
+
+from providers.base import estimate_tokens
+
+_GEMINI_PATH = re.compile(r"/models/(?P<model>[^/:]+):(?P<method>generateContent|streamGenerateContent)$")
+
+
+@dataclass
+class StubProfile:
+    """How the stub behaves.
+
+    Latency is log-normal around `latency_ms` (the median) with shape
+    `latency_sigma`; 0 gives a fixed latency. Streamed responses send their
+    first token after `ttft_fraction` of the latency and spread the rest.
+    """
+
+    latency_ms: float = 200
+    latency_sigma: float = 0.3
+    ttft_fraction: float = 0.2
+    output_tokens: int = 400
+    stream_chunks: int = 20
+    error_rate: float = 0.0       # fraction of requests answered with HTTP 503
+    rate_limit_rate: float = 0.0  # fraction answered with HTTP 429 + Retry-After
+    retry_after_seconds: float = 0.1
+    seed: int | None = None
+
+    def sample_latency(self, rng: random.Random) -> float:
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000
+        return rng.lognormvariate(0, self.latency_sigma) * self.latency_ms / 1000
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    by_path: dict[str, int] = field(default_factory=dict)
+
+
+class StubLLMServer:
+    """Minimal asyncio HTTP/1.1 server (keep-alive, chunked SSE) for benchmarks."""
+
+    def __init__(self, profile: StubProfile | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.profile = profile or StubProfile()
+        self.host = host
+        self.port = port
+        self.stats = StubStats()
+        self._rng = random.Random(self.profile.seed)
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "StubLLMServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StubLLMServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    # --- HTTP plumbing ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+                await self._dispatch(method, target, body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status: int, payload: dict | str, extra_headers: dict | None = None) -> None:
+        body = (payload if isinstance(payload, str) else json.dumps(payload)).encode()
+        reason = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 503: "Service Unavailable"}
+        head = [f"HTTP/1.1 {status} {reason.get(status, 'Error')}",
+                "Content-Type: application/json", f"Content-Length: {len(body)}"]
+        head += [f"{k}: {v}" for k, v in (extra_headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+    @staticmethod
+    async def _start_sse(writer) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        await writer.drain()
+
+    @staticmethod
+    async def _send_chunk(writer, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        await writer.drain()
+
+    # --- Behaviour ---
+
+    async def _dispatch(self, method: str, target: str, body: bytes, writer) -> None:
+        path = target.partition("?")[0]
+        self.stats.requests += 1
+        self.stats.by_path[path] = self.stats.by_path.get(path, 0) + 1
+
+        if method == "GET" and path.endswith("/models"):
+            await self._respond(writer, 200, {"data": [], "models": []})
+            return
+        gemini = _GEMINI_PATH.search(path)
+        if method != "POST" or not (path.endswith("/chat/completions") or gemini):
+            await self._respond(writer, 404, {"error": {"message": f"No route for {method} {path}"}})
+            return
+
+        roll = self._rng.random()
+        if roll < self.profile.error_rate:
+            self.stats.errors += 1
+            await asyncio.sleep(self.profile.sample_latency(self._rng) * self.profile.ttft_fraction)
+            await self._respond(writer, 503, {"error": {"message": "stub overloaded"}})
+            return
+        if roll < self.profile.error_rate + self.profile.rate_limit_rate:
+            self.stats.rate_limited += 1
+            await self._respond(
+                writer, 429, {"error": {"message": "stub rate limit"}},
+                {"Retry-After": str(self.profile.retry_after_seconds)},
+            )
+            return
+
+        request = json.loads(body or b"{}")
+        input_tokens = self._input_tokens(request)
+        text = self._completion_text()
+        latency = self.profile.sample_latency(self._rng)
+
+        if gemini:
+            streaming = gemini.group("method") == "streamGenerateContent"
+            await self._gemini(writer, text, input_tokens, latency, streaming)
+        else:
+            await self._openai(writer, request, text, input_tokens, latency, bool(request.get("stream")))
+
+    @staticmethod
+    def _input_tokens(request: dict) -> int:
+        texts = [m.get("content", "") for m in request.get("messages", [])]
+        for part_holder in [request.get("system_instruction", {})] + request.get("contents", []):
+            texts += [p.get("text", "") for p in part_holder.get("parts", [])]
+        return sum(estimate_tokens(t) for t in texts if isinstance(t, str))
+
+    def _completion_text(self) -> str:
+        words = ["## Review", "\n\n", "- Issue:"] + ["finding"] * max(self.profile.output_tokens - 3, 0)
+        return " ".join(words)
+
+    def _pieces(self, text: str) -> list[str]:
+        n = max(self.profile.stream_chunks, 1)
+        size = max(len(text) // n, 1)
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    async def _stream(self, writer, events: list[dict], latency: float, done_marker: bool) -> None:
+        await self._start_sse(writer)
+        ttft = latency * self.profile.ttft_fraction
+        await asyncio.sleep(ttft)
+        gap = (latency - ttft) / max(len(events) - 1, 1)
+        for i, event in enumerate(events):
+            if i:
+                await asyncio.sleep(gap)
+            await self._send_chunk(writer, f"data: {json.dumps(event)}\n\n".encode())
+        if done_marker:
+            await self._send_chunk(writer, b"data: [DONE]\n\n")
+        await self._send_chunk(writer, b"")
+
+    async def _openai(self, writer, request, text, input_tokens, latency, streaming) -> None:
+        usage = {
+            "prompt_tokens": input_tokens,
+            "completion_tokens": self.profile.output_tokens,
+            "total_tokens": input_tokens + self.profile.output_tokens,
+        }
+        if not streaming:
+            await asyncio.sleep(latency)
+            await self._respond(writer, 200, {
+                "id": "stub", "object": "chat.completion", "model": request.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+        events = [{"choices": [{"index": 0, "delta": {"content": piece}}]} for piece in self._pieces(text)]
+        events.append({"choices": [], "usage": usage})
+        await self._stream(writer, events, latency, done_marker=True)
+
+    async def _gemini(self, writer, text, input_tokens, latency, streaming) -> None:
+        usage = {"promptTokenCount": input_tokens, "candidatesTokenCount": self.profile.output_tokens}
+
+        def candidate(piece: str) -> dict:
+            return {"candidates": [{"content": {"parts": [{"text": piece}], "role": "model"}}]}
+
+        if not streaming:
+            await asyncio.sleep(latency)
+            await self._respond(writer, 200, {**candidate(text), "usageMetadata": usage})
+            return
+        events = [candidate(piece) for piece in self._pieces(text)]
+        events[-1]["candidates"][0]["finishReason"] = "STOP"
+        events[-1]["usageMetadata"] = usage
+        await self._stream(writer, events, latency, done_marker=False)
+
+
+async def _serve(args) -> None:
+    profile = StubProfile(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    async with StubLLMServer(profile, port=args.port) as server:
+        print(f"Stub LLM server on {server.base_url} (Ctrl-C to stop)")
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stub LLM server (OpenAI + Gemini formats)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--latency-sigma", type=float, default=0.3)
+    parser.add_argument("--output-tokens", type=int, default=400)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
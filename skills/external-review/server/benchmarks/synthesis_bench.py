@@ -0,0 +1,58 @@
+"""Issue synthesis benchmark: dedup time for `--models` reviews of `--issues` issues.
+
+Each model reports `--issues` of `--distinct` underlying issues, paraphrased
+(a word dropped, filler and an unrelated word added, order shuffled), so a
+correct run finds one group per underlying issue that was reported.
+
+    python -m benchmarks.synthesis_bench [--models 36] [--issues 15] [--distinct 60]
+"""
+
+import argparse
+import random
+import time
+
+from synthesis import synthesize_reviews
+
+_FILLER = "design section missing should handled error data request unclear".split()
+
+
+def make_reviews(models: int, issues: int, distinct: int, seed: int = 1) -> tuple[list[dict], int]:
+    """(review entries, number of underlying issues reported)."""
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(distinct * 10)]
+    bases = [rng.sample(vocab, 7) for _ in range(distinct)]
+    reviews, reported = [], set()
+    for m in range(models):
+        records = []
+        for b in rng.sample(range(distinct), min(issues, distinct)):
+            reported.add(b)
+            words = bases[b][:]
+            words.pop(rng.randrange(len(words)))
+            words += rng.sample(_FILLER, 2) + rng.sample(vocab, 1)
+            rng.shuffle(words)
+            records.append({"description": " ".join(words), "severity": rng.choice(["Critical", "High", "Low"])})
+        reviews.append({"model": f"model-{m}", "status": "success", "issues": records})
+    return reviews, len(reported)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Issue synthesis benchmark")
+    parser.add_argument("--models", type=int, default=36)
+    parser.add_argument("--issues", type=int, default=15)
+    parser.add_argument("--distinct", type=int, default=60)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    reviews, expected = make_reviews(args.models, args.issues, args.distinct)
+    best, result = float("inf"), None
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        result = synthesize_reviews(reviews)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    counts = result["counts"]
+    print(f"{args.models} models × {args.issues} issues ({counts['input_issues']} total): "
+          f"{counts['groups']} groups (expected {expected}) in {best:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Preflight cost projection and per-call / per-day spend budgets."""
+
+import time
+
+from providers.base import ReviewResponse
+
+DEFAULT_BUDGET_SETTINGS = {
+    "max_call_usd": None,      # projected cost cap for one model call (all parts)
+    "max_daily_usd": None,     # spent + projected cap per UTC day, across models
+    "count_tokens": "local",   # "local" estimate or "provider" (e.g. Gemini countTokens)
+}
+
+TOKEN_COUNT_MODES = ("local", "provider")
+
+
+def utc_day(ts: float | None = None) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(ts))
+
+
+def project_cost(input_tokens: int, output_tokens: int, pricing: dict | None) -> float | None:
+    """Worst-case cost of a call, or None without complete pricing."""
+    return ReviewResponse.calculate_cost({"input": input_tokens, "output": output_tokens}, pricing)
+
+
+class SpendTracker:
+    """Today's spend (UTC) plus costs reserved by this process's calls in flight.
+
+    A call reserves its projected cost before dispatch and settles to the
+    actual cost afterwards, so parallel calls can't all pass the daily check
+    against the same remaining budget.
+    """
+
+    def __init__(self):
+        self.day: str | None = None
+        self.spent = 0.0
+        self.reserved = 0.0
+
+    def roll(self, day: str, spent: float = 0.0) -> None:
+        """Start tracking `day`, with `spent` already recorded (e.g. from the ledger)."""
+        self.day = day
+        self.spent = spent
+        self.reserved = 0.0
+
+    def sync(self, day: str, recorded: float) -> None:
+        """Take `recorded` (the ledger's total for `day`, every process) as spent.
+
+        Reservations of this process's calls in flight are kept; they settle
+        after their ledger row is written, so no cost is counted twice.
+        """
+        if day != self.day:
+            self.roll(day, recorded)
+        else:
+            self.spent = recorded
+
+    def try_reserve(self, amount: float, daily_limit: float | None) -> bool:
+        if daily_limit is not None and self.spent + self.reserved + amount > daily_limit:
+            return False
+        self.reserved += amount
+        return True
+
+    def settle(self, reserved: float, actual: float | None) -> None:
+        self.reserved = max(self.reserved - reserved, 0.0)
+        self.spent += actual or 0.0
+
+    def snapshot(self) -> dict:
+        return {"day": self.day, "spent_usd": round(self.spent, 6), "reserved_usd": round(self.reserved, 6)}
+
+
+def check_call_budget(projected: float | None, max_call_usd: float | None) -> str | None:
+    """Error message if a call's projected cost exceeds the per-call cap."""
+    if projected is None or max_call_usd is None or projected <= max_call_usd:
+        return None
+    return f"Projected cost ${projected:.4f} exceeds the per-call budget of ${max_call_usd:.4f}"
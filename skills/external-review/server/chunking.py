@@ -0,0 +1,174 @@
+"""Token-aware chunking of large artifacts and map-reduce over per-chunk reviews."""
+
+import asyncio
+import re
+from collections.abc import Awaitable, Callable
+
+from providers.base import CHARS_PER_TOKEN, ReviewResponse, estimate_tokens
+from sections import split_sections
+
+# Output tokens reserved inside the context window when max_tokens isn't set
+DEFAULT_OUTPUT_RESERVE_TOKENS = 4096
+
+# Least context room left for the artifact before a model is refused: below
+# this an artifact splits into a flood of parts, each billed the full prompt
+MIN_CHUNK_TOKENS = 512
+
+
+def chunk_budget(limits: dict | None, prompt: str, max_output_tokens: int | None = None) -> int | None:
+    """Max artifact tokens per request for a model, or None if it has no limits.
+
+    `limits` is the model's `limits` block from models.yaml: `chunk_tokens`
+    caps each chunk directly; `context_tokens` caps prompt + chunk + output.
+    """
+    if not limits:
+        return None
+    budgets = []
+    if limits.get("chunk_tokens"):
+        budgets.append(int(limits["chunk_tokens"]))
+    if limits.get("context_tokens"):
+        reserve = max_output_tokens or DEFAULT_OUTPUT_RESERVE_TOKENS
+        budgets.append(int(limits["context_tokens"]) - estimate_tokens(prompt) - reserve)
+    if not budgets:
+        return None
+    return max(min(budgets), 1)
+
+
+def _split_oversized(text: str, max_chars: int) -> list[str]:
+    """Split one section on paragraph, then line, then hard character boundaries."""
+    if len(text) <= max_chars:
+        return [text]
+    for separator in ("\n\n", "\n"):
+        units = [u for u in re.split(f"(?<={re.escape(separator)})", text) if u]
+        if len(units) > 1:
+            return _pack(units, max_chars, _split_oversized)
+    return _split_oversized_hard(text, max_chars)
+
+
+def _split_oversized_hard(text: str, max_chars: int) -> list[str]:
+    return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+
+def _pack(units: list[str], max_chars: int, split_unit) -> list[str]:
+    """Greedily pack units into chunks of at most `max_chars`, splitting any unit
+    that doesn't fit on its own."""
+    chunks, current = [], ""
+    pending = list(reversed(units))
+    while pending:
+        unit = pending.pop()
+        if len(unit) > max_chars:
+            pending.extend(reversed(split_unit(unit, max_chars)))
+        elif len(current) + len(unit) > max_chars:
+            chunks.append(current)
+            current = unit
+        else:
+            current += unit
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_markdown(text: str, max_tokens: int) -> list[str]:
+    """Split markdown into chunks of at most `max_tokens` (estimated), keeping
+    whole sections together where possible."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return [text]
+    sections = [s.text for s in split_sections(text)]
+    return _pack(sections, max_chars, _split_oversized)
+
+
+def frame_chunk(chunk: str, index: int, total: int) -> str:
+    """Mark a chunk's position so the model knows it sees a part.
+
+    The marker goes after the chunk so the request still starts with stable
+    content that provider prefix caches can match across cycles.
+    """
+    return (
+        f"{chunk}\n\n[End of part {index} of {total} of a larger artifact. Review only "
+        f"this part; other parts are reviewed separately.]"
+    )
+
+
+async def map_reduce_review(
+    review_chunk: Callable[[str], Awaitable[ReviewResponse]],
+    chunks: list[str],
+    concurrency: int,
+) -> ReviewResponse:
+    """Review chunks in parallel (at most `concurrency` at once) and merge the results."""
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    total = len(chunks)
+
+    async def run(index: int, chunk: str) -> ReviewResponse:
+        async with semaphore:
+            return await review_chunk(frame_chunk(chunk, index, total))
+
+    results = await asyncio.gather(
+        *(run(i, chunk) for i, chunk in enumerate(chunks, 1)),
+        return_exceptions=True,
+    )
+    results = [
+        r if isinstance(r, ReviewResponse) else ReviewResponse(status="error", error=str(r))
+        for r in results
+    ]
+    return reduce_responses(results)
+
+
+def reduce_responses(results: list[ReviewResponse]) -> ReviewResponse:
+    """Merge per-chunk responses into one, with findings grouped by part."""
+    total = len(results)
+    succeeded = [(i, r) for i, r in enumerate(results, 1) if r.status == "success"]
+    failed = [(i, r) for i, r in enumerate(results, 1) if r.status != "success"]
+    chunks = {"total": total, "failed": len(failed)}
+    latency = max((r.latency_ms for r in results), default=0)
+    retries = sum(r.retries_attempted for r in results)
+    reasons = [reason for r in results for reason in (r.retry_reasons or [])]
+
+    if not succeeded:
+        timed_out = all(r.status == "deadline_exceeded" for _, r in failed)
+        return ReviewResponse(
+            status="deadline_exceeded" if timed_out else "error",
+            error="; ".join(f"part {i}: {r.error}" for i, r in failed),
+            latency_ms=latency,
+            retries_attempted=retries,
+            chunks=chunks,
+            retry_reasons=reasons or None,
+        )
+
+    tokens = {"input": 0, "output": 0}
+    costs = []
+    parts = []
+    for i, r in enumerate(results, 1):
+        if r.status != "success":
+            parts.append(f"## Part {i} of {total}\n\n_Review failed: {r.error}_")
+            continue
+        for k, v in (r.tokens_used or {}).items():
+            tokens[k] = tokens.get(k, 0) + v
+        if r.cost_usd is not None:
+            costs.append(r.cost_usd)
+        parts.append(f"## Part {i} of {total}\n\n{(r.response or '').strip()}")
+
+    ttfts = [r.ttft_ms for _, r in succeeded if r.ttft_ms is not None]
+    # Structured parts: concatenate their issues; report parts that didn't parse
+    parsed = [r.issues for _, r in succeeded if r.issues is not None]
+    issue_errors = [f"part {i}: {r.issues_error}" for i, r in succeeded if r.issues_error]
+    # Parts run in parallel: each phase's cost is that of the slowest part
+    timings: dict[str, float] = {}
+    for _, r in succeeded:
+        for phase, ms in (r.timings or {}).items():
+            timings[phase] = max(timings.get(phase, 0.0), ms)
+    return ReviewResponse(
+        status="success",
+        response="\n\n".join(parts),
+        tokens_used=tokens,
+        latency_ms=latency,
+        retries_attempted=retries,
+        cost_usd=round(sum(costs), 6) if costs else None,
+        ttft_ms=min(ttfts) if ttfts else None,
+        truncated=any(r.truncated for _, r in succeeded),
+        chunks=chunks,
+        timings=timings or None,
+        retry_reasons=reasons or None,
+        issues=[issue for issues in parsed for issue in issues] if parsed else None,
+        issues_error="; ".join(issue_errors) or None,
+    )
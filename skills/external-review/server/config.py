@@ -1,31 +1,49 @@
 """Config loading for external-review MCP server."""
 
 import os
+from functools import cache
 from pathlib import Path
 
-import yaml
-from dotenv import load_dotenv
-
-# Load .env from ADF project root (two levels up from server/)
+# .env at the ADF project root (two levels up from server/)
 _env_path = Path(__file__).resolve().parent.parent.parent.parent / ".env"
-load_dotenv(_env_path, override=True)
+
+# yaml and dotenv are imported on first use to keep server startup fast
+
+
+@cache
+def _load_env() -> None:
+    """Load .env once, before the first API key lookup."""
+    from dotenv import load_dotenv
+
+    load_dotenv(_env_path, override=True)
+
 
 REQUIRED_MODEL_FIELDS = {"provider", "endpoint", "model"}
 
 
-def load_models_config(path: Path) -> dict:
-    """Load models.yaml. Returns empty models dict if file missing or invalid."""
+def load_models_config(path: Path, strict: bool = False) -> dict:
+    """Load models.yaml. Returns empty models dict if file missing or invalid.
+
+    With `strict`, an unparseable file raises ValueError instead, so a reload
+    can keep the last good config.
+    """
     result = {"models": {}, "settings": {}}
     if not path.exists():
         return result
 
+    import yaml
+
     try:
         raw = yaml.safe_load(path.read_text()) or {}
-    except yaml.YAMLError:
+    except yaml.YAMLError as e:
+        if strict:
+            raise ValueError(f"Invalid models.yaml: {e}") from e
         return result
 
-    raw_models = raw.get("models", {})
+    raw_models = raw.get("models", {}) if isinstance(raw, dict) else None
     if not isinstance(raw_models, dict):
+        if strict:
+            raise ValueError("Invalid models.yaml: `models` must be a mapping")
         return result
 
     for model_id, model_cfg in raw_models.items():
@@ -39,13 +57,33 @@ def load_models_config(path: Path) -> dict:
     return result
 
 
+# path -> ((mtime_ns, size), parsed config)
+_skill_config_cache: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+
 def load_skill_config(path: Path) -> dict:
-    """Load skill config.yaml. Raises FileNotFoundError if missing."""
-    if not path.exists():
-        raise FileNotFoundError(f"Skill config not found: {path}")
+    """Load skill config.yaml. Raises FileNotFoundError if missing.
+
+    The parsed config is cached until the file's mtime or size changes, so
+    repeated calls cost one stat. Treat the returned dict as read-only.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        _skill_config_cache.pop(path, None)
+        raise FileNotFoundError(f"Skill config not found: {path}") from None
+
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _skill_config_cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    import yaml
 
     with open(path) as f:
-        return yaml.safe_load(f)
+        config = yaml.safe_load(f)
+    _skill_config_cache[path] = (version, config)
+    return config
 
 
 def resolve_api_key(model_config: dict) -> str | None:
@@ -53,5 +91,6 @@ def resolve_api_key(model_config: dict) -> str | None:
     if "api_key" in model_config:
         return model_config["api_key"]
     if "api_key_env" in model_config:
+        _load_env()
         return os.environ.get(model_config["api_key_env"])
     return None
@@ -1,17 +1,41 @@
 """External Review MCP Server — calls external LLMs for Phase 2 reviews."""
 
 import asyncio
+import glob
+import importlib
 import os
 import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
+from artifacts import ArtifactCache
+from budget import (
+    DEFAULT_BUDGET_SETTINGS, TOKEN_COUNT_MODES, SpendTracker, check_call_budget, project_cost, utc_day,
+)
+from chunking import (
+    DEFAULT_OUTPUT_RESERVE_TOKENS, MIN_CHUNK_TOKENS, chunk_budget, chunk_markdown, estimate_tokens, map_reduce_review,
+)
 from config import load_models_config, load_skill_config, resolve_api_key
+from hedging import hedged_review
+from issues import ISSUES_INSTRUCTION, ISSUES_SCHEMA, REVIEW_FORMATS, parse_issues
+from jobs import JobStore
+from latency import AdaptiveTimeouts, LatencyTracker
+from ledger import DEFAULT_LEDGER_SETTINGS, REPORTS, CallLedger, content_hash
+from metrics import Metrics
 from path_validation import validate_artifact_path
-from providers.openai_compat import OpenAICompatProvider
-from providers.google import GoogleProvider
+from providers.base import REQUEST_TIMED_OUT, ReviewResponse
+from providers.circuit_breaker import BreakerRegistry
+from providers.pool import ClientPool, endpoint_key
+from providers.retry import RetryBudget, RetryPolicy
+from scheduler import DEFAULT_BATCH_SETTINGS, BatchScheduler
+from review_cache import CACHE_MODES, DEFAULT_CACHE_SETTINGS, ReviewCache, cache_key
+from review_loop import ReviewLoop
+from sections import build_delta_content, diff_sections
+from synthesis import DEFAULT_SIMILARITY, synthesize_reviews
 
 # Resolve config paths
 SKILL_DIR = Path(__file__).parent.parent
@@ -19,20 +43,329 @@ SERVER_DIR = Path(__file__).parent
 MODELS_YAML = Path.home() / ".claude" / "models.yaml"
 SKILL_CONFIG_YAML = SKILL_DIR / "config.yaml"
 
-# Load configs at startup
-_models_config = load_models_config(MODELS_YAML)
 
+def _file_version(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# models.yaml is loaded on first use (keeps server startup fast) and re-read
+# when it changes (see _reload_models_config)
+_models_config: dict | None = None
+_models_version: tuple[int, int] | None = None
+_models_reload_error: str | None = None
+
+# Provider type -> (module, class); imported on first use
 PROVIDER_MAP = {
-    "openai_compat": OpenAICompatProvider,
-    "google": GoogleProvider,
+    "openai_compat": ("providers.openai_compat", "OpenAICompatProvider"),
+    "google": ("providers.google", "GoogleProvider"),
 }
 
-mcp = FastMCP("external-review")
+
+def _get_models_config() -> dict:
+    """Return the current models.yaml config, loading it on first use."""
+    global _models_config, _models_version
+    if _models_config is None:
+        _models_version = _file_version(MODELS_YAML)
+        _models_config = load_models_config(MODELS_YAML)
+    return _models_config
+
+
+def _provider_class(provider_type: str):
+    entry = PROVIDER_MAP.get(provider_type)
+    if entry is None:
+        return None
+    module_name, class_name = entry
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+# Server-lifetime HTTP clients and provider instances (created on first use)
+_client_pool: ClientPool | None = None
+_providers: dict[tuple, object] = {}
+_review_cache: ReviewCache | None = None
+_ledger: CallLedger | None = None
+_breakers: BreakerRegistry | None = None
+_retry_budget: RetryBudget | None = None
+_batch_scheduler: BatchScheduler | None = None
+_jobs: JobStore | None = None
+_artifact_cache = ArtifactCache()
+
+# Seconds between background health checks when config.yaml doesn't set one
+DEFAULT_HEALTH_CHECK_INTERVAL = 60
+
+# Seconds between models.yaml change checks when config.yaml doesn't set one
+DEFAULT_MODELS_RELOAD_INTERVAL = 2
+
+# Successful review latencies per model, for p95-based hedging
+_latency_tracker = LatencyTracker()
+
+# Per-request latency samples, normalized by tokens, for adaptive timeouts
+_adaptive_timeouts = AdaptiveTimeouts()
+
+# Hot-path phase histograms and counters, reported by the `stats` tool
+_metrics = Metrics()
+
+# Today's spend against config.yaml `budget.max_daily_usd`
+_spend = SpendTracker()
+
+# Observed latencies needed before p95 is trusted as a hedge threshold
+HEDGE_MIN_SAMPLES = 5
+
+REVIEW_MODES = ("full", "delta")
+
+# Last successfully reviewed content per artifact path, for delta mode
+MAX_SNAPSHOTS = 64
+_snapshots: OrderedDict[str, str] = OrderedDict()
+
+
+def _remember_snapshot(path: str, content: str) -> None:
+    _snapshots[path] = content
+    _snapshots.move_to_end(path)
+    while len(_snapshots) > MAX_SNAPSHOTS:
+        _snapshots.popitem(last=False)
+
+
+# run_review_loop sessions per artifact path
+MAX_REVIEW_LOOPS = 64
+_review_loops: OrderedDict[str, ReviewLoop] = OrderedDict()
+
+
+def _remember_loop(loop: ReviewLoop) -> None:
+    _review_loops[loop.path] = loop
+    _review_loops.move_to_end(loop.path)
+    while len(_review_loops) > MAX_REVIEW_LOOPS:
+        _review_loops.popitem(last=False)
+
+
+def _get_client_pool() -> ClientPool:
+    """Return the shared client pool, configured from config.yaml `http` settings."""
+    global _client_pool
+    if _client_pool is None:
+        try:
+            http_settings = load_skill_config(SKILL_CONFIG_YAML).get("http", {})
+        except FileNotFoundError:
+            http_settings = {}
+        _client_pool = ClientPool(http_settings)
+    return _client_pool
+
+
+async def _close_client_pool() -> None:
+    """Close pooled clients and drop cached providers."""
+    global _client_pool
+    _providers.clear()
+    if _client_pool is not None:
+        await _client_pool.aclose()
+        _client_pool = None
+
+
+def _breaker_settings() -> dict:
+    try:
+        return load_skill_config(SKILL_CONFIG_YAML).get("circuit_breaker", {})
+    except FileNotFoundError:
+        return {}
+
+
+def _get_breakers() -> BreakerRegistry:
+    """Return the per-endpoint circuit breakers, configured from config.yaml."""
+    global _breakers
+    if _breakers is None:
+        _breakers = BreakerRegistry(_breaker_settings())
+    return _breakers
+
+
+def _retry_settings() -> dict:
+    try:
+        return load_skill_config(SKILL_CONFIG_YAML).get("retry", {})
+    except FileNotFoundError:
+        return {}
+
+
+def _get_retry_budget() -> RetryBudget:
+    """Return the process-wide retry budget, configured from config.yaml `retry`."""
+    global _retry_budget
+    if _retry_budget is None:
+        _retry_budget = RetryBudget.from_config(_retry_settings())
+    return _retry_budget
+
+
+async def _run_health_checks() -> None:
+    """Probe each configured endpoint once and feed the result to its breaker."""
+    probes = {}
+    for model_id in _get_models_config()["models"]:
+        provider, error = _get_provider(model_id)
+        if provider is not None:
+            probes.setdefault(endpoint_key(provider.endpoint), provider)
+    results = await asyncio.gather(
+        *(provider.health_check() for provider in probes.values()),
+        return_exceptions=True,
+    )
+    for provider, healthy in zip(probes.values(), results):
+        if isinstance(healthy, BaseException):
+            # A bug in the probe says nothing about the endpoint
+            continue
+        if healthy:
+            provider.circuit_breaker.record_health_check_success()
+        else:
+            provider.circuit_breaker.record_failure()
+
+
+async def _reload_models_config() -> bool:
+    """Swap in models.yaml if it changed since it was last loaded.
+
+    The new config replaces the old one in a single assignment, so each review
+    sees one consistent version. Providers and pooled clients for endpoints
+    that are still configured stay warm; clients for removed endpoints are
+    closed. If the file doesn't parse, the last good config stays in use.
+    Returns whether a new config was applied.
+    """
+    global _models_config, _models_version, _models_reload_error
+    if _models_config is None:
+        # Not loaded yet; first use will read the current file
+        return False
+    version = _file_version(MODELS_YAML)
+    if version == _models_version:
+        return False
+    if version is not None and version[1] == 0:
+        # Editors often truncate before writing; wait for the content
+        return False
+    _models_version = version
+    try:
+        new_config = await asyncio.to_thread(load_models_config, MODELS_YAML, strict=True)
+    except (ValueError, OSError) as e:
+        _models_reload_error = str(e)
+        return False
+
+    _models_config = new_config
+    _models_reload_error = None
+
+    live = {
+        (cfg["provider"], cfg["endpoint"], resolve_api_key(cfg))
+        for cfg in new_config["models"].values()
+    }
+    for key in [k for k in _providers if k not in live]:
+        del _providers[key]
+    if _client_pool is not None:
+        await _client_pool.retain(cfg["endpoint"] for cfg in new_config["models"].values())
+    return True
+
+
+def _background_intervals() -> tuple[float, float]:
+    """(health check, models.yaml reload) seconds from config.yaml; 0 disables."""
+    try:
+        skill_config = load_skill_config(SKILL_CONFIG_YAML)
+    except FileNotFoundError:
+        skill_config = {}
+    health_interval = skill_config.get("circuit_breaker", {}).get(
+        "health_check_interval_seconds", DEFAULT_HEALTH_CHECK_INTERVAL,
+    )
+    reload_interval = skill_config.get("models_reload_interval_seconds", DEFAULT_MODELS_RELOAD_INTERVAL)
+    return health_interval, reload_interval
+
+
+# The loops start at the default interval and read config.yaml only after
+# their first sleep, so parsing it stays off the path to `initialize`
+async def _models_reload_loop() -> None:
+    interval = DEFAULT_MODELS_RELOAD_INTERVAL
+    while interval:
+        await asyncio.sleep(interval)
+        interval = _background_intervals()[1]
+        if interval:
+            await _reload_models_config()
+
+
+async def _health_check_loop() -> None:
+    interval = DEFAULT_HEALTH_CHECK_INTERVAL
+    while interval:
+        await asyncio.sleep(interval)
+        interval = _background_intervals()[0]
+        if interval:
+            await _run_health_checks()
 
 
-def _get_provider(model_id: str):
-    """Instantiate provider for a model ID."""
-    model_cfg = _models_config["models"].get(model_id)
+def _get_batch_scheduler() -> BatchScheduler:
+    """Return the scheduler shared by batch reviews, configured from config.yaml `batch`."""
+    global _batch_scheduler
+    try:
+        batch_settings = load_skill_config(SKILL_CONFIG_YAML).get("batch", {})
+    except FileNotFoundError:
+        batch_settings = {}
+    if _batch_scheduler is None or _batch_scheduler.settings != {**DEFAULT_BATCH_SETTINGS, **batch_settings}:
+        _batch_scheduler = BatchScheduler(batch_settings)
+    return _batch_scheduler
+
+
+def _get_job_store() -> JobStore:
+    """Return the background job store, configured from config.yaml `jobs`."""
+    global _jobs
+    if _jobs is None:
+        try:
+            job_settings = load_skill_config(SKILL_CONFIG_YAML).get("jobs", {})
+        except FileNotFoundError:
+            job_settings = {}
+        _jobs = JobStore(job_settings)
+    return _jobs
+
+
+def _get_review_cache(cache_settings: dict | None) -> ReviewCache | None:
+    """Return the response cache for config.yaml `cache` settings, or None if disabled."""
+    global _review_cache
+    if not cache_settings or not cache_settings.get("enabled", False):
+        return None
+    if _review_cache is None or _review_cache.settings != {**DEFAULT_CACHE_SETTINGS, **cache_settings}:
+        _review_cache = ReviewCache(cache_settings)
+    return _review_cache
+
+
+def _get_ledger(ledger_settings: dict | None) -> CallLedger | None:
+    """Return the call ledger for config.yaml `ledger` settings, or None if disabled."""
+    global _ledger
+    if not ledger_settings or not ledger_settings.get("enabled", False):
+        return None
+    if _ledger is None or _ledger.settings != {**DEFAULT_LEDGER_SETTINGS, **ledger_settings}:
+        if _ledger is not None:
+            _ledger.close()
+        _ledger = CallLedger(ledger_settings)
+    return _ledger
+
+
+def _hedge_threshold_ms(model_id: str) -> float | None:
+    """When to hedge a slow request: the model's `hedge_after_ms`, else its observed p95."""
+    model_cfg = _get_models_config()["models"].get(model_id, {})
+    if model_cfg.get("hedge_after_ms"):
+        return float(model_cfg["hedge_after_ms"])
+    return _latency_tracker.percentile(model_id, 95, min_samples=HEDGE_MIN_SAMPLES)
+
+
+@asynccontextmanager
+async def _lifespan(server):
+    background = [asyncio.create_task(_health_check_loop()), asyncio.create_task(_models_reload_loop())]
+    try:
+        yield {}
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        if _jobs is not None:
+            await _jobs.cancel_all()
+        await _close_client_pool()
+        if _ledger is not None:
+            _ledger.close()
+
+
+mcp = FastMCP("external-review", lifespan=_lifespan)
+
+# Minimum spacing between progress notifications for one model while streaming
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+
+def _get_provider(model_id: str, models_config: dict | None = None):
+    """Return the (cached) provider for a model ID."""
+    models_config = models_config or _get_models_config()
+    model_cfg = models_config["models"].get(model_id)
     if not model_cfg:
         return None, f"Unknown model: {model_id}"
 
@@ -41,26 +374,41 @@ def _get_provider(model_id: str):
         return None, f"No API key for model: {model_id}"
 
     provider_type = model_cfg["provider"]
-    provider_cls = PROVIDER_MAP.get(provider_type)
+    provider_cls = _provider_class(provider_type)
     if not provider_cls:
         return None, f"Unknown provider type: {provider_type}"
 
-    return provider_cls(endpoint=model_cfg["endpoint"], api_key=api_key), None
+    key = (provider_type, model_cfg["endpoint"], api_key)
+    provider = _providers.get(key)
+    if provider is None:
+        provider = provider_cls(
+            endpoint=model_cfg["endpoint"],
+            api_key=api_key,
+            client_pool=_get_client_pool(),
+            breakers=_get_breakers(),
+            retry_budget=_get_retry_budget(),
+        )
+        _providers[key] = provider
+    return provider, None
 
 
 @mcp.tool()
 def list_models() -> dict:
     """List available external review models from ~/.claude/models.yaml."""
     models = []
-    for model_id, model_cfg in _models_config["models"].items():
+    for model_id, model_cfg in _get_models_config()["models"].items():
         api_key = resolve_api_key(model_cfg)
         models.append({
             "id": model_id,
             "provider": model_cfg["provider"],
             "model": model_cfg["model"],
             "available": api_key is not None,
+            "circuit": _get_breakers().get(model_cfg["endpoint"]).snapshot(),
         })
-    return {"models": models}
+    result = {"models": models}
+    if _models_reload_error:
+        result["config_error"] = f"{_models_reload_error} (still using the previous models.yaml)"
+    return result
 
 
 @mcp.tool()
@@ -69,6 +417,14 @@ async def review(
     artifact_path: str,
     prompt: str,
     timeout: int | None = None,
+    deadline: int | None = None,
+    stream: bool | None = None,
+    cache: str = "read",
+    mode: str = "full",
+    prior_issues: list[str] | None = None,
+    cycle: int = 1,
+    format: str = "text",
+    ctx: Context = None,
 ) -> dict:
     """Send artifact + prompt to specified models in parallel, return aggregated responses.
 
@@ -76,34 +432,314 @@ async def review(
         models: Model IDs from models.yaml
         artifact_path: Absolute path to artifact file
         prompt: Review prompt with instructions
-        timeout: Override default timeout (seconds)
+        timeout: Fixed per-request timeout (seconds); by default each model's
+            timeout adapts to its observed latency and the request's size
+        deadline: Override the end-to-end deadline for the whole call (seconds);
+            models still running when it passes are reported as "deadline_exceeded"
+        stream: Stream responses and send progress notifications (default from config.yaml)
+        cache: Response cache mode — "read" (use cached, store new), "write"
+            (always call, refresh cache) or "bypass" (no cache)
+        mode: "full" sends the whole artifact; "delta" sends only sections changed
+            since the last reviewed snapshot of this path, plus an outline
+        prior_issues: Issues from the previous cycle, included in delta payloads
+        cycle: Review cycle number, reported on each review and recorded in the ledger
+        format: "text" (free-form review) or "issues" — schema-constrained JSON, returned
+            parsed as `issues` records (description, section, severity, complexity,
+            suggested_fix) on each review
     """
+    if cache not in CACHE_MODES:
+        return {
+            "error": f"Invalid cache mode: {cache} (expected one of {', '.join(CACHE_MODES)})",
+            "reviews": [],
+            "models_called": models,
+        }
+    if mode not in REVIEW_MODES:
+        return {
+            "error": f"Invalid review mode: {mode} (expected one of {', '.join(REVIEW_MODES)})",
+            "reviews": [],
+            "models_called": models,
+        }
+    if format not in REVIEW_FORMATS:
+        return {
+            "error": f"Invalid format: {format} (expected one of {', '.join(REVIEW_FORMATS)})",
+            "reviews": [],
+            "models_called": models,
+        }
+    structured = format == "issues"
+    if structured:
+        # Also part of the response cache key, so text and issue responses never mix
+        prompt = prompt + ISSUES_INSTRUCTION
+
     # Detect project root (cwd of the server process)
     project_root = os.getcwd()
 
-    # Validate and read artifact
+    # One models.yaml version for the whole call, even if it is reloaded meanwhile
+    models_config = _get_models_config()
+
+    # Validate and read artifact (in a worker thread; unchanged files come from memory)
     try:
-        validated_path = validate_artifact_path(artifact_path, project_root=project_root)
-        artifact_content = Path(validated_path).read_text()
+        file_timings = {}
+        validated_path, artifact_content = await _artifact_cache.load(artifact_path, project_root, file_timings)
+        for phase, ms in file_timings.items():
+            _metrics.observe(phase, ms)
     except (ValueError, FileNotFoundError) as e:
         return {"error": str(e), "reviews": [], "models_called": models}
 
+    # Delta mode: send changed sections + outline when it is smaller than the full artifact
+    review_content = artifact_content
+    delta_info = None
+    if mode == "delta":
+        previous = _snapshots.get(validated_path)
+        delta_info = {"applied": False, "full_chars": len(artifact_content)}
+        if previous is None:
+            delta_info["reason"] = "no previous snapshot"
+        else:
+            diff = diff_sections(previous, artifact_content)
+            if not diff.has_changes:
+                delta_info["reason"] = "artifact unchanged"
+            else:
+                delta_content = build_delta_content(diff, prior_issues)
+                if len(delta_content) >= len(artifact_content):
+                    delta_info["reason"] = "delta not smaller than artifact"
+                else:
+                    review_content = delta_content
+                    delta_info.update({
+                        "applied": True,
+                        "changed_sections": [s.label for s in diff.changed],
+                        "removed_sections": [s.label for s in diff.removed],
+                    })
+        delta_info["sent_chars"] = len(review_content)
+
     # Load skill config for defaults
+    config_start = time.monotonic()
     try:
         skill_config = load_skill_config(SKILL_CONFIG_YAML)
         default_timeout = skill_config.get("execution", {}).get("timeout_seconds", 120)
+        adaptive_timeout_settings = skill_config.get("execution", {}).get("adaptive_timeout")
+        default_deadline = skill_config.get("execution", {}).get("deadline_seconds")
         retry_attempts = skill_config.get("execution", {}).get("retry_attempts", 2)
+        retry_policy = RetryPolicy.from_config(skill_config.get("retry"))
+        default_stream = skill_config.get("execution", {}).get("stream", True)
+        max_response_bytes = skill_config.get("execution", {}).get("max_response_bytes")
+        default_parallel_chunks = skill_config.get("execution", {}).get("max_parallel_chunks", 4)
+        prompt_cache_ttl = skill_config.get("execution", {}).get("prompt_cache_ttl_seconds")
+        cache_settings = skill_config.get("cache")
+        ledger_settings = skill_config.get("ledger")
+        budget_settings = {**DEFAULT_BUDGET_SETTINGS, **(skill_config.get("budget") or {})}
     except FileNotFoundError:
         default_timeout = 120
+        adaptive_timeout_settings = None
+        default_deadline = None
         retry_attempts = 2
+        retry_policy = RetryPolicy()
+        default_stream = True
+        max_response_bytes = None
+        default_parallel_chunks = 4
+        prompt_cache_ttl = None
+        cache_settings = None
+        ledger_settings = None
+        budget_settings = dict(DEFAULT_BUDGET_SETTINGS)
+    _metrics.observe("config_load", (time.monotonic() - config_start) * 1000)
+
+    if budget_settings.get("count_tokens") not in TOKEN_COUNT_MODES:
+        return {
+            "error": f"Invalid budget.count_tokens: {budget_settings.get('count_tokens')} "
+                     f"(expected one of {', '.join(TOKEN_COUNT_MODES)})",
+            "reviews": [],
+            "models_called": models,
+        }
+
+    response_cache = _get_review_cache(cache_settings) if cache != "bypass" else None
+    cache_stats = {"hits": 0, "misses": 0}
+    ledger = _get_ledger(ledger_settings)
+    artifact_hash = content_hash(artifact_content) if ledger is not None else None
+    preflight: dict[str, dict] = {}
+
+    effective_deadline = deadline or default_deadline
+    effective_stream = default_stream if stream is None else stream
+
+    # Characters received across all models; monotonic progress value for notifications
+    received = {"total": 0}
+
+    def make_progress_callback(model_id: str):
+        model_chars = 0
+        last_sent = None
+
+        async def on_chunk(delta: str) -> None:
+            nonlocal model_chars, last_sent
+            model_chars += len(delta)
+            received["total"] += len(delta)
+            if ctx is None:
+                return
+            now = time.monotonic()
+            if last_sent is not None and now - last_sent < PROGRESS_INTERVAL_SECONDS:
+                return
+            last_sent = now
+            try:
+                await ctx.report_progress(
+                    received["total"],
+                    message=f"{model_id}: {model_chars} chars received",
+                )
+            except Exception:
+                # Progress is best-effort; never fail a review over a notification
+                pass
 
-    effective_timeout = timeout or default_timeout
+        return on_chunk
 
     # Build tasks for parallel execution
     start = time.monotonic()
+    deadline_at = start + effective_deadline if effective_deadline else None
+
+    async def run_model(model_id: str) -> ReviewResponse:
+        """Review with one model (chunked if it exceeds the model's limits)."""
+        provider, error = _get_provider(model_id, models_config)
+        if error:
+            return ReviewResponse(status="error", error=error)
+
+        model_cfg = models_config["models"][model_id]
+        settings = dict(models_config.get("settings", {}).get(model_id, {}))
+        settings["_retry_attempts"] = retry_attempts
+        settings["_retry_policy"] = retry_policy
+        if structured:
+            settings["_response_schema"] = ISSUES_SCHEMA
+            settings["_structured_output"] = model_cfg.get("structured_output", "json_schema")
+        if deadline_at is not None:
+            settings["_deadline"] = deadline_at
+        if max_response_bytes:
+            settings["_max_response_bytes"] = max_response_bytes
+        if prompt_cache_ttl:
+            settings["_prompt_cache_ttl"] = prompt_cache_ttl
+        if model_cfg.get("rate_limits"):
+            settings["_rate_limits"] = model_cfg["rate_limits"]
+
+        pricing = model_cfg.get("pricing")
+        limits = model_cfg.get("limits") or {}
+        on_chunk = make_progress_callback(model_id) if effective_stream else None
+
+        # An explicit timeout (call, then model) wins; otherwise adapt to observed latency
+        fixed_timeout = timeout or model_cfg.get("timeout_seconds")
+
+        def part_timeout(content: str) -> float:
+            if fixed_timeout:
+                return fixed_timeout
+            input_tokens = estimate_tokens(prompt) + estimate_tokens(content)
+            adaptive = _adaptive_timeouts.timeout(
+                model_id, input_tokens, adaptive_timeout_settings, settings.get("max_tokens"),
+            )
+            return adaptive or default_timeout
+
+        async def review_part(content: str):
+            attempt_timeout = part_timeout(content)
+            result = await provider.review(
+                artifact_content=content,
+                prompt=prompt,
+                model=model_cfg["model"],
+                settings={**settings, "_timeout_seconds": attempt_timeout},
+                pricing=pricing,
+                on_chunk=on_chunk,
+            )
+            if structured and result.status == "success":
+                result.issues, result.issues_error = parse_issues(result.response)
+            # Only clean first-attempt samples: retries and backoff say nothing about speed
+            if result.status == "success" and not result.retries_attempted and result.tokens_used:
+                queued = (result.timings or {}).get("queue", 0)
+                _adaptive_timeouts.record(
+                    model_id,
+                    result.latency_ms - queued,
+                    result.tokens_used.get("input", 0),
+                    result.tokens_used.get("output", 0),
+                )
+            # Timed-out attempts count at their timeout, so a model that slowed down isn't locked out
+            timed_out = (result.retry_reasons or []).count(REQUEST_TIMED_OUT)
+            timed_out += (result.error or "").startswith(REQUEST_TIMED_OUT)
+            for _ in range(timed_out):
+                _adaptive_timeouts.record_timeout(
+                    model_id, attempt_timeout, estimate_tokens(prompt) + estimate_tokens(content),
+                    settings.get("max_tokens"),
+                )
+            return result
+
+        output_reserve = settings.get("max_tokens") or DEFAULT_OUTPUT_RESERVE_TOKENS
+        if limits.get("context_tokens"):
+            room = int(limits["context_tokens"]) - estimate_tokens(prompt) - output_reserve
+            if room < MIN_CHUNK_TOKENS:
+                return ReviewResponse(
+                    status="error",
+                    error=f"Prompt plus {output_reserve} output tokens leaves {max(room, 0)} of the "
+                          f"{limits['context_tokens']}-token context of {model_id} for the artifact "
+                          f"(at least {MIN_CHUNK_TOKENS} needed)",
+                )
+
+        # Split artifacts that exceed the model's context/chunk limits and review parts in parallel
+        budget = chunk_budget(limits, prompt, settings.get("max_tokens"))
+        if budget and estimate_tokens(review_content) > budget:
+            parts = chunk_markdown(review_content, budget)
+        else:
+            parts = [review_content]
+
+        estimate, refusal, reserved = await _preflight(
+            provider, model_cfg, settings, prompt, parts, budget_settings, ledger,
+        )
+        estimate["timeout_seconds"] = max(part_timeout(p) for p in parts)
+        preflight[model_id] = estimate
+        if refusal:
+            return ReviewResponse(status="budget_exceeded", error=refusal)
+        result = None
+        call_start = time.monotonic()
+        try:
+            if len(parts) > 1:
+                result = await map_reduce_review(
+                    review_part, parts, limits.get("max_parallel_chunks", default_parallel_chunks),
+                )
+            else:
+                result = await review_part(parts[0])
+        finally:
+            cancelled = result is None
+            if cancelled:
+                # Hard deadline stop, losing hedge or cancelled job: still a provider call
+                past_deadline = deadline_at is not None and time.monotonic() >= deadline_at
+                # It may still be billed: its projected cost goes in the ledger as spent
+                result = ReviewResponse(
+                    status="deadline_exceeded" if past_deadline else "cancelled",
+                    error="Cancelled at the deadline" if past_deadline else "Cancelled",
+                    latency_ms=int((time.monotonic() - call_start) * 1000),
+                    cost_usd=estimate.get("projected_cost_usd"),
+                )
+            try:
+                await record_call(model_id, model_cfg, result, cancelled)
+            finally:
+                # After the ledger row, so the cost is always either reserved or recorded;
+                # even if cancelled again while writing it, or the reservation leaks
+                _spend.settle(reserved, result.cost_usd)
+        return result
+
+    async def record_call(model_id: str, model_cfg: dict, result: ReviewResponse, cancelled: bool) -> None:
+        """Record a provider call in the metrics and the ledger."""
+        if result.status == "success":
+            _latency_tracker.record(model_id, result.latency_ms)
+        _record_call_metrics(model_id, endpoint_key(model_cfg["endpoint"]), result)
+        if ledger is None:
+            return
+        tokens = result.tokens_used or {}
+        append = ledger.append({
+            "project": project_root,
+            "artifact": validated_path,
+            "artifact_hash": artifact_hash,
+            "model": model_id,
+            "endpoint": endpoint_key(model_cfg["endpoint"]),
+            "status": result.status,
+            "input_tokens": tokens.get("input"),
+            "output_tokens": tokens.get("output"),
+            "cost_usd": result.cost_usd,
+            "latency_ms": result.latency_ms,
+            "retries": result.retries_attempted,
+            "cycle": cycle,
+        })
+        # A cancelled task can be cancelled again while it writes; finish the row regardless
+        await (asyncio.shield(append) if cancelled else append)
 
     async def call_model(model_id: str) -> dict:
-        provider, error = _get_provider(model_id)
+        provider, error = _get_provider(model_id, models_config)
         if error:
             return {
                 "model": model_id,
@@ -112,72 +748,618 @@ async def review(
                 "retries_attempted": 0,
             }
 
-        model_cfg = _models_config["models"][model_id]
-        settings = dict(_models_config.get("settings", {}).get(model_id, {}))
-        settings["_retry_attempts"] = retry_attempts
-        settings["_timeout_seconds"] = effective_timeout
+        model_cfg = models_config["models"][model_id]
+        settings = dict(models_config.get("settings", {}).get(model_id, {}))
 
-        pricing = model_cfg.get("pricing")
+        key = None
+        if response_cache is not None:
+            key = cache_key(model_id, model_cfg["model"], settings, prompt, review_content)
+            if cache == "read":
+                lookup_start = time.monotonic()
+                cached = await response_cache.get(key)
+                if cached is not None:
+                    cache_stats["hits"] += 1
+                    cached.update({
+                        "cached": True,
+                        "cost_usd": 0.0,
+                        "cycle": cycle,
+                        "latency_ms": int((time.monotonic() - lookup_start) * 1000),
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                    })
+                    cached.pop("ttft_ms", None)
+                    return cached
+            cache_stats["misses"] += 1
 
-        result = await provider.review(
-            artifact_content=artifact_content,
-            prompt=prompt,
-            model=model_cfg["model"],
-            settings=settings,
-            pricing=pricing,
-        )
+        # Fallback chain: hedge to the next model when the current one is slow or fails
+        call_start = time.monotonic()
+        chain = [model_id] + [m for m in model_cfg.get("fallbacks", []) if m != model_id]
+        if len(chain) > 1:
+            result, served_by, launched = await hedged_review(chain, run_model, _hedge_threshold_ms)
+        else:
+            result, served_by, launched = await run_model(model_id), model_id, [model_id]
 
         entry = {
             "model": model_id,
             "status": result.status,
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
+        if len(chain) > 1:
+            entry["served_by"] = served_by
+            entry["hedged"] = len(launched) > 1
+            if served_by != model_id:
+                # The winner's own latency excludes the time spent waiting on the primary
+                result.latency_ms = int((time.monotonic() - call_start) * 1000)
         if result.status == "success":
             entry["response"] = result.response
             entry["tokens_used"] = result.tokens_used
             entry["cost_usd"] = result.cost_usd
             entry["latency_ms"] = result.latency_ms
-            entry["cycle"] = 1
+            if result.ttft_ms is not None:
+                entry["ttft_ms"] = result.ttft_ms
+            if result.truncated:
+                entry["truncated"] = True
+            if result.chunks:
+                entry["chunks"] = result.chunks
+            if result.issues is not None:
+                entry["issues"] = result.issues
+            if result.issues_error:
+                entry["issues_error"] = result.issues_error
+            # Don't cache a fallback's answer under the primary's key
+            if key is not None and not result.truncated and served_by == model_id:
+                await response_cache.put(key, entry)
+            if result.retries_attempted:
+                entry["retries_attempted"] = result.retries_attempted
         else:
             entry["error"] = result.error
             entry["retries_attempted"] = result.retries_attempted
+            if result.chunks:
+                entry["chunks"] = result.chunks
+        # Per call, not per response: set after the cache put
+        entry["cycle"] = cycle
+        if result.retry_reasons:
+            entry["retry_reasons"] = result.retry_reasons
 
         return entry
 
-    reviews = await asyncio.gather(
-        *(call_model(m) for m in models),
-        return_exceptions=True,
-    )
+    # Providers stop retrying at the deadline; this is the hard stop for anything
+    # still in flight (rate-limit waits, slow streams)
+    tasks = [asyncio.create_task(call_model(m)) for m in models]
+    pending = set()
+    if tasks:
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=effective_deadline or None)
+        except asyncio.CancelledError:
+            # The caller went away (e.g. a cancelled job): stop the model calls with it
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    aggregation_start = time.monotonic()
 
-    # Handle any unexpected exceptions
+    # Keep finished reviews; mark unfinished ones and handle unexpected exceptions
     processed = []
-    for i, r in enumerate(reviews):
-        if isinstance(r, Exception):
+    for model_id, task in zip(models, tasks):
+        if task in pending:
+            processed.append({
+                "model": model_id,
+                "status": "deadline_exceeded",
+                "error": f"No response within the {effective_deadline}s deadline",
+                "retries_attempted": 0,
+            })
+        elif task.exception() is not None:
             processed.append({
-                "model": models[i],
+                "model": model_id,
                 "status": "error",
-                "error": str(r),
+                "error": str(task.exception()),
                 "retries_attempted": 0,
             })
         else:
-            processed.append(r)
+            processed.append(task.result())
 
     total_latency = int((time.monotonic() - start) * 1000)
 
-    # Aggregate tokens and cost
-    total_input = sum(r.get("tokens_used", {}).get("input", 0) for r in processed if r.get("tokens_used"))
-    total_output = sum(r.get("tokens_used", {}).get("output", 0) for r in processed if r.get("tokens_used"))
-    costs = [r["cost_usd"] for r in processed if r.get("cost_usd") is not None]
-    total_cost = round(sum(costs), 6) if costs else None
+    if any(r["status"] == "success" for r in processed):
+        _remember_snapshot(validated_path, artifact_content)
 
-    return {
+    result = {
         "reviews": processed,
         "models_called": models,
         "parallel": True,
         "total_latency_ms": total_latency,
-        "total_tokens": {"input": total_input, "output": total_output},
-        "total_cost_usd": total_cost,
+        **_aggregate_usage(processed),
+        "cache": {"mode": cache, "enabled": response_cache is not None, **cache_stats},
+        "mode": mode,
     }
+    if delta_info is not None:
+        result["delta"] = delta_info
+    if preflight:
+        result["preflight"] = preflight
+    _metrics.observe("aggregation", (time.monotonic() - aggregation_start) * 1000)
+    _metrics.observe("review", total_latency)
+    return result
+
+
+async def _preflight(
+    provider, model_cfg: dict, settings: dict, prompt: str, parts: list[str], budget_settings: dict,
+    ledger: CallLedger | None,
+) -> tuple[dict, str | None, float]:
+    """Project a model call's tokens and cost and check them against the budgets.
+
+    Returns (estimate, refusal error or None, cost reserved against the daily
+    budget). Output is projected at `max_tokens` (or the default output
+    reserve) per part, so the projection is an upper bound. Every Claude
+    session runs its own server, so the daily budget is checked against the
+    ledger's spend for today (all processes) plus this process's in-flight
+    reservations; without a ledger it can't be enforced and calls are refused.
+    """
+    if budget_settings.get("count_tokens") == "provider":
+        counts = await asyncio.gather(*(provider.count_tokens(p, prompt, model_cfg["model"]) for p in parts))
+    else:
+        counts = [(estimate_tokens(prompt) + estimate_tokens(p), "local") for p in parts]
+    input_tokens = sum(n for n, _ in counts)
+    output_tokens = (settings.get("max_tokens") or DEFAULT_OUTPUT_RESERVE_TOKENS) * len(parts)
+    projected = project_cost(input_tokens, output_tokens, model_cfg.get("pricing"))
+    estimate = {
+        "input_tokens": input_tokens,
+        "max_output_tokens": output_tokens,
+        "projected_cost_usd": projected,
+        "parts": len(parts),
+        "token_count": "provider" if all(src == "provider" for _, src in counts) else "local",
+    }
+
+    error = check_call_budget(projected, budget_settings.get("max_call_usd"))
+    if error:
+        return estimate, error, 0.0
+    reserve = projected or 0.0
+    daily_limit = budget_settings.get("max_daily_usd")
+    if daily_limit is not None:
+        if ledger is None:
+            return estimate, (
+                "budget.max_daily_usd needs the call ledger (ledger.enabled) to count spend "
+                "across server processes"
+            ), 0.0
+        today = utc_day()
+        _spend.sync(today, await ledger.spent_on(today))
+    if not _spend.try_reserve(reserve, daily_limit):
+        return estimate, (
+            f"Projected cost ${reserve:.4f} would exceed the daily budget of ${daily_limit:.4f} "
+            f"(${_spend.spent + _spend.reserved:.4f} spent or reserved today)"
+        ), 0.0
+    return estimate, None, reserve
+
+
+def _record_call_metrics(model_id: str, endpoint: str, result: ReviewResponse) -> None:
+    """Count one provider call and record its phase timings."""
+    _metrics.increment("calls", model=model_id, endpoint=endpoint)
+    if result.retries_attempted:
+        _metrics.increment("retries", result.retries_attempted, model=model_id, endpoint=endpoint)
+    if result.status != "success":
+        _metrics.increment("errors", model=model_id, endpoint=endpoint)
+    _metrics.observe("provider", result.latency_ms, model=model_id, endpoint=endpoint)
+    for phase, ms in (result.timings or {}).items():
+        _metrics.observe(phase, ms, model=model_id, endpoint=endpoint)
+
+
+@mcp.tool()
+async def query_ledger(
+    report: str,
+    since_days: float = 30,
+    project: str | None = None,
+    model: str | None = None,
+) -> dict:
+    """Aggregate the persistent ledger of provider calls.
+
+    Args:
+        report: "cost_by_day" (cost and tokens per project per UTC day),
+            "latency_by_model" (p50/p95 of successful calls) or
+            "errors_by_endpoint" (error rate and retries)
+        since_days: Only include calls from the last N days
+        project: Only include calls made from this project root
+        model: Only include calls to this model ID
+    """
+    if report not in REPORTS:
+        return {"error": f"Invalid report: {report} (expected one of {', '.join(REPORTS)})"}
+    try:
+        ledger_settings = load_skill_config(SKILL_CONFIG_YAML).get("ledger")
+    except FileNotFoundError:
+        ledger_settings = None
+    ledger = _get_ledger(ledger_settings)
+    if ledger is None:
+        return {"error": "Ledger is disabled (set ledger.enabled in config.yaml)"}
+    rows = await ledger.query(report, since_days=since_days, project=project, model=model)
+    return {"report": report, "since_days": since_days, "rows": rows}
+
+
+@mcp.tool()
+def stats(format: str = "json") -> dict:
+    """Hot-path metrics since server start: latency percentiles per review phase,
+    and call, retry and error counts per model and endpoint.
+
+    Phases: config_load, path_validation, artifact_read, aggregation and review
+    (whole call) on the server; queue (rate limiter), backoff, connect, ttfb,
+    body and provider (whole model call) per model and endpoint.
+
+    Args:
+        format: "json" (default) or "prometheus" for the Prometheus text format
+    """
+    if format == "prometheus":
+        return {"format": "prometheus", "text": _metrics.to_prometheus()}
+    if format != "json":
+        return {"error": f"Invalid format: {format} (expected json or prometheus)"}
+    return {**_metrics.snapshot(), "retry_budget": _get_retry_budget().snapshot()}
+
+
+@mcp.tool()
+def synthesize(reviews: list[dict], similarity: float = DEFAULT_SIMILARITY) -> dict:
+    """Deduplicate issues across model reviews and count consensus.
+
+    Near-duplicate issues from different models are grouped by TF-IDF cosine
+    similarity of their descriptions. Each group lists its source models, a
+    consensus count (distinct models) and the members it merged, ordered by
+    consensus then severity. Reviews without structured `issues` fall back to
+    the list items of their free-text response.
+
+    Args:
+        reviews: The `reviews` list from a `review` call (or one artifact's
+            reviews from `review_batch`)
+        similarity: Cosine similarity (0-1] at which two issues are treated as
+            the same; lower merges more aggressively
+    """
+    if not 0 < similarity <= 1:
+        return {"error": f"Invalid similarity: {similarity} (expected a value in (0, 1])"}
+    start = time.monotonic()
+    result = synthesize_reviews(reviews, threshold=similarity)
+    elapsed = (time.monotonic() - start) * 1000
+    _metrics.observe("synthesize", elapsed)
+    result["elapsed_ms"] = round(elapsed, 2)
+    return result
+
+
+@mcp.tool()
+async def run_review_loop(
+    artifact_path: str,
+    prompt: str,
+    models: list[str] | None = None,
+    reset: bool = False,
+    similarity: float = DEFAULT_SIMILARITY,
+    timeout: int | None = None,
+    deadline: int | None = None,
+    cache: str = "read",
+    ctx: Context = None,
+) -> dict:
+    """Run the next review cycle of an artifact and decide whether the loop is done.
+
+    The server keeps the loop's state per artifact: the cycle number, the
+    Critical/High issues still open and each cycle's counts. A cycle reviews
+    the artifact with format="issues", synthesizes the reviews and applies
+    the config.yaml `cycles` rules. `decision` is "continue" (fix the open
+    issues and call again), "complete", "stuck" (an issue survived
+    `stuck_signal` cycles), "structural_problem" (Critical issues after
+    `structural_problem_signal` cycles) or "max_cycles". Only the synthesized
+    issues are returned, not the model responses. While issues are open and
+    the artifact hasn't changed since the last cycle, no models are called
+    and the decision is "awaiting_changes".
+
+    Args:
+        artifact_path: Absolute path to artifact file
+        prompt: Review prompt with instructions
+        models: Model IDs from models.yaml (default: config.yaml default_models)
+        reset: Start a new loop for this artifact, e.g. after a stop was resolved
+        similarity: Issue similarity threshold, as for `synthesize`; also used
+            to recognize an issue again in the next cycle
+        timeout, deadline, cache: As for `review`
+    """
+    if not 0 < similarity <= 1:
+        return {"error": f"Invalid similarity: {similarity} (expected a value in (0, 1])"}
+    try:
+        skill_config = load_skill_config(SKILL_CONFIG_YAML)
+    except FileNotFoundError:
+        skill_config = {}
+    models = models or skill_config.get("default_models") or []
+    if not models:
+        return {"error": "No models given and no default_models in config.yaml"}
+
+    try:
+        validated_path, content = await _artifact_cache.load(artifact_path, os.getcwd())
+    except (ValueError, FileNotFoundError) as e:
+        return {"error": str(e)}
+
+    loop = _review_loops.get(validated_path)
+    if loop is None or reset:
+        loop = ReviewLoop(validated_path, skill_config.get("cycles"), similarity)
+    _remember_loop(loop)
+    if loop.stopped:
+        return {**loop.summary(), "note": "This loop has stopped; pass reset=true to start a new one"}
+
+    version = content_hash(content)
+    if loop.open_issues and version == loop.content_hash:
+        return {
+            **loop.summary(),
+            "decision": "awaiting_changes",
+            "reason": f"Artifact unchanged since cycle {loop.cycle}; fix the open issues first",
+        }
+
+    result = await review(
+        models=models,
+        artifact_path=validated_path,
+        prompt=prompt,
+        timeout=timeout,
+        deadline=deadline,
+        cache=cache,
+        cycle=loop.cycle + 1,
+        format="issues",
+        ctx=ctx,
+    )
+    if "error" in result:
+        return {**loop.summary(), "error": result["error"]}
+    reviews = [
+        {k: r[k] for k in ("model", "status", "cost_usd", "cached", "error") if k in r}
+        for r in result["reviews"]
+    ]
+    if not any(r["status"] == "success" for r in result["reviews"]):
+        # Not counted as a cycle: nothing was reviewed
+        return {**loop.summary(), "error": "No model returned a review", "reviews": reviews}
+
+    synthesis = synthesize_reviews(result["reviews"], threshold=similarity)
+    loop.record_cycle(synthesis["issues"], version, result["total_cost_usd"])
+    return {
+        **loop.summary(),
+        "issues": [{k: v for k, v in g.items() if k != "members"} for g in synthesis["issues"]],
+        "counts": synthesis["counts"],
+        "reviews": reviews,
+        "total_cost_usd": result["total_cost_usd"],
+        "total_tokens": result["total_tokens"],
+    }
+
+
+def _aggregate_usage(reviews: list[dict]) -> dict:
+    """Total tokens and cost over review entries (cache hits sent nothing to the provider)."""
+    sent = [r for r in reviews if r.get("tokens_used") and not r.get("cached")]
+    costs = [r["cost_usd"] for r in reviews if r.get("cost_usd") is not None]
+    return {
+        "total_tokens": {
+            "input": sum(r["tokens_used"].get("input", 0) for r in sent),
+            "output": sum(r["tokens_used"].get("output", 0) for r in sent),
+            "cached_input": sum(r["tokens_used"].get("cached_input", 0) for r in sent),
+        },
+        "total_cost_usd": round(sum(costs), 6) if costs else None,
+    }
+
+
+def _expand_artifacts(patterns: list[str], project_root: str) -> tuple[list[str], list[dict]]:
+    """Resolve artifact paths and globs (relative globs are matched from the project root).
+
+    Returns validated paths in pattern order without duplicates, and an error
+    entry for each pattern or path that couldn't be used.
+    """
+    paths, errors = [], []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            base = pattern if os.path.isabs(pattern) else os.path.join(project_root, pattern)
+            matches = [m for m in sorted(glob.glob(base, recursive=True)) if os.path.isfile(m)]
+            if not matches:
+                errors.append({"artifact_path": pattern, "error": f"No files match: {pattern}"})
+        else:
+            matches = [pattern]
+        for match in matches:
+            try:
+                validated = validate_artifact_path(match, project_root=project_root)
+            except (ValueError, FileNotFoundError) as e:
+                errors.append({"artifact_path": match, "error": str(e)})
+                continue
+            if validated not in paths:
+                paths.append(validated)
+    return paths, errors
+
+
+@mcp.tool()
+async def review_batch(
+    artifacts: list[str],
+    models: list[str],
+    prompt: str,
+    timeout: int | None = None,
+    deadline: int | None = None,
+    cache: str = "read",
+    format: str = "text",
+    ctx: Context = None,
+) -> dict:
+    """Review many artifacts with many models; every (artifact, model) pair runs
+    under global and per-provider concurrency limits.
+
+    Args:
+        artifacts: Absolute artifact paths or globs (relative globs, e.g. "docs/*.md",
+            are matched from the project root)
+        models: Model IDs from models.yaml
+        prompt: Review prompt with instructions
+        timeout: Override default per-request timeout (seconds)
+        deadline: End-to-end deadline for the whole batch (seconds); pairs not
+            finished by then are reported as "deadline_exceeded"
+        cache: Response cache mode, as for `review`
+        format: "text" or "issues", as for `review`
+    """
+    if cache not in CACHE_MODES:
+        return {
+            "error": f"Invalid cache mode: {cache} (expected one of {', '.join(CACHE_MODES)})",
+            "artifacts": [],
+            "models_called": models,
+        }
+    if format not in REVIEW_FORMATS:
+        return {
+            "error": f"Invalid format: {format} (expected one of {', '.join(REVIEW_FORMATS)})",
+            "artifacts": [],
+            "models_called": models,
+        }
+
+    project_root = os.getcwd()
+    paths, errors = await asyncio.to_thread(_expand_artifacts, artifacts, project_root)
+    scheduler = _get_batch_scheduler()
+    pairs = [(path, model_id) for path in paths for model_id in dict.fromkeys(models)]
+
+    start = time.monotonic()
+    deadline_at = start + deadline if deadline else None
+
+    async def run_pair(path: str, model_id: str) -> tuple[str, dict]:
+        model_cfg = _get_models_config()["models"].get(model_id)
+        provider_key = endpoint_key(model_cfg["endpoint"]) if model_cfg else model_id
+        async with scheduler.slot(provider_key):
+            remaining = None
+            if deadline_at is not None:
+                remaining = deadline_at - time.monotonic()
+                if remaining <= 0:
+                    return path, {
+                        "model": model_id,
+                        "status": "deadline_exceeded",
+                        "error": f"Not started within the {deadline}s batch deadline",
+                        "retries_attempted": 0,
+                    }
+            try:
+                result = await review(
+                    models=[model_id],
+                    artifact_path=path,
+                    prompt=prompt,
+                    timeout=timeout,
+                    deadline=remaining,
+                    cache=cache,
+                    format=format,
+                )
+            except Exception as e:
+                result = {"error": str(e), "reviews": []}
+        if not result["reviews"]:
+            return path, {"model": model_id, "status": "error", "error": result["error"], "retries_attempted": 0}
+        return path, result["reviews"][0]
+
+    # Report each pair as it completes; results are returned grouped per artifact
+    by_path: dict[str, dict[str, dict]] = {path: {} for path in paths}
+    tasks = [asyncio.create_task(run_pair(path, model_id)) for path, model_id in pairs]
+    try:
+        for completed, next_done in enumerate(asyncio.as_completed(tasks), 1):
+            path, entry = await next_done
+            by_path[path][entry["model"]] = entry
+            if ctx is not None:
+                try:
+                    await ctx.report_progress(
+                        completed,
+                        len(pairs),
+                        message=f"{os.path.relpath(path, project_root)} × {entry['model']}: {entry['status']}",
+                    )
+                except Exception:
+                    pass
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    results = [
+        {"artifact_path": path, "reviews": [by_path[path][m] for m in models if m in by_path[path]]}
+        for path in paths
+    ]
+    reviews = [entry for r in results for entry in r["reviews"]]
+    return {
+        "artifacts": results,
+        "errors": errors,
+        "models_called": models,
+        "pairs": len(pairs),
+        "succeeded": sum(1 for r in reviews if r["status"] == "success"),
+        "total_latency_ms": int((time.monotonic() - start) * 1000),
+        **_aggregate_usage(reviews),
+        "scheduler": {
+            "max_concurrency": scheduler.max_concurrency,
+            "max_per_provider": scheduler.max_per_provider,
+        },
+    }
+
+
+@mcp.tool()
+async def submit_review(
+    models: list[str],
+    artifact_path: str,
+    prompt: str,
+    timeout: int | None = None,
+    deadline: int | None = None,
+    stream: bool | None = None,
+    cache: str = "read",
+    mode: str = "full",
+    prior_issues: list[str] | None = None,
+    cycle: int = 1,
+    format: str = "text",
+) -> dict:
+    """Start a `review` in the background and return its job ID right away.
+
+    Poll with get_review_status, collect with get_review_result, stop with
+    cancel_review. Arguments are as for `review`; progress notifications
+    aren't sent for background jobs.
+    """
+    try:
+        # Off the event loop, and the job's own load then hits the cache
+        validated_path, _ = await _artifact_cache.load(artifact_path, os.getcwd())
+    except (ValueError, FileNotFoundError) as e:
+        return {"error": str(e)}
+
+    async def run() -> dict:
+        return await review(
+            models=models, artifact_path=validated_path, prompt=prompt, timeout=timeout,
+            deadline=deadline, stream=stream, cache=cache, mode=mode, prior_issues=prior_issues,
+            cycle=cycle, format=format,
+        )
+
+    try:
+        job = _get_job_store().submit(run, {"models": models, "artifact_path": validated_path})
+    except RuntimeError as e:
+        return {"error": str(e)}
+    return job.status()
+
+
+def _unknown_job(job_id: str) -> dict:
+    ttl = _get_job_store().settings["result_ttl_seconds"]
+    return {"error": f"Unknown job: {job_id} (finished jobs are kept for up to {ttl}s)"}
+
+
+@mcp.tool()
+def get_review_status(job_id: str) -> dict:
+    """State of a submitted review: running, succeeded, failed or cancelled.
+
+    Args:
+        job_id: ID returned by submit_review
+    """
+    job = _get_job_store().get(job_id)
+    return job.status() if job is not None else _unknown_job(job_id)
+
+
+@mcp.tool()
+async def get_review_result(job_id: str, wait: float = 0) -> dict:
+    """The `review` result of a finished job, with its status.
+
+    Args:
+        job_id: ID returned by submit_review
+        wait: Seconds to wait for a running job to finish before returning
+            (it keeps running if it doesn't)
+    """
+    store = _get_job_store()
+    job = store.get(job_id)
+    if job is None:
+        return _unknown_job(job_id)
+    await store.wait(job, wait)
+    status = job.status()
+    if job.result is not None:
+        status["result"] = job.result
+    return status
+
+
+@mcp.tool()
+async def cancel_review(job_id: str) -> dict:
+    """Cancel a running review job; model calls in flight are abandoned.
+
+    Args:
+        job_id: ID returned by submit_review
+    """
+    store = _get_job_store()
+    job = store.get(job_id)
+    if job is None:
+        return _unknown_job(job_id)
+    cancelled = await store.cancel(job)
+    return {**job.status(), "cancelled": cancelled}
 
 
 def main():
@@ -0,0 +1,66 @@
+"""Hedged requests across a model's fallback chain."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from providers.base import ReviewResponse
+
+
+async def hedged_review(
+    chain: list[str],
+    run: Callable[[str], Awaitable[ReviewResponse]],
+    hedge_after_ms: Callable[[str], float | None],
+) -> tuple[ReviewResponse, str, list[str]]:
+    """Run `chain[0]`, adding the next model in the chain whenever the newest
+    request passes its hedge threshold or a request fails.
+
+    The first successful result wins and the remaining requests are cancelled,
+    as does a result that ran out the caller's deadline. Returns (result,
+    model that served it, models that were launched). If every model fails,
+    the last failure is returned.
+    """
+    tasks: dict[asyncio.Task, str] = {}
+    launched: list[str] = []
+    last: tuple[ReviewResponse, str] | None = None
+
+    def launch_next() -> bool:
+        if len(launched) >= len(chain):
+            return False
+        model_id = chain[len(launched)]
+        launched.append(model_id)
+        tasks[asyncio.create_task(run(model_id))] = model_id
+        return True
+
+    launch_next()
+    try:
+        while tasks:
+            threshold = hedge_after_ms(launched[-1]) if len(launched) < len(chain) else None
+            done, _ = await asyncio.wait(
+                tasks,
+                timeout=threshold / 1000 if threshold else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                launch_next()
+                continue
+            for task in done:
+                model_id = tasks.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    result = ReviewResponse(status="error", error=str(e))
+                if result.status == "success":
+                    return result, model_id, launched
+                if result.status == "deadline_exceeded":
+                    # Out of time: a fallback can't finish either
+                    return result, model_id, launched
+                last = (result, model_id)
+            if not tasks:
+                launch_next()
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    return last[0], last[1], launched
@@ -0,0 +1,96 @@
+"""Structured review output: the issue schema and parsing of model responses."""
+
+import re
+
+from providers.wire import JSONDecodeError, loads
+
+REVIEW_FORMATS = ("text", "issues")
+
+SEVERITIES = ("Critical", "High", "Low")
+COMPLEXITIES = ("Low", "Medium", "High")
+
+ISSUE_FIELDS = ("description", "section", "severity", "complexity", "suggested_fix")
+
+# JSON Schema for format="issues" (OpenAI strict json_schema subset)
+ISSUES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "issues": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "description": {"type": "string"},
+                    "section": {"type": "string"},
+                    "severity": {"type": "string", "enum": list(SEVERITIES)},
+                    "complexity": {"type": "string", "enum": list(COMPLEXITIES)},
+                    "suggested_fix": {"type": "string"},
+                },
+                "required": list(ISSUE_FIELDS),
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["issues"],
+    "additionalProperties": False,
+}
+
+# Appended to the review prompt so models without schema enforcement still comply
+ISSUES_INSTRUCTION = """
+
+## Output format
+
+Respond with a single JSON object and nothing else: {"issues": [...]}. Each issue has
+- "description": the problem, in one or two sentences
+- "section": the artifact heading it concerns ("" if general)
+- "severity": "Critical" (must resolve; blocks the next stage or fundamentally flawed),
+  "High" (should resolve; significant gap) or "Low" (minor, polish)
+- "complexity": "Low" (direct edit), "Medium" (design thinking, small refactor) or
+  "High" (research or architectural rethinking)
+- "suggested_fix": a concrete fix ("" if none)
+Only include actionable issues; no praise or general observations."""
+
+_FENCE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+def _choice(value, allowed: tuple[str, ...]) -> str | None:
+    if not isinstance(value, str):
+        return None
+    for option in allowed:
+        if value.strip().lower() == option.lower():
+            return option
+    return None
+
+
+def parse_issues(text: str | None) -> tuple[list[dict] | None, str | None]:
+    """Parse a format="issues" response into issue records.
+
+    Returns (issues, None), or (None, error) if the response isn't the
+    expected JSON. Tolerates a markdown code fence around the object and a
+    bare list. Severity and complexity are normalized to the spec's casing;
+    entries without a description are dropped.
+    """
+    raw = (text or "").strip()
+    fenced = _FENCE.match(raw)
+    if fenced:
+        raw = fenced.group(1)
+    try:
+        data = loads(raw)
+    except (JSONDecodeError, ValueError) as e:
+        return None, f"Response is not valid JSON: {e}"
+    items = data.get("issues") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return None, "Response has no `issues` list"
+
+    issues = []
+    for item in items:
+        if not isinstance(item, dict) or not str(item.get("description") or "").strip():
+            continue
+        issues.append({
+            "description": str(item["description"]).strip(),
+            "section": str(item.get("section") or "").strip(),
+            "severity": _choice(item.get("severity"), SEVERITIES),
+            "complexity": _choice(item.get("complexity"), COMPLEXITIES),
+            "suggested_fix": str(item.get("suggested_fix") or "").strip(),
+        })
+    return issues, None
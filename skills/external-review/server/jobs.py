@@ -0,0 +1,117 @@
+"""Background review jobs: submit, poll, fetch results, cancel."""
+
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+DEFAULT_JOB_SETTINGS = {
+    "max_running": 8,            # submissions beyond this are refused
+    "max_finished": 32,          # finished jobs kept for get_review_result
+    "result_ttl_seconds": 3600,  # and for at most this long
+}
+
+JOB_STATES = ("running", "succeeded", "failed", "cancelled")
+
+
+class Job:
+    """One background review: its task, and its result once finished."""
+
+    def __init__(self, job_id: str, summary: dict):
+        self.id = job_id
+        self.summary = summary
+        self.state = "running"
+        self.submitted_at = time.time()
+        self.finished_at: float | None = None
+        self.result: dict | None = None
+        self.error: str | None = None
+        self.task: asyncio.Task | None = None
+
+    def status(self) -> dict:
+        end = self.finished_at or time.time()
+        status = {
+            "job_id": self.id,
+            "state": self.state,
+            **self.summary,
+            "submitted_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.submitted_at)),
+            "elapsed_seconds": round(end - self.submitted_at, 3),
+        }
+        if self.error:
+            status["error"] = self.error
+        return status
+
+
+class JobStore:
+    """Running and recently finished jobs.
+
+    Finished jobs are kept until `max_finished` newer ones have finished or
+    `result_ttl_seconds` has passed, whichever comes first; running jobs are
+    never dropped.
+    """
+
+    def __init__(self, settings: dict | None = None):
+        cfg = {**DEFAULT_JOB_SETTINGS, **(settings or {})}
+        self.settings = cfg
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._finished: OrderedDict[str, float] = OrderedDict()
+
+    def running(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.state == "running")
+
+    def submit(self, run: Callable[[], Awaitable[dict]], summary: dict) -> Job:
+        """Start `run()` as a background task; raises RuntimeError when at capacity."""
+        self.prune()
+        if self.running() >= self.settings["max_running"]:
+            raise RuntimeError(f"Too many running jobs (max {self.settings['max_running']})")
+        job = Job(secrets.token_hex(8), summary)
+        job.task = asyncio.create_task(run())
+        job.task.add_done_callback(lambda task: self._finish(job, task))
+        self._jobs[job.id] = job
+        return job
+
+    def _finish(self, job: Job, task: asyncio.Task) -> None:
+        job.finished_at = time.time()
+        if task.cancelled():
+            job.state = "cancelled"
+        elif task.exception() is not None:
+            job.state = "failed"
+            job.error = str(task.exception()) or type(task.exception()).__name__
+        else:
+            job.result = task.result()
+            # Tools report bad arguments as an `error` key rather than raising
+            job.state = "failed" if "error" in job.result else "succeeded"
+            job.error = job.result.get("error")
+        self._finished[job.id] = job.finished_at
+        self.prune()
+
+    def prune(self) -> None:
+        cutoff = time.time() - self.settings["result_ttl_seconds"]
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if len(self._finished) <= self.settings["max_finished"] and finished_at >= cutoff:
+                break
+            del self._finished[job_id]
+            self._jobs.pop(job_id, None)
+
+    def get(self, job_id: str) -> Job | None:
+        self.prune()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job, timeout: float) -> None:
+        """Wait up to `timeout` seconds for a job to finish (the job keeps running on timeout)."""
+        if job.task is None or job.task.done() or timeout <= 0:
+            return
+        await asyncio.wait([job.task], timeout=timeout)
+
+    async def cancel(self, job: Job) -> bool:
+        """Cancel a running job and wait for it to stop; False if it had already finished."""
+        if job.task is None or job.task.done():
+            return False
+        job.task.cancel()
+        await asyncio.gather(job.task, return_exceptions=True)
+        return True
+
+    async def cancel_all(self) -> None:
+        for job in list(self._jobs.values()):
+            await self.cancel(job)
@@ -0,0 +1,109 @@
+"""Rolling per-model latency history for percentile-based decisions."""
+
+import math
+from collections import deque
+
+DEFAULT_WINDOW = 200
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile (q in 0..100) of `values`, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class LatencyTracker:
+    """Keeps the last `window` successful latencies (ms) per key."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self._samples: dict[str, deque] = {}
+
+    def record(self, key: str, latency_ms: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(latency_ms)
+
+    def count(self, key: str) -> int:
+        return len(self._samples.get(key, ()))
+
+    def percentile(self, key: str, q: float, min_samples: int = 1) -> float | None:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < min_samples:
+            return None
+        return percentile(list(samples), q)
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+
+DEFAULT_ADAPTIVE_TIMEOUT_SETTINGS = {
+    "enabled": True,
+    "min_samples": 10,         # clean samples before the fixed timeout is replaced
+    "multiplier": 2.0,         # headroom over the p99 projection
+    "floor_seconds": 15,
+    "ceiling_seconds": 600,
+    "output_token_weight": 10,  # an output token costs this many input tokens of time
+}
+
+
+class AdaptiveTimeouts:
+    """Per-model request timeouts from a rolling window of latency samples.
+
+    Each sample is normalized to ms per unit of work, where work is input
+    tokens plus weighted output tokens. A request's timeout is the p99 rate
+    times its projected work (output projected at the model's median observed
+    output), times `multiplier`, clamped to [floor, ceiling]. Fast models get
+    short timeouts and fail fast on stalls; slow models get room for big
+    artifacts.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        # model -> deque of (latency_ms, input_tokens, output_tokens)
+        self._samples: dict[str, deque] = {}
+
+    def record(self, key: str, latency_ms: float, input_tokens: int, output_tokens: int) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append((latency_ms, input_tokens, output_tokens))
+
+    def record_timeout(self, key: str, timeout_seconds: float, input_tokens: int,
+                       max_output_tokens: int | None = None) -> None:
+        """Record an attempt cut off at `timeout_seconds` as if it took that long.
+
+        The real latency was at least that, so a model that slows down past
+        its timeout raises its own p99 and gets a longer one, instead of
+        timing out forever with no new sample to learn from.
+        """
+        samples = self._samples.get(key)
+        self.record(key, timeout_seconds * 1000, input_tokens, self._expected_output(samples, max_output_tokens))
+
+    def count(self, key: str) -> int:
+        return len(self._samples.get(key, ()))
+
+    @staticmethod
+    def _expected_output(samples, max_output_tokens: int | None) -> int:
+        expected = percentile([out for _, _, out in samples or ()], 50) or 0
+        return min(expected, max_output_tokens) if max_output_tokens else expected
+
+    def timeout(self, key: str, input_tokens: int, settings: dict | None = None,
+                max_output_tokens: int | None = None) -> float | None:
+        """Timeout (seconds) for a request, or None until there are enough samples."""
+        cfg = {**DEFAULT_ADAPTIVE_TIMEOUT_SETTINGS, **(settings or {})}
+        samples = self._samples.get(key)
+        if not cfg["enabled"] or not samples or len(samples) < cfg["min_samples"]:
+            return None
+        weight = cfg["output_token_weight"]
+        rates = [ms / max(inp + weight * out, 1) for ms, inp, out in samples]
+        work = input_tokens + weight * self._expected_output(samples, max_output_tokens)
+        seconds = percentile(rates, 99) * work / 1000 * cfg["multiplier"]
+        return round(min(max(seconds, cfg["floor_seconds"]), cfg["ceiling_seconds"]), 1)
+
+    def clear(self) -> None:
+        self._samples.clear()
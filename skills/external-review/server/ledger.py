@@ -0,0 +1,177 @@
+"""Persistent ledger of provider calls (SQLite, WAL) with aggregate reports."""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_LEDGER_SETTINGS = {
+    "enabled": False,
+    "path": "~/.claude/external-review/ledger.db",
+}
+
+REPORTS = ("cost_by_day", "latency_by_model", "errors_by_endpoint")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    project TEXT NOT NULL,
+    artifact TEXT NOT NULL,
+    artifact_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    status TEXT NOT NULL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    cost_usd REAL,
+    latency_ms INTEGER,
+    retries INTEGER NOT NULL DEFAULT 0,
+    cycle INTEGER
+);
+CREATE INDEX IF NOT EXISTS calls_day_project ON calls (day, project);
+CREATE INDEX IF NOT EXISTS calls_ts_model ON calls (ts, model);
+"""
+
+_COLUMNS = (
+    "ts", "day", "project", "artifact", "artifact_hash", "model", "endpoint", "status",
+    "input_tokens", "output_tokens", "cost_usd", "latency_ms", "retries", "cycle",
+)
+
+_INSERT = f"INSERT INTO calls ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class CallLedger:
+    """Append-only table of provider calls in a local SQLite database.
+
+    The database runs in WAL mode with `synchronous=NORMAL`, so an append is
+    a single page write and readers never block the writer. All access goes
+    through one connection guarded by a lock and runs in a worker thread.
+    """
+
+    def __init__(self, settings: dict | None = None):
+        cfg = {**DEFAULT_LEDGER_SETTINGS, **(settings or {})}
+        self.settings = cfg
+        self.path = Path(cfg["path"]).expanduser()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _append(self, row: dict) -> None:
+        ts = row.get("ts") or time.time()
+        values = {
+            **row,
+            "ts": ts,
+            "day": time.strftime("%Y-%m-%d", time.gmtime(ts)),
+            "retries": row.get("retries") or 0,
+        }
+        with self._lock:
+            self._connect().execute(_INSERT, [values.get(c) for c in _COLUMNS])
+
+    async def append(self, row: dict) -> bool:
+        """Record one call; returns False if the database couldn't be written.
+
+        `row` holds the `calls` columns; `ts` defaults to now and `day` is
+        derived from it (UTC).
+        """
+        try:
+            await asyncio.to_thread(self._append, row)
+        except (sqlite3.Error, OSError):
+            # The ledger is bookkeeping; a failed write must never fail a review
+            return False
+        return True
+
+    def _query(self, sql: str, params: list) -> list[dict]:
+        with self._lock:
+            cursor = self._connect().execute(sql, params)
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def report(self, name: str, since_days: float = 30, project: str | None = None,
+               model: str | None = None) -> list[dict]:
+        """Run one of REPORTS over calls from the last `since_days` days."""
+        since = time.time() - since_days * 86400
+        where = ["ts >= ?"]
+        params: list = [since]
+        if project:
+            where.append("project = ?")
+            params.append(project)
+        if model:
+            where.append("model = ?")
+            params.append(model)
+        filters = " AND ".join(where)
+
+        if name == "cost_by_day":
+            sql = f"""
+                SELECT day, project, COUNT(*) AS calls,
+                       ROUND(COALESCE(SUM(cost_usd), 0), 6) AS cost_usd,
+                       COALESCE(SUM(input_tokens), 0) AS input_tokens,
+                       COALESCE(SUM(output_tokens), 0) AS output_tokens
+                FROM calls WHERE day >= ? AND {filters}
+                GROUP BY day, project ORDER BY day DESC, project
+            """
+            # `day` (indexed with project) narrows the range; `ts` trims the first day
+            params = [time.strftime("%Y-%m-%d", time.gmtime(since)), *params]
+        elif name == "latency_by_model":
+            # Nearest-rank percentiles over successful calls: rank = ceil(p * n / 100)
+            sql = f"""
+                WITH ranked AS (
+                    SELECT model, latency_ms,
+                           ROW_NUMBER() OVER (PARTITION BY model ORDER BY latency_ms) AS rn,
+                           COUNT(*) OVER (PARTITION BY model) AS n
+                    FROM calls WHERE {filters} AND status = 'success' AND latency_ms IS NOT NULL
+                )
+                SELECT model, MAX(n) AS calls,
+                       MIN(CASE WHEN rn >= (n * 50 + 99) / 100 THEN latency_ms END) AS p50_ms,
+                       MIN(CASE WHEN rn >= (n * 95 + 99) / 100 THEN latency_ms END) AS p95_ms,
+                       MAX(latency_ms) AS max_ms
+                FROM ranked GROUP BY model ORDER BY model
+            """
+        elif name == "errors_by_endpoint":
+            sql = f"""
+                SELECT endpoint, COUNT(*) AS calls,
+                       SUM(status != 'success') AS errors,
+                       ROUND(1.0 * SUM(status != 'success') / COUNT(*), 4) AS error_rate,
+                       SUM(retries) AS retries
+                FROM calls WHERE {filters}
+                GROUP BY endpoint ORDER BY endpoint
+            """
+        else:
+            raise ValueError(f"Unknown report: {name} (expected one of {', '.join(REPORTS)})")
+        return self._query(sql, params)
+
+    def _spent_on(self, day: str) -> float:
+        rows = self._query("SELECT COALESCE(SUM(cost_usd), 0) AS spent FROM calls WHERE day = ?", [day])
+        return float(rows[0]["spent"])
+
+    async def spent_on(self, day: str) -> float:
+        """Total recorded cost for a UTC day (YYYY-MM-DD); 0 if unreadable."""
+        try:
+            return await asyncio.to_thread(self._spent_on, day)
+        except (sqlite3.Error, OSError):
+            return 0.0
+
+    async def query(self, name: str, **filters) -> list[dict]:
+        return await asyncio.to_thread(self.report, name, **filters)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
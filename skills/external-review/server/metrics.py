@@ -0,0 +1,149 @@
+"""In-process hot-path metrics: per-phase latency histograms and call counters.
+
+Observations are labelled with the review phase and, for provider-side
+phases, the model and endpoint origin. `Metrics.snapshot()` feeds the `stats`
+tool; `Metrics.to_prometheus()` renders the Prometheus text format.
+"""
+
+import time
+from collections import deque
+
+from latency import percentile
+
+# Histogram bucket upper bounds (ms), Prometheus-style
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+
+# Recent observations kept per series for percentiles
+DEFAULT_WINDOW = 512
+
+# (name, model, endpoint); server-level series use "" for model and endpoint
+SeriesKey = tuple[str, str, str]
+
+
+class Histogram:
+    """Cumulative bucket counts plus a window of recent values for percentiles."""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS_MS, window: int = DEFAULT_WINDOW):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent: deque = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+
+
+def summarize(histograms: list[Histogram]) -> dict:
+    """Count, mean and recent p50/p95/p99 over one or more histograms."""
+    count = sum(h.count for h in histograms)
+    recent = [v for h in histograms for v in h.recent]
+    return {
+        "count": count,
+        "mean_ms": round(sum(h.sum for h in histograms) / count, 1) if count else None,
+        "p50_ms": percentile(recent, 50),
+        "p95_ms": percentile(recent, 95),
+        "p99_ms": percentile(recent, 99),
+    }
+
+
+class Metrics:
+    """Histograms and counters keyed by (name, model, endpoint)."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.histograms: dict[SeriesKey, Histogram] = {}
+        self.counters: dict[SeriesKey, float] = {}
+
+    def observe(self, phase: str, ms: float, model: str = "", endpoint: str = "") -> None:
+        key = (phase, model, endpoint)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(ms)
+
+    def increment(self, name: str, amount: float = 1, model: str = "", endpoint: str = "") -> None:
+        key = (name, model, endpoint)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def clear(self) -> None:
+        self.started = time.time()
+        self.histograms.clear()
+        self.counters.clear()
+
+    def _phases(self, match) -> dict:
+        grouped: dict[str, list[Histogram]] = {}
+        for key, histogram in self.histograms.items():
+            if match(key):
+                grouped.setdefault(key[0], []).append(histogram)
+        return {phase: summarize(hs) for phase, hs in sorted(grouped.items())}
+
+    def _counter(self, name: str, model: str | None = None, endpoint: str | None = None) -> float:
+        return sum(
+            value for (n, m, e), value in self.counters.items()
+            if n == name and (model is None or m == model) and (endpoint is None or e == endpoint)
+        )
+
+    def snapshot(self) -> dict:
+        """Percentiles per phase overall, per model and per endpoint, with call,
+        retry and error counts."""
+        keys = list(self.histograms) + list(self.counters)
+        models = sorted({m for (_, m, _) in keys} - {""})
+        endpoints = sorted({e for (_, _, e) in keys} - {""})
+
+        def usage(model=None, endpoint=None) -> dict:
+            calls = self._counter("calls", model, endpoint)
+            errors = self._counter("errors", model, endpoint)
+            return {
+                "calls": int(calls),
+                "errors": int(errors),
+                "error_rate": round(errors / calls, 4) if calls else None,
+                "retries": int(self._counter("retries", model, endpoint)),
+            }
+
+        return {
+            "uptime_seconds": int(time.time() - self.started),
+            "phases": self._phases(lambda key: True),
+            "models": {
+                m: {**usage(model=m), "phases": self._phases(lambda key, m=m: key[1] == m)}
+                for m in models
+            },
+            "endpoints": {
+                e: {**usage(endpoint=e), "phases": self._phases(lambda key, e=e: key[2] == e)}
+                for e in endpoints
+            },
+        }
+
+    def to_prometheus(self, prefix: str = "external_review") -> str:
+        """Render all series in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_phase_ms Review phase duration in milliseconds.",
+            f"# TYPE {prefix}_phase_ms histogram",
+        ]
+        for (phase, model, endpoint), h in sorted(self.histograms.items()):
+            labels = _labels(phase=phase, model=model, endpoint=endpoint)
+            for bound, count in zip(h.buckets, h.bucket_counts):
+                lines.append(f'{prefix}_phase_ms_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{prefix}_phase_ms_bucket{{{labels},le="+Inf"}} {h.count}')
+            lines.append(f"{prefix}_phase_ms_sum{{{labels}}} {round(h.sum, 3)}")
+            lines.append(f"{prefix}_phase_ms_count{{{labels}}} {h.count}")
+        for name in sorted({key[0] for key in self.counters}):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            for (n, model, endpoint), value in sorted(self.counters.items()):
+                if n == name:
+                    labels = _labels(model=model, endpoint=endpoint)
+                    series = f"{prefix}_{name}_total{{{labels}}}" if labels else f"{prefix}_{name}_total"
+                    lines.append(f"{series} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{k}="{escape(v)}"' for k, v in labels.items() if v)
@@ -1,26 +1,61 @@
 """Abstract base class for LLM providers."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 
+import httpx
+
+from .circuit_breaker import BreakerRegistry, CircuitBreaker
+from .pool import ClientPool
+from .rate_limit import RateLimiter
+from .retry import RetryBudget, RetryPolicy
+from .sse import StreamError
+from .wire import TemplateCache, loads
+
+# Called with each text delta as a streamed response arrives
+ChunkCallback = Callable[[str], Awaitable[None]]
+
+# Rough chars-per-token ratio for English prose and markdown
+CHARS_PER_TOKEN = 4
+
+# Error (and retry reason) of an attempt that ran out its timeout
+REQUEST_TIMED_OUT = "Request timed out"
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate (no tokenizer dependency)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
 
 @dataclass
 class ReviewResponse:
-    status: str  # "success" | "error"
+    status: str  # "success" | "error" | "deadline_exceeded" | "budget_exceeded" | "cancelled"
     response: str | None = None
     error: str | None = None
     tokens_used: dict | None = None
     latency_ms: int = 0
     retries_attempted: int = 0
     cost_usd: float | None = None
+    ttft_ms: int | None = None  # time to first token, streaming only
+    truncated: bool = False  # streamed body hit the max_response_bytes cap
+    chunks: dict | None = None  # {"total", "failed"} when reviewed in parts
+    timings: dict | None = None  # phase -> ms (queue, backoff, connect, ttfb, body)
+    retry_reasons: list[str] | None = None  # why each retry happened, in order
+    issues: list[dict] | None = None  # parsed issue records (format="issues")
+    issues_error: str | None = None  # why the response couldn't be parsed into issues
 
     @staticmethod
     def calculate_cost(tokens_used: dict, pricing: dict) -> float | None:
         """Calculate cost from token counts and pricing rates.
 
         Args:
-            tokens_used: {"input": int, "output": int}
-            pricing: {"input_per_1m": float, "output_per_1m": float}
+            tokens_used: {"input": int, "output": int, "cached_input": int (optional)}
+                where "input" includes any cached input tokens
+            pricing: {"input_per_1m": float, "output_per_1m": float,
+                "cached_input_per_1m": float (optional, defaults to input rate)}
 
         Returns:
             Cost in USD, or None if pricing data is incomplete.
@@ -31,17 +66,337 @@ class ReviewResponse:
         output_rate = pricing.get("output_per_1m")
         if input_rate is None or output_rate is None:
             return None
-        input_cost = tokens_used.get("input", 0) / 1_000_000 * input_rate
+        cached_rate = pricing.get("cached_input_per_1m", input_rate)
+        cached = min(tokens_used.get("cached_input", 0), tokens_used.get("input", 0))
+        uncached = tokens_used.get("input", 0) - cached
+        input_cost = (uncached * input_rate + cached * cached_rate) / 1_000_000
         output_cost = tokens_used.get("output", 0) / 1_000_000 * output_rate
         return round(input_cost + output_cost, 6)
 
 
+class RequestTimings:
+    """Phase timings (ms) for one review call, across all of its attempts.
+
+    `trace` is an httpx trace-extension callback: it times TCP/TLS connects
+    and the wait from sending request headers to receiving response headers
+    (TTFB). The retry loop adds queue (rate limiter), backoff and body phases.
+    """
+
+    _CONNECT_EVENTS = ("connection.connect_tcp", "connection.start_tls")
+    _SEND_EVENTS = ("http11.send_request_headers.started", "http2.send_request_headers.started")
+    _HEADERS_EVENTS = ("http11.receive_response_headers.complete", "http2.receive_response_headers.complete")
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self.headers_at: float | None = None
+        self._started: dict[str, float] = {}
+        self._sent_at: float | None = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds * 1000
+
+    async def trace(self, event: str, info: dict) -> None:
+        now = time.monotonic()
+        name, _, stage = event.rpartition(".")
+        if name in self._CONNECT_EVENTS:
+            if stage == "started":
+                self._started[name] = now
+            elif stage == "complete" and name in self._started:
+                self.add("connect", now - self._started.pop(name))
+        elif event in self._SEND_EVENTS:
+            self._sent_at = now
+        elif event in self._HEADERS_EVENTS:
+            self.headers_at = now
+            if self._sent_at is not None:
+                # Last attempt's TTFB, not the sum over retries
+                self.phases["ttfb"] = (now - self._sent_at) * 1000
+
+    def body_done(self, fallback_start: float) -> None:
+        """Record time from response headers (or `fallback_start`) to now."""
+        self.add("body", time.monotonic() - (self.headers_at or fallback_start))
+
+    def as_dict(self) -> dict:
+        return {phase: round(ms, 1) for phase, ms in self.phases.items()}
+
+
 class BaseProvider(ABC):
     """Abstract base class for LLM providers."""
 
-    def __init__(self, endpoint: str, api_key: str, **kwargs):
+    def __init__(
+        self,
+        endpoint: str,
+        api_key: str,
+        client_pool: ClientPool | None = None,
+        breakers: BreakerRegistry | None = None,
+        retry_budget: RetryBudget | None = None,
+        **kwargs,
+    ):
         self.endpoint = endpoint.rstrip("/")
         self.api_key = api_key
+        self.client_pool = client_pool or ClientPool()
+        self.breakers = breakers or BreakerRegistry()
+        self.retry_budget = retry_budget or RetryBudget()
+        self.templates = TemplateCache()
+        # model -> (limits it was built from, limiter)
+        self._rate_limiters: dict[str, tuple[dict, RateLimiter]] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client for this provider's endpoint."""
+        return self.client_pool.get(self.endpoint)
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Breaker for this provider's endpoint (shared with other providers on it)."""
+        return self.breakers.get(self.endpoint)
+
+    @staticmethod
+    def _endpoint_up(status_code: int) -> bool:
+        """5xx counts against the endpoint; any other response shows it is up."""
+        return status_code < 500
+
+    @classmethod
+    def _record_outcome(cls, breaker: CircuitBreaker, status_code: int) -> None:
+        if cls._endpoint_up(status_code):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    @staticmethod
+    def _deadline_exceeded(
+        start: float, attempt: int, last_error: str | None, retry_reasons: list[str] | None = None,
+    ) -> ReviewResponse:
+        return ReviewResponse(
+            status="deadline_exceeded",
+            error="Deadline exceeded" + (f" (last error: {last_error})" if last_error else ""),
+            latency_ms=int((time.monotonic() - start) * 1000),
+            retries_attempted=attempt,
+            retry_reasons=retry_reasons or None,
+        )
+
+    def rate_limiter(self, model: str, limits: dict | None = None) -> RateLimiter:
+        """Limiter shared by every request this provider sends for `model`.
+
+        Rebuilt when `limits` differ from the ones it was built with (models.yaml
+        was reloaded); a pause the server asked for carries over.
+        """
+        limits = dict(limits or {})
+        entry = self._rate_limiters.get(model)
+        if entry is None or entry[0] != limits:
+            limiter = RateLimiter.from_config(limits)
+            if entry is not None:
+                limiter.blocked_until = entry[1].blocked_until
+            entry = self._rate_limiters[model] = (limits, limiter)
+        return entry[1]
+
+    @staticmethod
+    def pop_call_options(settings: dict) -> dict:
+        """Remove the per-call `_`-prefixed options the server adds to settings."""
+        return {
+            "retry_attempts": settings.pop("_retry_attempts", 2),
+            "timeout_seconds": settings.pop("_timeout_seconds", 120),
+            "max_response_bytes": settings.pop("_max_response_bytes", None),
+            "rate_limits": settings.pop("_rate_limits", None),
+            "deadline": settings.pop("_deadline", None),
+            "retry_policy": settings.pop("_retry_policy", None) or RetryPolicy(),
+        }
+
+    @abstractmethod
+    def _parse_completion(self, data: dict) -> tuple[str, dict]:
+        """(response text, tokens_used) from a non-streamed response body."""
+        ...
+
+    @abstractmethod
+    async def _read_stream(
+        self,
+        resp: httpx.Response,
+        on_chunk: ChunkCallback,
+        start: float,
+        attempt: int,
+        pricing: dict | None,
+        max_response_bytes: int | None,
+        timings: RequestTimings,
+    ) -> ReviewResponse:
+        """Consume a successful streamed response into a ReviewResponse.
+
+        Raises StreamError if the stream reports an error or ends early.
+        """
+        ...
+
+    def _server_retry_delay(self, resp: httpx.Response) -> float | None:
+        """Provider-specific wait before retrying a 429 that had no Retry-After."""
+        return None
+
+    async def _send_with_retries(
+        self,
+        url: str,
+        headers: dict,
+        body: bytes,
+        model: str,
+        options: dict,
+        estimated_tokens: int,
+        pricing: dict | None = None,
+        on_chunk: ChunkCallback | None = None,
+        on_rejected: Callable[[httpx.Response], bytes | None] | None = None,
+    ) -> ReviewResponse:
+        """POST the encoded JSON `body` (streamed when `on_chunk` is given), retrying
+        transient failures. The same bytes are reused for every attempt.
+
+        Retries 429/5xx responses, timeouts, connection errors and streams
+        that report an error or end early, with decorrelated-jitter backoff
+        (or the server's requested wait), while the circuit breaker, the
+        caller's deadline, the policy's total retry time and the process-wide
+        retry budget all allow it.
+        `on_rejected` may return a replacement body for a non-retryable
+        response, which is then retried once per attempt left.
+        """
+        retry_attempts = options["retry_attempts"]
+        timeout_seconds = options["timeout_seconds"]
+        deadline = options["deadline"]
+        policy: RetryPolicy = options["retry_policy"]
+        limiter = self.rate_limiter(model, options["rate_limits"])
+        breaker = self.circuit_breaker
+
+        start = time.monotonic()
+        timings = RequestTimings()
+        last_error = None
+        reasons: list[str] = []
+        server_wait = None
+        delay = None
+        attempt = 0
+        self.retry_budget.record_request()
+
+        for attempt in range(retry_attempts + 1):
+            if not breaker.allow():
+                # Endpoint is failing: fail fast instead of waiting out timeouts
+                return ReviewResponse(
+                    status="error",
+                    error=f"Circuit open for {self.endpoint}" + (f" (last error: {last_error})" if last_error else ""),
+                    latency_ms=int((time.monotonic() - start) * 1000),
+                    retries_attempted=attempt,
+                    retry_reasons=reasons or None,
+                )
+
+            if attempt > 0:
+                elapsed = time.monotonic() - start
+                if server_wait is not None:
+                    # The limiter holds every sender until the server's reset time
+                    delay = server_wait
+                else:
+                    delay = policy.next_delay(delay)
+                if elapsed + delay > policy.max_total_seconds:
+                    attempt -= 1
+                    break
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    return self._deadline_exceeded(start, attempt - 1, last_error, reasons)
+                if not self.retry_budget.try_retry():
+                    last_error = f"{last_error} (retry budget exhausted)"
+                    attempt -= 1
+                    break
+                reasons.append(last_error)
+                if server_wait is None:
+                    await asyncio.sleep(delay)
+                    timings.add("backoff", delay)
+
+            # Never let one attempt run past the caller's end-to-end deadline
+            attempt_timeout = timeout_seconds
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return self._deadline_exceeded(start, attempt, last_error, reasons)
+                attempt_timeout = min(timeout_seconds, remaining)
+
+            server_wait = None
+            try:
+                queued_at = time.monotonic()
+                async with limiter.slot(estimated_tokens):
+                    timings.add("queue", time.monotonic() - queued_at)
+                    if on_chunk is None:
+                        resp = await self.client.post(
+                            url, headers=headers, content=body, timeout=attempt_timeout,
+                            extensions={"trace": timings.trace},
+                        )
+                        server_wait = limiter.on_response(resp.status_code, resp.headers)
+                        self._record_outcome(breaker, resp.status_code)
+                        if resp.status_code == 200:
+                            received_at = time.monotonic()
+                            text, tokens = self._parse_completion(loads(resp.content))
+                            timings.body_done(received_at)
+                            return ReviewResponse(
+                                status="success",
+                                response=text,
+                                tokens_used=tokens,
+                                latency_ms=int((time.monotonic() - start) * 1000),
+                                retries_attempted=attempt,
+                                cost_usd=ReviewResponse.calculate_cost(tokens, pricing),
+                                timings=timings.as_dict(),
+                                retry_reasons=reasons or None,
+                            )
+                    else:
+                        async with self.client.stream(
+                            "POST", url, headers=headers, content=body, timeout=attempt_timeout,
+                            extensions={"trace": timings.trace},
+                        ) as resp:
+                            server_wait = limiter.on_response(resp.status_code, resp.headers)
+                            self._record_outcome(breaker, resp.status_code)
+                            if resp.status_code == 200:
+                                result = await self._read_stream(
+                                    resp, on_chunk, start, attempt, pricing,
+                                    options["max_response_bytes"], timings,
+                                )
+                                result.retry_reasons = reasons or None
+                                return result
+                            await resp.aread()
+
+                if resp.status_code in policy.retryable_status_codes:
+                    last_error = f"HTTP {resp.status_code}"
+                    if resp.status_code == 429 and server_wait is None:
+                        server_wait = self._server_retry_delay(resp)
+                        if server_wait is not None:
+                            limiter.pause(server_wait)
+                    continue
+
+                replacement = on_rejected(resp) if on_rejected is not None else None
+                if replacement is not None:
+                    body = replacement
+                    last_error = f"HTTP {resp.status_code}: request rejected, retrying with fallback body"
+                    continue
+
+                # Non-retryable error
+                return ReviewResponse(
+                    status="error",
+                    error=f"HTTP {resp.status_code}: {resp.text[:200]}",
+                    latency_ms=int((time.monotonic() - start) * 1000),
+                    retries_attempted=attempt,
+                    timings=timings.as_dict(),
+                    retry_reasons=reasons or None,
+                )
+
+            except httpx.TimeoutException:
+                if attempt_timeout < timeout_seconds:
+                    # Cut short by the deadline, not the endpoint's fault
+                    return self._deadline_exceeded(start, attempt, REQUEST_TIMED_OUT, reasons)
+                breaker.record_failure()
+                last_error = REQUEST_TIMED_OUT
+                continue
+            except httpx.HTTPError as e:
+                breaker.record_failure()
+                last_error = str(e) or type(e).__name__
+                continue
+            except StreamError as e:
+                # Partial text is never returned as a success, so it can't be cached
+                breaker.record_failure()
+                last_error = str(e)
+                continue
+
+        return ReviewResponse(
+            status="error",
+            error=last_error or "Unknown error",
+            latency_ms=int((time.monotonic() - start) * 1000),
+            retries_attempted=attempt,
+            timings=timings.as_dict(),
+            retry_reasons=reasons or None,
+        )
 
     @abstractmethod
     async def review(
@@ -52,11 +407,27 @@ class BaseProvider(ABC):
         settings: dict | None = None,
         extra_params: dict | None = None,
         pricing: dict | None = None,
+        on_chunk: ChunkCallback | None = None,
     ) -> ReviewResponse:
-        """Send review request to provider."""
+        """Send review request to provider.
+
+        When `on_chunk` is given the response is streamed and each text delta
+        is passed to it as it arrives.
+        """
         ...
 
+    async def count_tokens(self, artifact_content: str, prompt: str, model: str) -> tuple[int, str]:
+        """Input tokens for a request, and where the count came from.
+
+        The base implementation is the local estimate; providers with a
+        token-counting API override it.
+        """
+        return estimate_tokens(prompt) + estimate_tokens(artifact_content), "local"
+
     @abstractmethod
     async def health_check(self) -> bool:
-        """Verify API connectivity."""
+        """Whether the endpoint answers, judged like a real request: only
+        network errors and 5xx are down. A 401, or a gateway that doesn't
+        serve the probed route, still shows the server is up.
+        """
         ...
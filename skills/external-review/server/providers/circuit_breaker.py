@@ -0,0 +1,101 @@
+"""Per-endpoint circuit breakers (closed → open → half-open)."""
+
+import time
+
+from .pool import endpoint_key
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_BREAKER_SETTINGS = {
+    "failure_threshold": 5,
+    "reset_timeout_seconds": 30,
+}
+
+
+class CircuitBreaker:
+    """Tracks consecutive failures for one endpoint.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests fail fast. After `reset_timeout_seconds` it goes half-open and
+    lets a single probe through; the probe's outcome closes or re-opens it.
+    A healthy background check only makes an open circuit half-open early:
+    it reaches a different path than reviews, so the next real request decides.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_seconds: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probe_started: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout_seconds:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN:
+            # One probe at a time; a probe that never reported (e.g. cancelled) expires
+            now = time.monotonic()
+            if self.probe_started is None or now - self.probe_started >= self.reset_timeout_seconds:
+                self.probe_started = now
+                return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+
+    def record_health_check_success(self) -> None:
+        """Go half-open now if open; leaves a closed or half-open circuit as it is."""
+        if self.state == OPEN:
+            self.opened_at = time.monotonic() - self.reset_timeout_seconds
+            self.probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.probe_started = None
+
+    def retry_in_seconds(self) -> float:
+        """Seconds until an open circuit goes half-open (0 otherwise)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(self.reset_timeout_seconds - (time.monotonic() - self.opened_at), 0.0)
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in_seconds": round(self.retry_in_seconds(), 1),
+        }
+
+
+class BreakerRegistry:
+    """One CircuitBreaker per endpoint origin, shared by every provider."""
+
+    def __init__(self, settings: dict | None = None):
+        cfg = {**DEFAULT_BREAKER_SETTINGS, **(settings or {})}
+        self.failure_threshold = int(cfg["failure_threshold"])
+        self.reset_timeout_seconds = float(cfg["reset_timeout_seconds"])
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        key = endpoint_key(endpoint)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout_seconds)
+            self._breakers[key] = breaker
+        return breaker
@@ -1,20 +1,76 @@
 """Google Generative AI provider (Gemini)."""
 
 import asyncio
-import random
+import hashlib
 import time
 
 import httpx
 
-from .base import BaseProvider, ReviewResponse
+from .base import BaseProvider, ChunkCallback, RequestTimings, ReviewResponse, estimate_tokens
+from .rate_limit import parse_duration
+from .sse import ResponseTooLarge, StreamError, iter_sse_json
+from .wire import Slot
 
-RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
-MAX_RETRY_TOTAL_SECONDS = 60
+PROMPT = Slot("prompt")
+ARTIFACT = Slot("artifact")
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Recreate cachedContents a little before the server-side TTL runs out
+CACHE_REFRESH_FRACTION = 0.9
 
 
 class GoogleProvider(BaseProvider):
     """Provider for Google Generative AI (Gemini) API."""
 
+    def __init__(self, endpoint: str, api_key: str, **kwargs):
+        super().__init__(endpoint, api_key, **kwargs)
+        # (model, prompt hash) -> (cachedContents name or None if creation failed, expiry)
+        self._cached_contents: dict[tuple[str, str], tuple[str | None, float]] = {}
+        self._cache_lock = asyncio.Lock()
+
+    async def _get_cached_content(self, model: str, prompt: str, ttl_seconds: int) -> str | None:
+        """Return a cachedContents resource holding `prompt` as system instruction.
+
+        Creation failures (e.g. prompt below the model's minimum cacheable size)
+        are remembered for the TTL so they aren't retried on every call.
+        """
+        key = (model, hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+        hit = self._cached_contents.get(key)
+        if hit is not None and hit[1] > time.monotonic():
+            return hit[0]
+
+        # Serialize creation so parallel chunk reviews share one resource
+        async with self._cache_lock:
+            hit = self._cached_contents.get(key)
+            if hit is not None and hit[1] > time.monotonic():
+                return hit[0]
+            name = await self._create_cached_content(model, prompt, ttl_seconds)
+            self._cached_contents[key] = (name, time.monotonic() + ttl_seconds * CACHE_REFRESH_FRACTION)
+            return name
+
+    async def _create_cached_content(self, model: str, prompt: str, ttl_seconds: int) -> str | None:
+        name = None
+        try:
+            resp = await self.client.post(
+                f"{self.endpoint}/cachedContents?key={self.api_key}",
+                headers={"Content-Type": "application/json"},
+                json={
+                    "model": f"models/{model}",
+                    "systemInstruction": {"parts": [{"text": prompt}]},
+                    "ttl": f"{ttl_seconds}s",
+                },
+                timeout=30,
+            )
+            if resp.status_code == 200:
+                name = resp.json().get("name")
+        except (httpx.HTTPError, ValueError):
+            pass
+        return name
+
+    def _forget_cached_content(self, model: str, prompt: str) -> None:
+        key = (model, hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+        self._cached_contents.pop(key, None)
+
     async def review(
         self,
         artifact_content: str,
@@ -23,100 +79,191 @@ class GoogleProvider(BaseProvider):
         settings: dict | None = None,
         extra_params: dict | None = None,
         pricing: dict | None = None,
+        on_chunk: ChunkCallback | None = None,
     ) -> ReviewResponse:
         settings = settings or {}
         extra_params = extra_params or {}
-        retry_attempts = settings.pop("_retry_attempts", 2)
-        timeout_seconds = settings.pop("_timeout_seconds", 120)
+        options = self.pop_call_options(settings)
+        prompt_cache_ttl = settings.pop("_prompt_cache_ttl", None)
+        response_schema = settings.pop("_response_schema", None)
+        structured_output = settings.pop("_structured_output", "json_schema")
 
         generation_config = {}
         if "temperature" in settings:
             generation_config["temperature"] = settings["temperature"]
         if "max_tokens" in settings:
             generation_config["maxOutputTokens"] = settings["max_tokens"]
+        if response_schema is not None and structured_output != "prompt":
+            generation_config["responseMimeType"] = "application/json"
+            if structured_output == "json_schema":
+                generation_config["responseSchema"] = self._openapi_schema(response_schema)
         generation_config.update(extra_params)
 
         body = {
-            "system_instruction": {"parts": [{"text": prompt}]},
-            "contents": [{"parts": [{"text": artifact_content}]}],
+            "system_instruction": {"parts": [{"text": PROMPT}]},
+            "contents": [{"parts": [{"text": ARTIFACT}]}],
         }
         if generation_config:
             body["generationConfig"] = generation_config
 
-        url = f"{self.endpoint}/models/{model}:generateContent?key={self.api_key}"
-
-        start = time.monotonic()
-        last_error = None
-        retry_start = time.monotonic()
-
-        for attempt in range(retry_attempts + 1):
-            if attempt > 0:
-                if time.monotonic() - retry_start > MAX_RETRY_TOTAL_SECONDS:
-                    break
-                delay = min(2 ** attempt + random.uniform(0, 1), 30)
-                await asyncio.sleep(delay)
-
-            try:
-                async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-                    resp = await client.post(
-                        url,
-                        headers={"Content-Type": "application/json"},
-                        json=body,
-                    )
-
-                if resp.status_code == 200:
-                    data = resp.json()
-                    candidates = data.get("candidates", [])
-                    text = ""
-                    if candidates:
-                        parts = candidates[0].get("content", {}).get("parts", [])
-                        text = "".join(p.get("text", "") for p in parts)
-
-                    usage = data.get("usageMetadata", {})
-                    tokens = {
-                        "input": usage.get("promptTokenCount", 0),
-                        "output": usage.get("candidatesTokenCount", 0),
-                    }
-                    return ReviewResponse(
-                        status="success",
-                        response=text,
-                        tokens_used=tokens,
-                        latency_ms=int((time.monotonic() - start) * 1000),
-                        retries_attempted=attempt,
-                        cost_usd=ReviewResponse.calculate_cost(tokens, pricing),
-                    )
-
-                if resp.status_code in RETRYABLE_STATUS_CODES:
-                    last_error = f"HTTP {resp.status_code}"
-                    continue
-
-                return ReviewResponse(
-                    status="error",
-                    error=f"HTTP {resp.status_code}: {resp.text[:200]}",
-                    latency_ms=int((time.monotonic() - start) * 1000),
-                    retries_attempted=attempt,
-                )
-
-            except httpx.TimeoutException:
-                last_error = "Request timed out"
-                continue
-            except httpx.HTTPError as e:
-                last_error = str(e)
-                continue
+        def render(template_body: dict) -> bytes:
+            # Encoded once for every attempt; the artifact's escaped bytes are shared across models
+            return self.templates.get(template_body).render(prompt=prompt, artifact=artifact_content)
+
+        # Serve the (cycle-invariant) prompt from a cachedContents resource when possible
+        uncached_body = body
+        cached_name = None
+        if prompt_cache_ttl:
+            cached_name = await self._get_cached_content(model, prompt, prompt_cache_ttl)
+            if cached_name:
+                body = {k: v for k, v in body.items() if k != "system_instruction"}
+                body["cachedContent"] = cached_name
+
+        def on_rejected(resp: httpx.Response) -> bytes | None:
+            nonlocal cached_name
+            if cached_name and resp.status_code in (400, 403, 404):
+                # Cache expired or was deleted server-side: retry with the full prompt
+                self._forget_cached_content(model, prompt)
+                cached_name = None
+                return render(uncached_body)
+            return None
+
+        if on_chunk is None:
+            url = f"{self.endpoint}/models/{model}:generateContent?key={self.api_key}"
+        else:
+            url = f"{self.endpoint}/models/{model}:streamGenerateContent?alt=sse&key={self.api_key}"
+        estimated_tokens = (
+            estimate_tokens(prompt) + estimate_tokens(artifact_content) + settings.get("max_tokens", 0)
+        )
+        return await self._send_with_retries(
+            url, JSON_HEADERS, render(body), model, options,
+            estimated_tokens, pricing=pricing, on_chunk=on_chunk, on_rejected=on_rejected,
+        )
+
+    def _parse_completion(self, data: dict) -> tuple[str, dict]:
+        return self._candidate_text(data), self._parse_usage(data.get("usageMetadata"))
 
+    def _server_retry_delay(self, resp: httpx.Response) -> float | None:
+        return self._retry_delay(resp)
+
+    async def _read_stream(
+        self,
+        resp: httpx.Response,
+        on_chunk: ChunkCallback,
+        start: float,
+        attempt: int,
+        pricing: dict | None,
+        max_response_bytes: int | None,
+        timings: RequestTimings,
+    ) -> ReviewResponse:
+        """Consume a streamGenerateContent SSE stream into a ReviewResponse.
+
+        Raises StreamError on an error event or a stream that ends without a
+        finishReason (Gemini sends no [DONE]).
+        """
+        read_start = time.monotonic()
+        parts = []
+        usage = None
+        ttft_ms = None
+        truncated = False
+        finished = False
+        try:
+            async for event in iter_sse_json(resp, max_response_bytes):
+                delta = self._candidate_text(event)
+                if delta:
+                    if ttft_ms is None:
+                        ttft_ms = int((time.monotonic() - start) * 1000)
+                    parts.append(delta)
+                    await on_chunk(delta)
+                # Each chunk carries cumulative usage; the last one is complete
+                usage = event.get("usageMetadata") or usage
+                candidates = event.get("candidates") or []
+                finished = finished or bool(candidates and candidates[0].get("finishReason"))
+        except ResponseTooLarge:
+            truncated = True
+        if not finished and not truncated:
+            raise StreamError("Stream ended without a finishReason")
+
+        tokens = self._parse_usage(usage)
+        timings.body_done(read_start)
         return ReviewResponse(
-            status="error",
-            error=last_error or "Unknown error",
+            status="success",
+            response="".join(parts),
+            tokens_used=tokens,
             latency_ms=int((time.monotonic() - start) * 1000),
-            retries_attempted=retry_attempts,
+            retries_attempted=attempt,
+            cost_usd=ReviewResponse.calculate_cost(tokens, pricing),
+            ttft_ms=ttft_ms,
+            truncated=truncated,
+            timings=timings.as_dict(),
         )
 
+    @staticmethod
+    def _retry_delay(resp: httpx.Response) -> float | None:
+        """Gemini puts the wait for a 429 in a google.rpc.RetryInfo error detail."""
+        try:
+            details = resp.json().get("error", {}).get("details", [])
+        except ValueError:
+            return None
+        for detail in details:
+            if isinstance(detail, dict) and detail.get("retryDelay"):
+                return parse_duration(str(detail["retryDelay"]))
+        return None
+
+    @classmethod
+    def _openapi_schema(cls, schema):
+        """Gemini's responseSchema is an OpenAPI subset without additionalProperties."""
+        if isinstance(schema, dict):
+            return {k: cls._openapi_schema(v) for k, v in schema.items() if k != "additionalProperties"}
+        if isinstance(schema, list):
+            return [cls._openapi_schema(v) for v in schema]
+        return schema
+
+    @staticmethod
+    def _candidate_text(data: dict) -> str:
+        candidates = data.get("candidates", [])
+        if not candidates:
+            return ""
+        parts = candidates[0].get("content", {}).get("parts", [])
+        return "".join(p.get("text", "") for p in parts)
+
+    @staticmethod
+    def _parse_usage(usage: dict | None) -> dict:
+        usage = usage or {}
+        tokens = {
+            "input": usage.get("promptTokenCount", 0),
+            "output": usage.get("candidatesTokenCount", 0),
+        }
+        # promptTokenCount includes tokens served from cachedContents (explicit or implicit)
+        if usage.get("cachedContentTokenCount"):
+            tokens["cached_input"] = usage["cachedContentTokenCount"]
+        return tokens
+
+    async def count_tokens(self, artifact_content: str, prompt: str, model: str) -> tuple[int, str]:
+        """Exact input tokens from the countTokens API; the local estimate if it fails."""
+        try:
+            resp = await self.client.post(
+                f"{self.endpoint}/models/{model}:countTokens?key={self.api_key}",
+                headers={"Content-Type": "application/json"},
+                json={"generateContentRequest": {
+                    "model": f"models/{model}",
+                    "system_instruction": {"parts": [{"text": prompt}]},
+                    "contents": [{"parts": [{"text": artifact_content}]}],
+                }},
+                timeout=10,
+            )
+            if resp.status_code == 200:
+                return int(resp.json()["totalTokens"]), "provider"
+        except (httpx.HTTPError, ValueError, KeyError, TypeError):
+            pass
+        return await super().count_tokens(artifact_content, prompt, model)
+
     async def health_check(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(
-                    f"{self.endpoint}/models?key={self.api_key}",
-                )
-                return resp.status_code == 200
+            resp = await self.client.get(
+                f"{self.endpoint}/models?key={self.api_key}",
+                timeout=10,
+            )
+            return self._endpoint_up(resp.status_code)
         except httpx.HTTPError:
             return False
@@ -1,20 +1,28 @@
 """OpenAI-compatible provider (Kimi K2, DeepSeek, Together, etc.)."""
 
-import asyncio
-import random
 import time
 
 import httpx
 
-from .base import BaseProvider, ReviewResponse
+from .base import BaseProvider, ChunkCallback, RequestTimings, ReviewResponse, estimate_tokens
+from .sse import ResponseTooLarge, iter_sse_json
+from .wire import Slot
 
-RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
-MAX_RETRY_TOTAL_SECONDS = 60
+PROMPT = Slot("prompt")
+ARTIFACT = Slot("artifact")
 
 
 class OpenAICompatProvider(BaseProvider):
     """Provider for OpenAI-compatible chat completion APIs."""
 
+    def __init__(self, endpoint: str, api_key: str, **kwargs):
+        super().__init__(endpoint, api_key, **kwargs)
+        self._url = f"{self.endpoint}/chat/completions"
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
     async def review(
         self,
         artifact_content: str,
@@ -23,93 +31,123 @@ class OpenAICompatProvider(BaseProvider):
         settings: dict | None = None,
         extra_params: dict | None = None,
         pricing: dict | None = None,
+        on_chunk: ChunkCallback | None = None,
     ) -> ReviewResponse:
         settings = settings or {}
         extra_params = extra_params or {}
-        retry_attempts = settings.pop("_retry_attempts", 2)
-        timeout_seconds = settings.pop("_timeout_seconds", 120)
+        options = self.pop_call_options(settings)
+        response_schema = settings.pop("_response_schema", None)
+        structured_output = settings.pop("_structured_output", "json_schema")
 
+        # Stable content first: the system prompt (identical across cycles) and then
+        # the artifact, so providers with automatic prefix caching can reuse it
         body = {
             "model": model,
             "messages": [
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": artifact_content},
+                {"role": "system", "content": PROMPT},
+                {"role": "user", "content": ARTIFACT},
             ],
-            **{k: v for k, v in settings.items() if k in ("temperature", "max_tokens", "top_p")},
+            **{k: v for k, v in settings.items() if k in ("temperature", "max_tokens", "top_p", "prompt_cache_key")},
             **extra_params,
         }
+        if response_schema is not None and "response_format" not in body:
+            if structured_output == "json_schema":
+                body["response_format"] = {
+                    "type": "json_schema",
+                    "json_schema": {"name": "review_output", "strict": True, "schema": response_schema},
+                }
+            elif structured_output == "json_object":
+                body["response_format"] = {"type": "json_object"}
+        if on_chunk is not None:
+            body["stream"] = True
+            body.setdefault("stream_options", {"include_usage": True})
+
+        # Encoded once for every attempt; the artifact's escaped bytes are shared across models
+        content = self.templates.get(body).render(prompt=prompt, artifact=artifact_content)
+        estimated_tokens = (
+            estimate_tokens(prompt) + estimate_tokens(artifact_content) + settings.get("max_tokens", 0)
+        )
+        return await self._send_with_retries(
+            self._url, self._headers, content, model, options,
+            estimated_tokens, pricing=pricing, on_chunk=on_chunk,
+        )
 
-        start = time.monotonic()
-        last_error = None
-        retry_start = time.monotonic()
-
-        for attempt in range(retry_attempts + 1):
-            if attempt > 0:
-                if time.monotonic() - retry_start > MAX_RETRY_TOTAL_SECONDS:
-                    break
-                delay = min(2 ** attempt + random.uniform(0, 1), 30)
-                await asyncio.sleep(delay)
-
-            try:
-                async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-                    resp = await client.post(
-                        f"{self.endpoint}/chat/completions",
-                        headers={
-                            "Authorization": f"Bearer {self.api_key}",
-                            "Content-Type": "application/json",
-                        },
-                        json=body,
-                    )
-
-                if resp.status_code == 200:
-                    data = resp.json()
-                    usage = data.get("usage", {})
-                    tokens = {
-                        "input": usage.get("prompt_tokens", 0),
-                        "output": usage.get("completion_tokens", 0),
-                    }
-                    return ReviewResponse(
-                        status="success",
-                        response=data["choices"][0]["message"]["content"],
-                        tokens_used=tokens,
-                        latency_ms=int((time.monotonic() - start) * 1000),
-                        retries_attempted=attempt,
-                        cost_usd=ReviewResponse.calculate_cost(tokens, pricing),
-                    )
-
-                if resp.status_code in RETRYABLE_STATUS_CODES:
-                    last_error = f"HTTP {resp.status_code}"
-                    continue
-
-                # Non-retryable error
-                return ReviewResponse(
-                    status="error",
-                    error=f"HTTP {resp.status_code}: {resp.text[:200]}",
-                    latency_ms=int((time.monotonic() - start) * 1000),
-                    retries_attempted=attempt,
-                )
-
-            except httpx.TimeoutException:
-                last_error = "Request timed out"
-                continue
-            except httpx.HTTPError as e:
-                last_error = str(e)
-                continue
+    def _parse_completion(self, data: dict) -> tuple[str, dict]:
+        return data["choices"][0]["message"]["content"], self._parse_usage(data.get("usage"))
 
+    async def _read_stream(
+        self,
+        resp: httpx.Response,
+        on_chunk: ChunkCallback,
+        start: float,
+        attempt: int,
+        pricing: dict | None,
+        max_response_bytes: int | None,
+        timings: RequestTimings,
+    ) -> ReviewResponse:
+        """Consume an SSE chat completion stream into a ReviewResponse.
+
+        Raises StreamError on an error event or a stream cut off before [DONE].
+        """
+        read_start = time.monotonic()
+        parts = []
+        usage = None
+        ttft_ms = None
+        truncated = False
+        try:
+            async for event in iter_sse_json(resp, max_response_bytes, until_done=True):
+                choices = event.get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    if ttft_ms is None:
+                        ttft_ms = int((time.monotonic() - start) * 1000)
+                    parts.append(delta)
+                    await on_chunk(delta)
+                # Most servers send usage on a final chunk; some nest it in the choice
+                usage = event.get("usage") or (choices[0].get("usage") if choices else None) or usage
+        except ResponseTooLarge:
+            truncated = True
+
+        tokens = self._parse_usage(usage)
+        timings.body_done(read_start)
         return ReviewResponse(
-            status="error",
-            error=last_error or "Unknown error",
+            status="success",
+            response="".join(parts),
+            tokens_used=tokens,
             latency_ms=int((time.monotonic() - start) * 1000),
-            retries_attempted=retry_attempts,
+            retries_attempted=attempt,
+            cost_usd=ReviewResponse.calculate_cost(tokens, pricing),
+            ttft_ms=ttft_ms,
+            truncated=truncated,
+            timings=timings.as_dict(),
+        )
+
+    @staticmethod
+    def _parse_usage(usage: dict | None) -> dict:
+        usage = usage or {}
+        tokens = {
+            "input": usage.get("prompt_tokens", 0),
+            "output": usage.get("completion_tokens", 0),
+        }
+        # OpenAI reports prefix-cache hits under prompt_tokens_details; DeepSeek
+        # and Moonshot use top-level fields
+        cached = (
+            (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+            or usage.get("prompt_cache_hit_tokens")
+            or usage.get("cached_tokens")
+            or 0
         )
+        if cached:
+            tokens["cached_input"] = cached
+        return tokens
 
     async def health_check(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(
-                    f"{self.endpoint}/models",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                )
-                return resp.status_code == 200
+            resp = await self.client.get(
+                f"{self.endpoint}/models",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=10,
+            )
+            return self._endpoint_up(resp.status_code)
         except httpx.HTTPError:
             return False
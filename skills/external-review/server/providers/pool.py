@@ -0,0 +1,73 @@
+"""Shared HTTP client pool — one long-lived httpx.AsyncClient per endpoint origin."""
+
+import importlib.util
+from urllib.parse import urlsplit
+
+import httpx
+
+DEFAULT_POOL_SETTINGS = {
+    "http2": True,
+    "max_connections": 20,
+    "max_keepalive_connections": 10,
+    "keepalive_expiry_seconds": 60,
+}
+
+# HTTP/2 needs the optional `h2` package (httpx[http2]); fall back to HTTP/1.1 without it.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def endpoint_key(endpoint: str) -> str:
+    """Normalize an endpoint URL to its origin (scheme://host[:port])."""
+    parts = urlsplit(endpoint)
+    if not parts.scheme or not parts.netloc:
+        return endpoint.rstrip("/")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class ClientPool:
+    """Owns pooled AsyncClients keyed by endpoint origin.
+
+    Models that share a host (e.g. two models on the same OpenAI-compatible API)
+    share one client, so connections and HTTP/2 streams are reused across calls.
+    """
+
+    def __init__(self, settings: dict | None = None):
+        cfg = {**DEFAULT_POOL_SETTINGS, **(settings or {})}
+        self.http2 = bool(cfg["http2"]) and HTTP2_AVAILABLE
+        self.limits = httpx.Limits(
+            max_connections=cfg["max_connections"],
+            max_keepalive_connections=cfg["max_keepalive_connections"],
+            keepalive_expiry=cfg["keepalive_expiry_seconds"],
+        )
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, endpoint: str) -> httpx.AsyncClient:
+        """Return the client for an endpoint, creating it on first use."""
+        key = endpoint_key(endpoint)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(http2=self.http2, limits=self.limits)
+            self._clients[key] = client
+        return client
+
+    def endpoints(self) -> list[str]:
+        """Origins with an open client."""
+        return [key for key, client in self._clients.items() if not client.is_closed]
+
+    async def retain(self, endpoints) -> list[str]:
+        """Close clients whose origin isn't used by any of `endpoints`; others stay warm.
+
+        Returns the closed origins.
+        """
+        keep = {endpoint_key(e) for e in endpoints}
+        closed = [key for key in self._clients if key not in keep]
+        for key in closed:
+            await self._clients.pop(key).aclose()
+        return closed
+
+    async def aclose(self) -> None:
+        """Close every pooled client."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
@@ -0,0 +1,165 @@
+"""Client-side rate limiting: token buckets, AIMD concurrency and server hints."""
+
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+
+# Adaptive concurrency bounds when a model doesn't set max_concurrency
+DEFAULT_MAX_CONCURRENCY = 8
+MIN_CONCURRENCY = 1
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(value: str) -> float | None:
+    """Parse OpenAI-style reset durations ("20ms", "1s", "6m0s") or plain seconds."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(n) * _DURATION_UNITS[unit] for n, unit in parts)
+
+
+def retry_after_seconds(headers) -> float | None:
+    """Server-requested wait from Retry-After / retry-after-ms / x-ratelimit-reset-*."""
+    if headers is None:
+        return None
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+    # OpenAI-compatible servers: wait for whichever exhausted budget resets
+    waits = []
+    for kind in ("requests", "tokens"):
+        if headers.get(f"x-ratelimit-remaining-{kind}") == "0":
+            reset = headers.get(f"x-ratelimit-reset-{kind}")
+            seconds = parse_duration(reset) if reset else None
+            if seconds is not None:
+                waits.append(seconds)
+    return max(waits) if waits else None
+
+
+class TokenBucket:
+    """Continuous-refill token bucket sized to a per-minute rate."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it is now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Per-model limiter consulted before every request.
+
+    Enforces optional requests-per-minute and tokens-per-minute budgets,
+    adapts the number of in-flight requests with AIMD (halve on 429, grow by
+    ~1 per window of successes), and pauses all senders when the server says
+    to wait via Retry-After or x-ratelimit-* headers.
+    """
+
+    def __init__(self, rpm: float | None = None, tpm: float | None = None,
+                 max_concurrency: int | None = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        self.concurrency_limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._cond = asyncio.Condition()
+
+    @classmethod
+    def from_config(cls, limits: dict | None) -> "RateLimiter":
+        limits = limits or {}
+        return cls(
+            rpm=limits.get("rpm"),
+            tpm=limits.get("tpm"),
+            max_concurrency=limits.get("max_concurrency"),
+        )
+
+    def _wait_time(self, estimated_tokens: int) -> float:
+        waits = [self.blocked_until - time.monotonic()]
+        if self.requests:
+            waits.append(self.requests.wait_time(1))
+        if self.tokens and estimated_tokens:
+            waits.append(self.tokens.wait_time(estimated_tokens))
+        return max(waits)
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0):
+        """Hold a send slot for one request."""
+        async with self._cond:
+            while True:
+                if self.in_flight >= int(self.concurrency_limit):
+                    await self._cond.wait()
+                    continue
+                wait = self._wait_time(estimated_tokens)
+                if wait <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._cond.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens and estimated_tokens:
+                self.tokens.take(estimated_tokens)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def on_response(self, status_code: int, headers=None) -> float | None:
+        """Feed a response back into the limiter; returns the server-requested
+        wait in seconds, if any."""
+        wait = retry_after_seconds(headers)
+        if status_code == 429:
+            self.concurrency_limit = max(MIN_CONCURRENCY, self.concurrency_limit / 2)
+        elif 200 <= status_code < 300:
+            self.concurrency_limit = min(
+                self.max_concurrency, self.concurrency_limit + 1 / self.concurrency_limit,
+            )
+        if wait:
+            self.pause(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold all senders for `seconds`."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
@@ -0,0 +1,98 @@
+"""Retry backoff (decorrelated jitter) and a process-wide retry budget."""
+
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+DEFAULT_RETRY_SETTINGS = {
+    "base_delay_seconds": 1.0,
+    "max_delay_seconds": 30.0,
+    "max_total_seconds": 60.0,   # stop retrying once this much time has passed
+    "budget_ratio": 0.2,         # retries allowed per request in the window
+    "budget_window_seconds": 10.0,
+    "budget_min_retries": 10,    # retries always allowed per window, for low traffic
+}
+
+
+@dataclass
+class RetryPolicy:
+    """When and how long to back off between attempts of one request."""
+
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    max_total_seconds: float = 60.0
+    retryable_status_codes: frozenset = RETRYABLE_STATUS_CODES
+
+    @classmethod
+    def from_config(cls, settings: dict | None) -> "RetryPolicy":
+        cfg = {**DEFAULT_RETRY_SETTINGS, **(settings or {})}
+        return cls(
+            base_delay=float(cfg["base_delay_seconds"]),
+            max_delay=float(cfg["max_delay_seconds"]),
+            max_total_seconds=float(cfg["max_total_seconds"]),
+        )
+
+    def next_delay(self, previous: float | None) -> float:
+        """Decorrelated jitter: uniform(base, 3 × previous delay), capped.
+
+        Spreads retries from many concurrent callers instead of synchronizing
+        them on the same exponential schedule.
+        """
+        upper = max((previous or self.base_delay) * 3, self.base_delay)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+
+class RetryBudget:
+    """Caps retries at a fraction of requests over a sliding window.
+
+    Shared by every provider in the process, so when an endpoint degrades
+    during a fan-out the retries it triggers stay a bounded fraction of
+    traffic instead of multiplying it. `min_retries` per window keeps
+    retries available when traffic is light.
+    """
+
+    def __init__(self, ratio: float = 0.2, window_seconds: float = 10.0, min_retries: int = 10):
+        self.ratio = ratio
+        self.window_seconds = window_seconds
+        self.min_retries = min_retries
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+        self.denied = 0
+
+    @classmethod
+    def from_config(cls, settings: dict | None) -> "RetryBudget":
+        cfg = {**DEFAULT_RETRY_SETTINGS, **(settings or {})}
+        return cls(
+            ratio=float(cfg["budget_ratio"]),
+            window_seconds=float(cfg["budget_window_seconds"]),
+            min_retries=int(cfg["budget_min_retries"]),
+        )
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        for times in (self._requests, self._retries):
+            while times and times[0] < cutoff:
+                times.popleft()
+
+    def record_request(self) -> None:
+        # Pruned here too, or a process that never retries grows the deque forever
+        now = time.monotonic()
+        self._prune(now)
+        self._requests.append(now)
+
+    def try_retry(self) -> bool:
+        """Spend one retry if the budget allows it."""
+        now = time.monotonic()
+        self._prune(now)
+        if len(self._retries) >= max(self.min_retries, self.ratio * len(self._requests)):
+            self.denied += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    def snapshot(self) -> dict:
+        self._prune(time.monotonic())
+        return {"requests": len(self._requests), "retries": len(self._retries), "denied": self.denied}
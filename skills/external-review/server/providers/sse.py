@@ -0,0 +1,75 @@
+"""Server-sent events parsing for streaming provider responses."""
+
+from collections.abc import AsyncIterator
+
+import httpx
+
+from .wire import JSONDecodeError, loads
+
+
+class ResponseTooLarge(Exception):
+    """Raised when a streamed response exceeds the configured byte cap."""
+
+
+class StreamError(Exception):
+    """Raised when a stream reports an error or ends before the response is complete."""
+
+
+async def iter_sse_json(
+    resp: httpx.Response, max_bytes: int | None = None, until_done: bool = False,
+) -> AsyncIterator[dict]:
+    """Yield decoded JSON payloads from an SSE response's `data:` lines.
+
+    Stops at the OpenAI-style `[DONE]` sentinel; with `until_done`, a body
+    that ends without it raises StreamError. An in-band `{"error": ...}`
+    event raises StreamError too. Raises ResponseTooLarge once more than
+    `max_bytes` of body have been read; events already yielded stand.
+    """
+    read = 0
+    buffer = b""
+    async for chunk in resp.aiter_bytes():
+        read += len(chunk)
+        if max_bytes is not None and read > max_bytes:
+            raise ResponseTooLarge(f"Response exceeded {max_bytes} bytes")
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            payload = _data_payload(line)
+            if payload is None:
+                continue
+            if payload == "[DONE]":
+                return
+            try:
+                event = loads(payload)
+            except JSONDecodeError:
+                continue
+            yield _checked(event)
+
+    payload = _data_payload(buffer)
+    if payload == "[DONE]":
+        return
+    if payload:
+        try:
+            event = loads(payload)
+        except JSONDecodeError:
+            pass
+        else:
+            yield _checked(event)
+    if until_done:
+        raise StreamError("Stream ended before [DONE]")
+
+
+def _checked(event):
+    """The event, unless it is an error the server sent mid-stream."""
+    if isinstance(event, dict) and event.get("error"):
+        error = event["error"]
+        message = (error.get("message") or error.get("status")) if isinstance(error, dict) else error
+        raise StreamError(f"Stream error: {message or error}")
+    return event
+
+
+def _data_payload(line: bytes) -> str | None:
+    line = line.strip()
+    if not line.startswith(b"data:"):
+        return None
+    return line[5:].strip().decode("utf-8", errors="replace")
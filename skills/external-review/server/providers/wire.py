@@ -0,0 +1,134 @@
+"""JSON on the wire: fast encode/decode and request body templates.
+
+A review sends the same prompt and artifact to several models, and again on
+every retry. Templates are encoded once per request shape, with slots where
+the large strings go. Each large string is JSON-escaped once and the cached
+bytes are spliced into every body that uses it.
+"""
+
+import importlib.util
+import json
+import threading
+from collections import OrderedDict
+
+# orjson is optional: several times faster than the stdlib for large strings
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+
+    BACKEND = "orjson"
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(data: bytes | str):
+        return orjson.loads(data)
+
+    JSONDecodeError = orjson.JSONDecodeError
+else:
+    BACKEND = "json"
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def loads(data: bytes | str):
+        return json.loads(data)
+
+    JSONDecodeError = json.JSONDecodeError
+
+# Strings at least this long have their encoding cached
+ENCODE_CACHE_MIN_CHARS = 4096
+ENCODE_CACHE_ENTRIES = 8
+
+_encoded: OrderedDict[int, tuple[str, bytes]] = OrderedDict()
+_encoded_lock = threading.Lock()
+
+
+def encode_string(text: str) -> bytes:
+    """JSON encoding of `text` (with quotes), cached for large strings.
+
+    Entries are keyed by object identity and hold a reference to the string,
+    so the id can't be reused while the entry lives. The server passes one
+    artifact string object to every model, so the escape runs once per call.
+    """
+    if len(text) < ENCODE_CACHE_MIN_CHARS:
+        return dumps(text)
+    key = id(text)
+    with _encoded_lock:
+        hit = _encoded.get(key)
+        if hit is not None and hit[0] is text:
+            _encoded.move_to_end(key)
+            return hit[1]
+    encoded = dumps(text)
+    with _encoded_lock:
+        _encoded[key] = (text, encoded)
+        _encoded.move_to_end(key)
+        while len(_encoded) > ENCODE_CACHE_ENTRIES:
+            _encoded.popitem(last=False)
+    return encoded
+
+
+def clear_encode_cache() -> None:
+    with _encoded_lock:
+        _encoded.clear()
+
+
+class Slot(str):
+    """Placeholder for a large string in a template body."""
+
+    def __new__(cls, name: str):
+        return super().__new__(cls, f"\x00slot:{name}\x00")
+
+
+class BodyTemplate:
+    """A JSON body encoded once, with slots filled in by `render`."""
+
+    def __init__(self, body: dict, encoded: bytes | None = None):
+        encoded = encoded if encoded is not None else dumps(body)
+        self.literals: list[bytes] = []
+        self.slots: list[str] = []
+        for name, marker in _find_slots(body):
+            token = dumps(marker)
+            before, found, encoded = encoded.partition(token)
+            if not found:
+                raise ValueError(f"Slot {name} not found in encoded body")
+            self.literals.append(before)
+            self.slots.append(name)
+        self.literals.append(encoded)
+
+    def render(self, **values: str) -> bytes:
+        parts = [self.literals[0]]
+        for name, literal in zip(self.slots, self.literals[1:]):
+            parts.append(encode_string(values[name]))
+            parts.append(literal)
+        return b"".join(parts)
+
+
+def _find_slots(obj) -> list[tuple[str, Slot]]:
+    """Slots in `obj` in encoding order (dicts keep insertion order)."""
+    if isinstance(obj, Slot):
+        return [(obj.strip("\x00").removeprefix("slot:"), obj)]
+    if isinstance(obj, dict):
+        return [s for v in obj.values() for s in _find_slots(v)]
+    if isinstance(obj, (list, tuple)):
+        return [s for v in obj for s in _find_slots(v)]
+    return []
+
+
+class TemplateCache:
+    """Templates per request shape (model, settings, stream, ...), built on first use."""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._templates: OrderedDict[bytes, BodyTemplate] = OrderedDict()
+
+    def get(self, body: dict) -> BodyTemplate:
+        """Template for `body`, whose large strings are Slots."""
+        key = dumps(body)
+        template = self._templates.get(key)
+        if template is None:
+            template = self._templates[key] = BodyTemplate(body, key)
+            while len(self._templates) > self.max_entries:
+                self._templates.popitem(last=False)
+        else:
+            self._templates.move_to_end(key)
+        return template
@@ -0,0 +1,137 @@
+"""Content-addressed cache for review responses (in-memory LRU + on-disk TTL tier)."""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_MODES = ("bypass", "read", "write")
+
+DEFAULT_CACHE_SETTINGS = {
+    "enabled": False,
+    "memory_entries": 128,
+    "disk_dir": "~/.claude/cache/external-review",
+    "ttl_seconds": 86400,
+    "max_disk_mb": 100,
+}
+
+
+def cache_key(model_id: str, model: str, settings: dict, prompt: str, artifact_content: str) -> str:
+    """Hash everything that determines a model's response.
+
+    Private `_`-prefixed settings (timeouts, retries) don't change the output
+    and are left out so they don't fragment the cache.
+    """
+    public_settings = {k: v for k, v in settings.items() if not k.startswith("_")}
+    h = hashlib.sha256()
+    for part in (
+        model_id,
+        model,
+        json.dumps(public_settings, sort_keys=True, default=str),
+        prompt,
+        artifact_content,
+    ):
+        data = part.encode("utf-8")
+        h.update(len(data).to_bytes(8, "big"))
+        h.update(data)
+    return h.hexdigest()
+
+
+class ReviewCache:
+    """Two-tier cache of successful review entries keyed by `cache_key`.
+
+    The memory tier is a bounded LRU. The disk tier stores one JSON file per
+    key, expires entries after `ttl_seconds`, and evicts the oldest files once
+    the directory exceeds `max_disk_mb`. Disk access runs in a worker thread.
+    """
+
+    def __init__(self, settings: dict | None = None):
+        cfg = {**DEFAULT_CACHE_SETTINGS, **(settings or {})}
+        self.settings = cfg
+        self.memory_entries = int(cfg["memory_entries"])
+        self.ttl_seconds = float(cfg["ttl_seconds"])
+        self.max_disk_bytes = int(float(cfg["max_disk_mb"]) * 1024 * 1024)
+        self.disk_dir = Path(cfg["disk_dir"]).expanduser() if cfg.get("disk_dir") else None
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    async def get(self, key: str) -> dict | None:
+        """Return a cached entry, checking memory first, then disk."""
+        hit = self._memory.get(key)
+        if hit is not None:
+            stored_at, entry = hit
+            if time.time() - stored_at <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                return dict(entry)
+            del self._memory[key]
+
+        if self.disk_dir is None:
+            return None
+        record = await asyncio.to_thread(self._disk_get, key)
+        if record is None:
+            return None
+        self._remember(key, record["stored_at"], record["entry"])
+        return dict(record["entry"])
+
+    async def put(self, key: str, entry: dict) -> None:
+        """Store an entry in both tiers."""
+        stored_at = time.time()
+        self._remember(key, stored_at, entry)
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._disk_put, key, stored_at, entry)
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+
+    def _remember(self, key: str, stored_at: float, entry: dict) -> None:
+        self._memory[key] = (stored_at, dict(entry))
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.json"
+
+    def _disk_get(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            record = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if time.time() - record.get("stored_at", 0) > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+        return record
+
+    def _disk_put(self, key: str, stored_at: float, entry: dict) -> None:
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(key).with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"stored_at": stored_at, "entry": entry}))
+            os.replace(tmp, self._path(key))
+            self._prune_disk()
+        except OSError:
+            # The disk tier is an optimization; a failed write just means a later miss
+            pass
+
+    def _prune_disk(self) -> None:
+        now = time.time()
+        files = []
+        for path in self.disk_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,99 @@
+"""Review loop sessions: cycle rules, issues followed across cycles, stop decisions."""
+
+from issues import SEVERITIES
+from synthesis import DEFAULT_SIMILARITY, match_issues
+
+DEFAULT_CYCLE_SETTINGS = {
+    "min": 1,
+    "max": 10,
+    "structural_problem_signal": 4,  # Critical issues after this many cycles: flag for a human
+    "stuck_signal": 3,               # the same issue open this many cycles in a row: flag
+}
+
+# Outcome of a cycle; everything but "continue" ends the loop
+DECISIONS = ("continue", "complete", "stuck", "structural_problem", "max_cycles")
+
+# Issues that must be fixed before the loop can complete (Low is log-only)
+ACTIONABLE_SEVERITIES = ("Critical", "High")
+
+
+class ReviewLoop:
+    """The review cycles of one artifact and whether another one is needed.
+
+    Critical and High issues are followed from cycle to cycle by description
+    similarity, so an issue that survives its fixes counts towards the stuck
+    signal. Low issues are never fixed, so they don't.
+    """
+
+    def __init__(self, path: str, rules: dict | None = None, similarity: float = DEFAULT_SIMILARITY):
+        self.path = path
+        self.rules = {**DEFAULT_CYCLE_SETTINGS, **(rules or {})}
+        self.similarity = similarity
+        self.cycle = 0
+        self.content_hash: str | None = None
+        self.open_issues: list[dict] = []
+        self.history: list[dict] = []
+        self.decision: str | None = None
+        self.reason = ""
+
+    @property
+    def stopped(self) -> bool:
+        return self.decision not in (None, "continue")
+
+    def record_cycle(self, issues: list[dict], content_hash: str, cost_usd: float | None = None) -> str:
+        """Take one cycle's synthesized issues and decide whether to run another."""
+        self.cycle += 1
+        self.content_hash = content_hash
+        actionable = [i for i in issues if i.get("severity") in ACTIONABLE_SEVERITIES]
+        matches = match_issues(
+            [i["description"] for i in self.open_issues],
+            [i["description"] for i in actionable],
+            self.similarity,
+        )
+        still_open = []
+        for issue, match in zip(actionable, matches):
+            prior = self.open_issues[match] if match is not None else None
+            still_open.append({
+                "description": issue["description"],
+                "severity": issue["severity"],
+                "sources": issue.get("sources", []),
+                "first_cycle": prior["first_cycle"] if prior else self.cycle,
+                "cycles_open": prior["cycles_open"] + 1 if prior else 1,
+            })
+        self.open_issues = still_open
+        self.decision, self.reason = self._decide(issues)
+        self.history.append({
+            "cycle": self.cycle,
+            "issues": {s: sum(1 for i in issues if i.get("severity") == s) for s in SEVERITIES},
+            "decision": self.decision,
+            "cost_usd": cost_usd,
+        })
+        return self.decision
+
+    def _decide(self, issues: list[dict]) -> tuple[str, str]:
+        rules = self.rules
+        stuck = [i for i in self.open_issues if i["cycles_open"] >= rules["stuck_signal"]]
+        if stuck:
+            return "stuck", f"{len(stuck)} issue(s) still open after {rules['stuck_signal']} cycles"
+        if self.cycle > rules["structural_problem_signal"] and any(i.get("severity") == "Critical" for i in issues):
+            return "structural_problem", (
+                f"Still finding Critical issues after {rules['structural_problem_signal']} cycles"
+            )
+        if not self.open_issues and self.cycle >= rules["min"]:
+            return "complete", "No Critical or High issues"
+        if self.cycle >= rules["max"]:
+            return "max_cycles", f"Reached the maximum of {rules['max']} cycles"
+        if not self.open_issues:
+            return "continue", f"Minimum of {rules['min']} cycles not reached"
+        return "continue", f"{len(self.open_issues)} Critical/High issue(s) to fix"
+
+    def summary(self) -> dict:
+        return {
+            "artifact_path": self.path,
+            "cycle": self.cycle,
+            "decision": self.decision,
+            "stop": self.stopped,
+            "reason": self.reason,
+            "open_issues": self.open_issues,
+            "history": self.history,
+        }
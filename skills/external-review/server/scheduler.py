@@ -0,0 +1,39 @@
+"""Bounded scheduling for batch reviews (artifacts × models)."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+DEFAULT_BATCH_SETTINGS = {
+    "max_concurrency": 8,
+    "max_per_provider": 4,
+}
+
+
+class BatchScheduler:
+    """Caps reviews in flight overall and per provider endpoint.
+
+    A pair takes its provider slot before the global one, so pairs queued
+    behind a saturated provider don't hold global slots other providers
+    could use.
+    """
+
+    def __init__(self, settings: dict | None = None):
+        self.settings = {**DEFAULT_BATCH_SETTINGS, **(settings or {})}
+        self.max_concurrency = max(int(self.settings["max_concurrency"]), 1)
+        self.max_per_provider = max(int(self.settings["max_per_provider"]), 1)
+        self._global = asyncio.Semaphore(self.max_concurrency)
+        self._providers: dict[str, asyncio.Semaphore] = {}
+        self.in_flight = 0
+
+    @asynccontextmanager
+    async def slot(self, provider_key: str):
+        semaphore = self._providers.get(provider_key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_provider)
+            self._providers[provider_key] = semaphore
+        async with semaphore, self._global:
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
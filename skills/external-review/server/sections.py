@@ -0,0 +1,129 @@
+"""Markdown section splitting and section-level diffs between artifact snapshots."""
+
+import hashlib
+import re
+from dataclasses import dataclass
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+
+@dataclass
+class Section:
+    level: int  # 0 for preamble before the first heading
+    title: str
+    path: tuple[str, ...]  # titles of enclosing headings, including this one
+    text: str  # heading line plus body
+
+    @property
+    def label(self) -> str:
+        return " > ".join(self.path) or "(preamble)"
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.text.strip().encode("utf-8")).hexdigest()
+
+
+def split_sections(text: str) -> list[Section]:
+    """Split markdown into sections at ATX headings, ignoring fenced code blocks."""
+    sections: list[Section] = []
+    stack: list[tuple[int, str]] = []
+    current = Section(level=0, title="", path=(), text="")
+    lines: list[str] = []
+    in_fence = False
+
+    for line in text.splitlines(keepends=True):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_RE.match(line.rstrip("\n"))
+        if match:
+            current.text = "".join(lines)
+            if current.level or current.text.strip():
+                sections.append(current)
+            level, title = len(match.group(1)), match.group(2)
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, title))
+            current = Section(level=level, title=title, path=tuple(t for _, t in stack), text="")
+            lines = [line]
+        else:
+            lines.append(line)
+
+    current.text = "".join(lines)
+    if current.level or current.text.strip():
+        sections.append(current)
+    return sections
+
+
+def _keyed(sections: list[Section]) -> dict[tuple, Section]:
+    """Key sections by heading path, numbering repeated paths in document order."""
+    seen: dict[tuple, int] = {}
+    keyed = {}
+    for section in sections:
+        n = seen.get(section.path, 0)
+        seen[section.path] = n + 1
+        keyed[(section.path, n)] = section
+    return keyed
+
+
+def outline_entry(section: Section) -> str:
+    if not section.level:
+        return "- (preamble)"
+    return f"{'  ' * (section.level - 1)}- {'#' * section.level} {section.title}"
+
+
+@dataclass
+class SectionDiff:
+    sections: list[Section]  # every section of the new snapshot, in order
+    changed: list[Section]  # new or modified, in document order
+    removed: list[Section]  # present in the old snapshot only
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.changed or self.removed)
+
+
+def diff_sections(old_text: str, new_text: str) -> SectionDiff:
+    """Compare two snapshots section by section."""
+    old = _keyed(split_sections(old_text))
+    new = _keyed(split_sections(new_text))
+    changed = [
+        section for key, section in new.items()
+        if key not in old or old[key].digest != section.digest
+    ]
+    removed = [section for key, section in old.items() if key not in new]
+    return SectionDiff(sections=list(new.values()), changed=changed, removed=removed)
+
+
+def build_delta_content(diff: SectionDiff, prior_issues: list[str] | None = None) -> str:
+    """Render the payload for an incremental review: an outline of the whole
+    document, removed headings, the prior issue list and changed sections in full."""
+    changed_ids = {id(s) for s in diff.changed}
+    parts = [
+        "# Incremental Review",
+        "",
+        "This artifact was reviewed in the previous cycle. Only the sections marked "
+        "[CHANGED] were modified since then; review those sections and check whether "
+        "the prior issues are resolved. Sections marked [unchanged] were already "
+        "reviewed and are listed by heading only.",
+        "",
+        "## Document Outline",
+        "",
+    ]
+    for section in diff.sections:
+        marker = "[CHANGED]" if id(section) in changed_ids else "[unchanged]"
+        parts.append(f"{outline_entry(section)} {marker}")
+
+    if diff.removed:
+        parts += ["", "## Removed Sections", ""]
+        parts += [outline_entry(s) for s in diff.removed]
+
+    if prior_issues:
+        parts += ["", "## Prior Issues", ""]
+        parts += [f"{i}. {issue}" for i, issue in enumerate(prior_issues, 1)]
+
+    parts += ["", "## Changed Sections", ""]
+    for section in diff.changed:
+        parts += [section.text.rstrip("\n"), ""]
+
+    return "\n".join(parts).rstrip("\n") + "\n"
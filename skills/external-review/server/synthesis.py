@@ -0,0 +1,246 @@
+"""Cross-model issue synthesis: near-duplicate grouping and consensus counts."""
+
+import math
+import re
+from collections import Counter, defaultdict
+
+from issues import COMPLEXITIES, SEVERITIES, parse_issues
+
+# Cosine similarity (TF-IDF over description words) at which two issues are the same
+DEFAULT_SIMILARITY = 0.5
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("""
+    a an and any are as at be been but by can could do does for from has have how if in into
+    is it its may might more must no not of on or should so such than that the their then there
+    these this those to too was were what when where which while will with without would
+""".split())
+
+_HEADING = re.compile(r"^#{1,6}\s+(.*?)\s*#*$")
+_ITEM = re.compile(r"^(?:[-*+]|\d+[.)])\s+(.*)$")
+_EMPHASIS = re.compile(r"\*\*|__|`|(?<!\w)[*_]|[*_](?!\w)")
+_SEVERITY_TAG = re.compile(r"severity\W{0,3}(critical|high|low)\b", re.IGNORECASE)
+_COMPLEXITY_TAG = re.compile(r"complexity\W{0,3}(low|medium|high)\b", re.IGNORECASE)
+_TAGS = re.compile(r"\s*[(\[]?(?:severity|complexity)\W{0,3}(?:critical|high|medium|low)\b[)\]]?[.;,]?", re.IGNORECASE)
+
+
+def _stem(word: str) -> str:
+    """Crude suffix stripping, enough to match "deployments"/"deployment", "logged"/"logs"."""
+    for suffix, replacement in (("ies", "y"), ("ing", ""), ("ed", ""), ("s", "")):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            stem = word[: -len(suffix)] + replacement
+            if suffix in ("ing", "ed") and stem[-1] == stem[-2] and stem[-1] not in "aeiouls":
+                stem = stem[:-1]
+            return stem
+    return word
+
+
+def _terms(text: str) -> list[str]:
+    return [_stem(w) for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def extract_text_issues(text: str | None) -> list[dict]:
+    """Issue records from a free-text review: one per top-level list item.
+
+    The fallback for reviews requested with format="text" or whose JSON
+    didn't parse. The nearest heading above an item becomes its section, and
+    "Severity: High" / "Complexity: Low" tags inside it are picked up.
+    Indented lines continue the current item; items under four words are
+    dropped as noise.
+    """
+    issues, section, current = [], "", None
+    for line in (text or "").splitlines():
+        heading = _HEADING.match(line)
+        item = _ITEM.match(line)
+        if heading:
+            section, current = _EMPHASIS.sub("", heading.group(1)).strip(), None
+        elif item:
+            current = {"section": section, "lines": [item.group(1)]}
+            issues.append(current)
+        elif current is not None and line[:1].isspace() and line.strip():
+            current["lines"].append(line.strip())
+        elif not line.strip():
+            continue
+        else:
+            current = None
+
+    records = []
+    for issue in issues:
+        body = _EMPHASIS.sub("", " ".join(issue["lines"])).strip()
+        if len(body.split()) < 4:
+            continue
+        severity = _SEVERITY_TAG.search(body)
+        complexity = _COMPLEXITY_TAG.search(body)
+        records.append({
+            "description": _TAGS.sub("", body).strip(),
+            "section": issue["section"],
+            "severity": severity.group(1).capitalize() if severity else None,
+            "complexity": complexity.group(1).capitalize() if complexity else None,
+            "suggested_fix": "",
+        })
+    return records
+
+
+def _review_issues(review: dict) -> tuple[list[dict] | None, str]:
+    """(issues, source) for one review entry; issues is None if it has none to offer."""
+    if review.get("status") != "success":
+        return None, review.get("status") or "missing status"
+    if isinstance(review.get("issues"), list):
+        return review["issues"], "issues"
+    issues, _ = parse_issues(review.get("response"))
+    if issues is not None:
+        return issues, "issues"
+    return extract_text_issues(review.get("response")), "text"
+
+
+def _member(model: str, issue: dict) -> dict:
+    """An issue record tagged with its model; tolerates records missing optional fields."""
+    return {
+        "model": model,
+        "description": str(issue["description"]).strip(),
+        "section": str(issue.get("section") or "").strip(),
+        "severity": issue.get("severity") if issue.get("severity") in SEVERITIES else None,
+        "complexity": issue.get("complexity") if issue.get("complexity") in COMPLEXITIES else None,
+        "suggested_fix": str(issue.get("suggested_fix") or "").strip(),
+    }
+
+
+def _vectors(docs: list[list[str]]) -> list[dict[str, float]]:
+    """Unit-length TF-IDF vectors (smoothed idf)."""
+    df = Counter(t for terms in docs for t in set(terms))
+    n = len(docs)
+    vectors = []
+    for terms in docs:
+        weights = {t: c * (math.log((1 + n) / (1 + df[t])) + 1) for t, c in Counter(terms).items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        vectors.append({t: w / norm for t, w in weights.items()})
+    return vectors
+
+
+def _cluster(vectors: list[dict[str, float]], owners: list[str], threshold: float) -> list[int]:
+    """Group label per vector: vectors are linked when they come from different
+    models and their cosine similarity reaches `threshold` (single linkage).
+
+    Candidates come from an inverted index that leaves out each vector's
+    lightest terms, as many as fit under `threshold` in L2 norm: two issues
+    that only share such terms can't reach the threshold, so frequent words
+    never enter the index. Candidates already in the same group aren't
+    compared again, which keeps an issue reported by every model linear
+    rather than quadratic.
+    """
+    parent = list(range(len(vectors)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    index: dict[str, list[int]] = defaultdict(list)
+    cutoff = threshold * threshold
+    for i, vector in enumerate(vectors):
+        candidates = {j for term in vector for j in index.get(term, ())}
+        for j in sorted(candidates):
+            if owners[j] == owners[i] or find(j) == find(i):
+                continue
+            other = vectors[j]
+            if sum(w * other.get(t, 0.0) for t, w in vector.items()) >= threshold:
+                parent[find(i)] = find(j)
+        prefix = 0.0
+        for term, weight in sorted(vector.items(), key=lambda tw: tw[1]):
+            prefix += weight * weight
+            if prefix >= cutoff:
+                index[term].append(i)
+    return [find(i) for i in range(len(vectors))]
+
+
+def _rank(value: str | None, order: tuple[str, ...]) -> int:
+    return order.index(value) if value in order else len(order)
+
+
+def synthesize_reviews(reviews: list[dict], threshold: float = DEFAULT_SIMILARITY) -> dict:
+    """Group near-duplicate issues across review entries.
+
+    `reviews` are entries as returned by the `review` tool. Issues from
+    different models whose descriptions reach `threshold` TF-IDF cosine
+    similarity are linked, and linked issues form one group (single
+    linkage). Issues from the same model are never linked directly, so a
+    model's own distinct findings aren't collapsed. Each group takes the
+    highest severity and complexity among its members; groups are ordered
+    by consensus, then severity.
+    """
+    members, models, skipped = [], [], []
+    for review in reviews:
+        model = review.get("model") or "unknown"
+        issues, source = _review_issues(review)
+        if issues is None:
+            skipped.append({"model": model, "reason": source})
+            continue
+        usable = [_member(model, issue) for issue in issues if isinstance(issue, dict) and issue.get("description")]
+        models.append({"model": model, "issues": len(usable), "source": source})
+        members.extend(usable)
+
+    vectors = _vectors([_terms(m["description"]) for m in members])
+    clusters: dict[int, list[int]] = defaultdict(list)
+    for i, label in enumerate(_cluster(vectors, [m["model"] for m in members], threshold)):
+        clusters[label].append(i)
+
+    groups = []
+    for indices in clusters.values():
+        group = [members[i] for i in indices]
+        lead = min(group, key=lambda m: (
+            _rank(m["severity"], SEVERITIES), not m["suggested_fix"], -len(m["description"]),
+        ))
+        sources = sorted({m["model"] for m in group})
+        severities = [m["severity"] for m in group if m["severity"]]
+        complexities = [m["complexity"] for m in group if m["complexity"]]
+        sections = Counter(m["section"] for m in group if m["section"])
+        groups.append((indices[0], {
+            "description": lead["description"],
+            "section": lead["section"] or (sections.most_common(1)[0][0] if sections else ""),
+            "severity": min(severities, key=lambda s: _rank(s, SEVERITIES)) if severities else None,
+            "complexity": max(complexities, key=lambda c: _rank(c, COMPLEXITIES)) if complexities else None,
+            "suggested_fix": lead["suggested_fix"] or next((m["suggested_fix"] for m in group if m["suggested_fix"]), ""),
+            "sources": sources,
+            "consensus": len(sources),
+            "members": group,
+        }))
+    groups.sort(key=lambda g: (-g[1]["consensus"], _rank(g[1]["severity"], SEVERITIES), g[0]))
+    groups = [{"id": number, **group} for number, (_, group) in enumerate(groups, 1)]
+
+    severity_counts = Counter(g["severity"] or "unclassified" for g in groups)
+    return {
+        "issues": groups,
+        "counts": {
+            "input_issues": len(members),
+            "groups": len(groups),
+            "multi_model": sum(1 for g in groups if g["consensus"] > 1),
+            "severity": {s: severity_counts.get(s, 0) for s in (*SEVERITIES, "unclassified")},
+        },
+        "models": models,
+        "skipped": skipped,
+        "similarity": threshold,
+    }
+
+
+def match_issues(previous: list[str], current: list[str], threshold: float = DEFAULT_SIMILARITY) -> list[int | None]:
+    """For each current description, the index of the previous one it repeats, or None.
+
+    Used to follow an issue across review cycles. Each previous issue matches
+    at most one current issue; the most similar pairs are matched first.
+    """
+    vectors = _vectors([_terms(d) for d in [*previous, *current]])
+    old, new = vectors[: len(previous)], vectors[len(previous):]
+    pairs = []
+    for c, vector in enumerate(new):
+        for p, other in enumerate(old):
+            score = sum(w * other.get(t, 0.0) for t, w in vector.items())
+            if score >= threshold:
+                pairs.append((score, c, p))
+    matches: list[int | None] = [None] * len(current)
+    used = set()
+    for _, c, p in sorted(pairs, reverse=True):
+        if matches[c] is None and p not in used:
+            matches[c] = p
+            used.add(p)
+    return matches
@@ -0,0 +1,59 @@
+"""Tests for cached, off-loop artifact loading."""
+
+import os
+
+import pytest
+
+import artifacts
+from artifacts import ArtifactCache, read_text
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+class TestReadText:
+    def test_small_and_mmap_paths_agree(self, tmp_path, monkeypatch):
+        path = tmp_path / "doc.md"
+        path.write_text("# Título\n" + "línea\n" * 100, encoding="utf-8")
+        small = read_text(str(path))
+        monkeypatch.setattr(artifacts, "MMAP_THRESHOLD_BYTES", 1)
+        assert read_text(str(path)) == small
+        assert small.startswith("# Título")
+
+
+class TestArtifactCache:
+    @pytest.mark.asyncio
+    async def test_hit_until_file_changes(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("v1")
+        cache = ArtifactCache()
+
+        resolved, content = await cache.load(str(path), str(tmp_path))
+        assert (resolved, content) == (str(path.resolve()), "v1")
+        await cache.load(str(path), str(tmp_path))
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        path.write_text("v2")
+        _bump_mtime(path)
+        _, content = await cache.load(str(path), str(tmp_path))
+        assert content == "v2"
+        assert cache.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, tmp_path):
+        cache = ArtifactCache(max_entries=2)
+        for name in ("a", "b", "c"):
+            (tmp_path / name).write_text(name)
+            await cache.load(str(tmp_path / name), str(tmp_path))
+        await cache.load(str(tmp_path / "a"), str(tmp_path))
+        assert cache.misses == 4
+
+    @pytest.mark.asyncio
+    async def test_validation_errors_propagate(self, tmp_path):
+        cache = ArtifactCache()
+        with pytest.raises(FileNotFoundError):
+            await cache.load(str(tmp_path / "missing.md"), str(tmp_path))
+        with pytest.raises(ValueError):
+            await cache.load("relative.md", str(tmp_path))
@@ -0,0 +1,48 @@
+"""Tests for preflight cost projection and spend budgets."""
+
+from budget import SpendTracker, check_call_budget, project_cost
+
+PRICING = {"input_per_1m": 1.0, "output_per_1m": 10.0}
+
+
+def test_project_cost():
+    assert project_cost(1_000_000, 100_000, PRICING) == 2.0
+    assert project_cost(1000, 1000, None) is None
+
+
+def test_check_call_budget():
+    assert check_call_budget(0.5, 1.0) is None
+    assert check_call_budget(None, 1.0) is None
+    assert check_call_budget(2.0, None) is None
+    assert "per-call budget" in check_call_budget(2.0, 1.0)
+
+
+class TestSpendTracker:
+    def test_reservations_count_against_daily_limit(self):
+        spend = SpendTracker()
+        spend.roll("2026-01-01", spent=0.5)
+        assert spend.try_reserve(0.3, 1.0) is True
+        assert spend.try_reserve(0.3, 1.0) is False
+        spend.settle(0.3, 0.1)
+        assert spend.snapshot() == {"day": "2026-01-01", "spent_usd": 0.6, "reserved_usd": 0.0}
+        assert spend.try_reserve(0.3, 1.0) is True
+
+    def test_no_limit(self):
+        spend = SpendTracker()
+        assert spend.try_reserve(1e9, None) is True
+
+    def test_roll_resets(self):
+        spend = SpendTracker()
+        spend.roll("2026-01-01")
+        spend.try_reserve(1.0, None)
+        spend.roll("2026-01-02", spent=2.0)
+        assert spend.snapshot() == {"day": "2026-01-02", "spent_usd": 2.0, "reserved_usd": 0.0}
+
+    def test_sync_keeps_reservations(self):
+        spend = SpendTracker()
+        spend.sync("2026-01-01", 0.2)
+        spend.try_reserve(0.3, None)
+        spend.sync("2026-01-01", 0.5)
+        assert spend.snapshot() == {"day": "2026-01-01", "spent_usd": 0.5, "reserved_usd": 0.3}
+        spend.sync("2026-01-02", 0.0)
+        assert spend.snapshot() == {"day": "2026-01-02", "spent_usd": 0.0, "reserved_usd": 0.0}
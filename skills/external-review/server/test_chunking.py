@@ -0,0 +1,114 @@
+"""Tests for artifact chunking and map-reduce of per-chunk reviews."""
+
+import asyncio
+
+import pytest
+
+from chunking import (
+    chunk_budget,
+    chunk_markdown,
+    estimate_tokens,
+    map_reduce_review,
+    reduce_responses,
+)
+from providers.base import ReviewResponse
+
+
+def _doc(sections=6, words=200):
+    return "# Design\n\n" + "".join(
+        f"## Section {i}\n\n" + "word " * words + "\n\n" for i in range(sections)
+    )
+
+
+class TestChunkBudget:
+    def test_no_limits(self):
+        assert chunk_budget(None, "prompt") is None
+        assert chunk_budget({}, "prompt") is None
+
+    def test_chunk_tokens(self):
+        assert chunk_budget({"chunk_tokens": 1000}, "prompt") == 1000
+
+    def test_context_reserves_prompt_and_output(self):
+        budget = chunk_budget({"context_tokens": 10_000}, "p" * 400, max_output_tokens=2000)
+        assert budget == 10_000 - 100 - 2000
+
+    def test_smallest_limit_wins(self):
+        assert chunk_budget({"context_tokens": 100_000, "chunk_tokens": 500}, "p") == 500
+
+
+class TestChunkMarkdown:
+    def test_small_artifact_single_chunk(self):
+        doc = _doc(sections=1, words=10)
+        assert chunk_markdown(doc, 1000) == [doc]
+
+    def test_chunks_respect_budget_and_roundtrip(self):
+        doc = _doc()
+        chunks = chunk_markdown(doc, 300)
+        assert len(chunks) > 1
+        assert "".join(chunks) == doc
+        assert all(estimate_tokens(c) <= 300 for c in chunks)
+
+    def test_keeps_sections_whole_when_they_fit(self):
+        chunks = chunk_markdown(_doc(words=50), 300)
+        for chunk in chunks[1:]:
+            assert chunk.startswith("## Section")
+
+    def test_oversized_section_split(self):
+        doc = "# Big\n\n" + "line of text\n" * 500
+        chunks = chunk_markdown(doc, 100)
+        assert "".join(chunks) == doc
+        assert all(len(c) <= 400 for c in chunks)
+
+
+class TestMapReduce:
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_merge(self):
+        active = 0
+        peak = 0
+
+        async def review_chunk(content):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            part = content.rsplit("[", 1)[1]
+            return ReviewResponse(
+                status="success", response=f"findings for {part}",
+                tokens_used={"input": 10, "output": 5}, latency_ms=10, cost_usd=0.001,
+            )
+
+        result = await map_reduce_review(review_chunk, ["a", "b", "c", "d", "e"], concurrency=2)
+        assert peak == 2
+        assert result.status == "success"
+        assert result.chunks == {"total": 5, "failed": 0}
+        assert result.tokens_used == {"input": 50, "output": 25}
+        assert result.cost_usd == 0.005
+        assert result.response.index("## Part 1 of 5") < result.response.index("## Part 5 of 5")
+
+    def test_partial_failure(self):
+        result = reduce_responses([
+            ReviewResponse(status="success", response="ok", tokens_used={"input": 1, "output": 1}),
+            ReviewResponse(status="error", error="HTTP 500"),
+        ])
+        assert result.status == "success"
+        assert result.chunks == {"total": 2, "failed": 1}
+        assert "Review failed: HTTP 500" in result.response
+
+    def test_all_fail(self):
+        result = reduce_responses([
+            ReviewResponse(status="error", error="HTTP 500", retries_attempted=2),
+            ReviewResponse(status="error", error="timeout", retries_attempted=2),
+        ])
+        assert result.status == "error"
+        assert "part 2: timeout" in result.error
+        assert result.retries_attempted == 4
+
+    def test_issues_concatenated(self):
+        result = reduce_responses([
+            ReviewResponse(status="success", response="{}", issues=[{"description": "a"}]),
+            ReviewResponse(status="success", response="oops", issues_error="Response is not valid JSON"),
+            ReviewResponse(status="success", response="{}", issues=[{"description": "b"}]),
+        ])
+        assert result.issues == [{"description": "a"}, {"description": "b"}]
+        assert result.issues_error == "part 2: Response is not valid JSON"
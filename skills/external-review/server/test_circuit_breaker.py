@@ -0,0 +1,81 @@
+"""Tests for per-endpoint circuit breakers."""
+
+from providers.circuit_breaker import CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker
+
+
+class TestCircuitBreaker:
+    def test_health_check_only_half_opens(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=30)
+        breaker.record_failure()
+        breaker.record_health_check_success()
+        assert breaker.state == CLOSED
+        assert breaker.failures == 1  # a healthy /models says nothing about completions
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        breaker.record_health_check_success()
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # still one probe at a time
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout_seconds=30)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.allow() is False
+        assert 0 < breaker.retry_in_seconds() <= 30
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_half_open_allows_one_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0)
+        breaker.record_failure()
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() is True
+
+    def test_half_open_probe_outcome(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=30)
+        breaker.record_failure()
+        breaker.opened_at -= 30
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # probe already in flight
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        breaker.opened_at -= 30
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow() is True
+
+    def test_snapshot(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+        snap = breaker.snapshot()
+        assert snap["state"] == OPEN
+        assert snap["consecutive_failures"] == 1
+
+
+class TestBreakerRegistry:
+    def test_shared_per_origin(self):
+        registry = BreakerRegistry({"failure_threshold": 2})
+        a = registry.get("https://api.example.com/v1")
+        b = registry.get("https://api.example.com/v2/")
+        assert a is b
+        assert a.failure_threshold == 2
+        assert registry.get("https://other.example.com") is not a
+
+    def test_ignores_unrelated_settings(self):
+        registry = BreakerRegistry({"health_check_interval_seconds": 10})
+        assert registry.get("https://x").failure_threshold == 5
@@ -96,6 +96,13 @@ class TestLoadModelsConfig:
         assert "good-model" in config["models"]
         assert "bad-model" not in config["models"]
 
+    def test_strict_raises_on_invalid_yaml(self, tmp_path):
+        path = tmp_path / "models.yaml"
+        path.write_text("models: [unclosed")
+        assert load_models_config(path)["models"] == {}
+        with pytest.raises(ValueError):
+            load_models_config(path, strict=True)
+
     def test_env_var_resolution(self, models_yaml, monkeypatch):
         monkeypatch.setenv("TEST_GOOGLE_KEY", "resolved-key-123")
         config = load_models_config(models_yaml)
@@ -129,3 +136,15 @@ class TestLoadSkillConfig:
     def test_missing_file_raises(self, tmp_path):
         with pytest.raises(FileNotFoundError):
             load_skill_config(tmp_path / "nonexistent.yaml")
+
+    def test_cached_until_file_changes(self, skill_config_yaml):
+        first = load_skill_config(skill_config_yaml)
+        assert load_skill_config(skill_config_yaml) is first
+
+        data = yaml.safe_load(skill_config_yaml.read_text())
+        data["version"] = "2.0.0"
+        skill_config_yaml.write_text(yaml.dump(data))
+        st = os.stat(skill_config_yaml)
+        os.utime(skill_config_yaml, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert load_skill_config(skill_config_yaml)["version"] == "2.0.0"
@@ -157,3 +157,324 @@ class TestGoogleProvider:
             assert "timed out" in result.error.lower()
         finally:
             httpx.AsyncClient.__init__ = original_init
+
+
+def mock_stream_response():
+    events = [
+        {"candidates": [{"content": {"parts": [{"text": "## Review "}]}}],
+         "usageMetadata": {"promptTokenCount": 100}},
+        {"candidates": [{"content": {"parts": [{"text": "Feedback"}]}, "finishReason": "STOP"}],
+         "usageMetadata": {"promptTokenCount": 100, "candidatesTokenCount": 50}},
+    ]
+    body = "".join(f"data: {json.dumps(e)}\r\n\r\n" for e in events)
+    return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+
+class TestGoogleStreaming:
+    @pytest.mark.asyncio
+    async def test_stream_success(self, provider):
+        captured_urls = []
+        chunks = []
+
+        def handler(req):
+            captured_urls.append(str(req.url))
+            return mock_stream_response()
+
+        async def on_chunk(delta):
+            chunks.append(delta)
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            result = await provider.review("content", "prompt", "gemini-2.0-flash", on_chunk=on_chunk)
+            assert result.status == "success"
+            assert result.response == "## Review Feedback"
+            assert chunks == ["## Review ", "Feedback"]
+            assert result.tokens_used == {"input": 100, "output": 50}
+            assert result.ttft_ms is not None
+            assert ":streamGenerateContent" in captured_urls[0]
+            assert "alt=sse" in captured_urls[0]
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tail, error", [
+        ('data: {"error": {"code": 503, "status": "UNAVAILABLE"}}\r\n\r\n', "UNAVAILABLE"),
+        ("", "without a finishReason"),
+    ])
+    async def test_stream_error_or_cut_off_fails(self, provider, tail, error):
+        partial = 'data: {"candidates": [{"content": {"parts": [{"text": "Partial rev"}]}}]}\r\n\r\n' + tail
+        transport = httpx.MockTransport(lambda req: httpx.Response(
+            200, text=partial, headers={"Content-Type": "text/event-stream"},
+        ))
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        async def on_chunk(delta):
+            pass
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            result = await provider.review(
+                "content", "prompt", "gemini-2.0-flash", on_chunk=on_chunk, settings={"_retry_attempts": 0},
+            )
+            assert result.status == "error"
+            assert error in result.error
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    async def test_stream_rate_limit_retries(self, provider):
+        call_count = 0
+
+        def handler(req):
+            nonlocal call_count
+            call_count += 1
+            if call_count < 2:
+                return mock_rate_limit_response()
+            return mock_stream_response()
+
+        async def on_chunk(delta):
+            pass
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            result = await provider.review(
+                "content", "prompt", "gemini-2.0-flash",
+                settings={"_retry_attempts": 2},
+                on_chunk=on_chunk,
+            )
+            assert result.status == "success"
+            assert result.retries_attempted == 1
+            assert call_count == 2
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+
+class TestGooglePromptCache:
+    @pytest.mark.asyncio
+    async def test_uses_cached_content(self, provider):
+        requests = []
+
+        def handler(req):
+            requests.append(req)
+            if req.url.path.endswith("/cachedContents"):
+                return httpx.Response(200, json={"name": "cachedContents/abc"})
+            return httpx.Response(200, json={
+                "candidates": [{"content": {"parts": [{"text": "ok"}]}}],
+                "usageMetadata": {
+                    "promptTokenCount": 1000, "candidatesTokenCount": 10, "cachedContentTokenCount": 900,
+                },
+            })
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            for _ in range(2):
+                result = await provider.review(
+                    "content", "prompt", "gemini-2.0-flash", settings={"_prompt_cache_ttl": 600},
+                )
+            assert result.status == "success"
+            assert result.tokens_used["cached_input"] == 900
+            cache_creates = [r for r in requests if r.url.path.endswith("/cachedContents")]
+            assert len(cache_creates) == 1
+            create_body = json.loads(cache_creates[0].content)
+            assert create_body["model"] == "models/gemini-2.0-flash"
+            assert create_body["ttl"] == "600s"
+            generate_body = json.loads(requests[-1].content)
+            assert generate_body["cachedContent"] == "cachedContents/abc"
+            assert "system_instruction" not in generate_body
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    async def test_cache_creation_failure_falls_back(self, provider):
+        generate_bodies = []
+
+        def handler(req):
+            if req.url.path.endswith("/cachedContents"):
+                return httpx.Response(400, text="Cached content is too small")
+            generate_bodies.append(json.loads(req.content))
+            return mock_success_response()
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            result = await provider.review(
+                "content", "prompt", "gemini-2.0-flash", settings={"_prompt_cache_ttl": 600},
+            )
+            assert result.status == "success"
+            assert "system_instruction" in generate_bodies[0]
+            assert "cachedContent" not in generate_bodies[0]
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    async def test_rejected_cache_retries_uncached(self, provider):
+        generate_bodies = []
+
+        def handler(req):
+            if req.url.path.endswith("/cachedContents"):
+                return httpx.Response(200, json={"name": "cachedContents/gone"})
+            body = json.loads(req.content)
+            generate_bodies.append(body)
+            if "cachedContent" in body:
+                return httpx.Response(404, text="CachedContent not found")
+            return mock_success_response()
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            result = await provider.review(
+                "content", "prompt", "gemini-2.0-flash",
+                settings={"_prompt_cache_ttl": 600, "_retry_attempts": 1},
+            )
+            assert result.status == "success"
+            assert len(generate_bodies) == 2
+            assert "system_instruction" in generate_bodies[1]
+            assert provider._cached_contents == {}
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+
+class TestGoogleRateLimit:
+    @pytest.mark.asyncio
+    async def test_retry_info_delay_honoured(self, provider):
+        import time
+        call_count = 0
+
+        def handler(req):
+            nonlocal call_count
+            call_count += 1
+            if call_count == 1:
+                return httpx.Response(429, json={"error": {"code": 429, "details": [
+                    {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "0.1s"},
+                ]}})
+            return mock_success_response()
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            start = time.monotonic()
+            result = await provider.review(
+                "content", "prompt", "gemini-2.0-flash", settings={"_retry_attempts": 2},
+            )
+            assert result.status == "success"
+            assert 0.09 <= time.monotonic() - start < 1.5
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+
+class TestGoogleCountTokens:
+    @pytest.mark.asyncio
+    async def test_count_tokens_api(self, provider):
+        seen = []
+
+        def handler(req):
+            seen.append((req.url.path, json.loads(req.content)))
+            return httpx.Response(200, json={"totalTokens": 1234})
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            assert await provider.count_tokens("content", "prompt", "gemini-2.0-flash") == (1234, "provider")
+            path, body = seen[0]
+            assert path.endswith("/models/gemini-2.0-flash:countTokens")
+            assert body["generateContentRequest"]["contents"][0]["parts"][0]["text"] == "content"
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    async def test_count_tokens_falls_back_to_estimate(self, provider):
+        transport = httpx.MockTransport(lambda req: httpx.Response(400, text="bad"))
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            assert await provider.count_tokens("x" * 40, "p" * 8, "gemini-2.0-flash") == (12, "local")
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+
+class TestGoogleStructuredOutput:
+    @pytest.mark.asyncio
+    async def test_response_schema(self, provider):
+        sent = {}
+
+        def handler(req):
+            sent.update(json.loads(req.content))
+            return mock_success_response()
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            schema = {
+                "type": "object",
+                "properties": {"issues": {"type": "array", "items": {"type": "object", "additionalProperties": False}}},
+                "additionalProperties": False,
+            }
+            await provider.review("content", "prompt", "gemini-2.0-flash", settings={"_response_schema": schema})
+            config = sent["generationConfig"]
+            assert config["responseMimeType"] == "application/json"
+            assert config["responseSchema"] == {
+                "type": "object",
+                "properties": {"issues": {"type": "array", "items": {"type": "object"}}},
+            }
+        finally:
+            httpx.AsyncClient.__init__ = original_init
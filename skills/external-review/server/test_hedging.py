@@ -0,0 +1,82 @@
+"""Tests for hedged requests across fallback chains."""
+
+import asyncio
+
+import pytest
+
+from hedging import hedged_review
+from providers.base import ReviewResponse
+
+
+def _runner(delays: dict, failures: set = frozenset()):
+    started, cancelled = [], []
+
+    async def run(model_id):
+        started.append(model_id)
+        try:
+            await asyncio.sleep(delays[model_id])
+        except asyncio.CancelledError:
+            cancelled.append(model_id)
+            raise
+        if model_id in failures:
+            return ReviewResponse(status="error", error=f"{model_id} failed")
+        return ReviewResponse(status="success", response=model_id)
+
+    return run, started, cancelled
+
+
+class TestHedgedReview:
+    @pytest.mark.asyncio
+    async def test_fast_primary_no_hedge(self):
+        run, started, _ = _runner({"a": 0.01, "b": 0.01})
+        result, served_by, launched = await hedged_review(["a", "b"], run, lambda m: 500)
+        assert served_by == "a"
+        assert launched == ["a"]
+        assert started == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_hedged_and_cancelled(self):
+        run, started, cancelled = _runner({"a": 5, "b": 0.01})
+        result, served_by, launched = await hedged_review(["a", "b"], run, lambda m: 50)
+        assert served_by == "b"
+        assert result.response == "b"
+        assert launched == ["a", "b"]
+        assert cancelled == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_primary_wins_race_after_hedge(self):
+        run, _, cancelled = _runner({"a": 0.1, "b": 5})
+        result, served_by, launched = await hedged_review(["a", "b"], run, lambda m: 20)
+        assert served_by == "a"
+        assert launched == ["a", "b"]
+        assert cancelled == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_failure_falls_through_chain(self):
+        run, started, _ = _runner({"a": 0.01, "b": 0.01, "c": 0.01}, failures={"a", "b"})
+        result, served_by, launched = await hedged_review(["a", "b", "c"], run, lambda m: None)
+        assert served_by == "c"
+        assert started == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_all_fail_returns_last_error(self):
+        run, _, _ = _runner({"a": 0.01, "b": 0.01}, failures={"a", "b"})
+        result, served_by, _ = await hedged_review(["a", "b"], run, lambda m: None)
+        assert result.status == "error"
+        assert served_by == "b"
+
+    @pytest.mark.asyncio
+    async def test_no_threshold_waits_for_primary(self):
+        run, started, _ = _runner({"a": 0.05, "b": 0.01})
+        _, served_by, _ = await hedged_review(["a", "b"], run, lambda m: None)
+        assert served_by == "a"
+        assert started == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_deadline_exceeded_stops_chain(self):
+        async def run(model_id):
+            return ReviewResponse(status="deadline_exceeded", error="Deadline exceeded")
+
+        result, served_by, launched = await hedged_review(["a", "b"], run, lambda m: None)
+        assert result.status == "deadline_exceeded"
+        assert launched == ["a"]
@@ -92,6 +92,240 @@ class TestServerIntegration:
             assert result["models_called"] == ["test-model"]
             assert result["total_latency_ms"] >= 0
 
+    @pytest.mark.asyncio
+    async def test_provider_cached_with_shared_pool(self, integration_env):
+        """Repeated lookups reuse one provider bound to the server's client pool."""
+        with patch("external_review_server.SKILL_CONFIG_YAML", integration_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(integration_env["models_path"])
+
+            first, error = srv._get_provider("test-model")
+            second, _ = srv._get_provider("test-model")
+            assert error is None
+            assert first is second
+            assert first.client_pool is srv._get_client_pool()
+
+            await srv._close_client_pool()
+            assert srv._client_pool is None
+            assert srv._providers == {}
+
+    @pytest.mark.asyncio
+    async def test_health_checks_feed_circuit_breaker(self, integration_env):
+        """Failed background health checks open the circuit shown by list_models."""
+        with patch("external_review_server.SKILL_CONFIG_YAML", integration_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            from providers.circuit_breaker import BreakerRegistry
+            srv._models_config = load_models_config(integration_env["models_path"])
+            srv._breakers = BreakerRegistry({"failure_threshold": 2})
+            srv._providers.clear()
+            try:
+                with patch(
+                    "providers.openai_compat.OpenAICompatProvider.health_check",
+                    AsyncMock(return_value=False),
+                ):
+                    await srv._run_health_checks()
+                    assert srv.list_models()["models"][0]["circuit"]["state"] == "closed"
+                    await srv._run_health_checks()
+
+                circuit = srv.list_models()["models"][0]["circuit"]
+                assert circuit["state"] == "open"
+                assert circuit["consecutive_failures"] == 2
+
+                with patch(
+                    "providers.openai_compat.OpenAICompatProvider.health_check",
+                    AsyncMock(return_value=True),
+                ):
+                    await srv._run_health_checks()
+                # The next real request decides whether it closes
+                assert srv.list_models()["models"][0]["circuit"]["state"] == "half_open"
+            finally:
+                srv._breakers = None
+                await srv._close_client_pool()
+
+    @pytest.mark.asyncio
+    async def test_health_checks_tolerate_missing_models_route(self, integration_env):
+        """A gateway that 404s GET /models but serves completions keeps its circuit closed."""
+        import httpx
+        import external_review_server as srv
+        from config import load_models_config
+        from providers.circuit_breaker import BreakerRegistry
+
+        def handler(req):
+            if req.url.path.endswith("/models"):
+                return httpx.Response(404, text="Not Found")
+            return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}], "usage": {}})
+
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = httpx.MockTransport(handler)
+            original_init(self_client, **kwargs)
+
+        srv._models_config = load_models_config(integration_env["models_path"])
+        srv._breakers = BreakerRegistry({"failure_threshold": 2})
+        srv._providers.clear()
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            with patch("external_review_server.SKILL_CONFIG_YAML", integration_env["skill_config_path"]):
+                for _ in range(5):
+                    await srv._run_health_checks()
+                assert srv.list_models()["models"][0]["circuit"]["state"] == "closed"
+                result = await srv.review(
+                    models=["test-model"], artifact_path=integration_env["artifact_path"], prompt="p",
+                    stream=False, cache="bypass",
+                )
+                assert result["reviews"][0]["status"] == "success"
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+            srv._breakers = None
+            await srv._close_client_pool()
+
+    @pytest.mark.asyncio
+    async def test_models_yaml_hot_reload(self, integration_env, monkeypatch):
+        """A changed models.yaml is swapped in; unchanged endpoints stay warm."""
+        import os
+        import external_review_server as srv
+        from config import load_models_config
+
+        models_path = integration_env["models_path"]
+        monkeypatch.setattr(srv, "MODELS_YAML", models_path)
+        monkeypatch.setattr(srv, "_models_config", load_models_config(models_path))
+        monkeypatch.setattr(srv, "_models_version", srv._file_version(models_path))
+        srv._providers.clear()
+
+        def rewrite(data):
+            models_path.write_text(data if isinstance(data, str) else yaml.dump(data))
+            st = os.stat(models_path)
+            os.utime(models_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        try:
+            with patch("external_review_server.SKILL_CONFIG_YAML", integration_env["skill_config_path"]):
+                provider, _ = srv._get_provider("test-model")
+                client = provider.client
+                assert await srv._reload_models_config() is False
+
+                data = yaml.safe_load(models_path.read_text())
+                data["models"]["test-model"]["pricing"] = {"input_per_1m": 1.0, "output_per_1m": 2.0}
+                data["models"]["other"] = {
+                    "provider": "google",
+                    "endpoint": "https://api.other.com/v1beta",
+                    "model": "other-v1",
+                    "api_key": "sk-other",
+                }
+                rewrite(data)
+                assert await srv._reload_models_config() is True
+                assert "other" in srv._models_config["models"]
+                assert srv._get_provider("test-model")[0] is provider
+                assert not client.is_closed
+
+                # Retuned rate limits reach the provider's limiter without a restart
+                limiter = provider.rate_limiter("test-v1", srv._models_config["models"]["test-model"].get("rate_limits"))
+                data["models"]["test-model"]["rate_limits"] = {"rpm": 5}
+                rewrite(data)
+                assert await srv._reload_models_config() is True
+                assert srv._get_provider("test-model")[0] is provider
+                tuned = provider.rate_limiter("test-v1", srv._models_config["models"]["test-model"]["rate_limits"])
+                assert tuned is not limiter
+                assert tuned.requests.capacity == 5
+
+                # A broken file keeps the last good config
+                rewrite("models: [unclosed")
+                assert await srv._reload_models_config() is False
+                assert "other" in srv._models_config["models"]
+                assert "config_error" in srv.list_models()
+
+                del data["models"]["test-model"]
+                rewrite(data)
+                assert await srv._reload_models_config() is True
+                assert "config_error" not in srv.list_models()
+                assert list(srv._models_config["models"]) == ["other"]
+                assert client.is_closed
+                assert srv._providers == {}
+        finally:
+            await srv._close_client_pool()
+
+    @pytest.mark.asyncio
+    async def test_broken_stream_never_cached(self, integration_env, tmp_path):
+        """A stream that errors or ends early is a failed review, not a cached partial one."""
+        import httpx
+        import external_review_server as srv
+        from config import load_models_config
+
+        config = yaml.safe_load(integration_env["skill_config_path"].read_text())
+        config["execution"].update({"stream": True, "retry_attempts": 0})
+        config["cache"] = {"enabled": True, "disk_dir": str(tmp_path / "cache")}
+        integration_env["skill_config_path"].write_text(yaml.dump(config))
+        bodies = [
+            'data: {"choices": [{"delta": {"content": "Partial rev"}}]}\n\n'
+            'data: {"error": {"message": "upstream overloaded"}}\n\ndata: [DONE]\n\n',
+            'data: {"choices": [{"delta": {"content": "Partial rev"}}]}\n\n',
+        ]
+        calls = 0
+
+        def handler(req):
+            nonlocal calls
+            calls += 1
+            return httpx.Response(200, text=bodies[calls - 1], headers={"Content-Type": "text/event-stream"})
+
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = httpx.MockTransport(handler)
+            original_init(self_client, **kwargs)
+
+        srv._models_config = load_models_config(integration_env["models_path"])
+        srv._providers.clear()
+        srv._review_cache = None
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            with patch("external_review_server.SKILL_CONFIG_YAML", integration_env["skill_config_path"]):
+                for _ in bodies:
+                    result = await srv.review(
+                        models=["test-model"], artifact_path=integration_env["artifact_path"], prompt="p",
+                    )
+                    review = result["reviews"][0]
+                    assert review["status"] == "error"
+                    assert "cached" not in review
+            assert calls == 2
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+            srv._review_cache = None
+            await srv._close_client_pool()
+
+    def test_lifespan_leaves_config_parsing_off_startup(self):
+        """Entering the lifespan (before `initialize` is answered) doesn't import yaml."""
+        import subprocess
+        import sys
+        code = (
+            "import asyncio, sys\n"
+            "import external_review_server as srv\n"
+            "async def main():\n"
+            "    async with srv._lifespan(srv.mcp):\n"
+            "        assert 'yaml' not in sys.modules\n"
+            "asyncio.run(main())\n"
+        )
+        done = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent, capture_output=True, text=True)
+        assert done.returncode == 0, done.stderr
+
+    @pytest.mark.asyncio
+    async def test_background_loops_read_config_after_first_sleep(self, integration_env, monkeypatch):
+        import asyncio
+        import external_review_server as srv
+        config = yaml.safe_load(integration_env["skill_config_path"].read_text())
+        config["models_reload_interval_seconds"] = 0
+        config["circuit_breaker"] = {"health_check_interval_seconds": 0}
+        integration_env["skill_config_path"].write_text(yaml.dump(config))
+        monkeypatch.setattr(srv, "SKILL_CONFIG_YAML", integration_env["skill_config_path"])
+        monkeypatch.setattr(srv, "DEFAULT_MODELS_RELOAD_INTERVAL", 0.01)
+        monkeypatch.setattr(srv, "DEFAULT_HEALTH_CHECK_INTERVAL", 0.01)
+        checks = AsyncMock()
+        monkeypatch.setattr(srv, "_run_health_checks", checks)
+        # Disabled in config.yaml: each loop ends after its first sleep without running
+        await asyncio.wait_for(asyncio.gather(srv._models_reload_loop(), srv._health_check_loop()), timeout=1)
+        checks.assert_not_called()
+
     def test_mcp_server_importable(self):
         """Server module imports without error."""
         import external_review_server
@@ -0,0 +1,61 @@
+"""Tests for structured issue output parsing."""
+
+import json
+
+from issues import ISSUE_FIELDS, ISSUES_SCHEMA, parse_issues
+
+
+def _issue(**overrides):
+    issue = {
+        "description": "Missing rollback plan",
+        "section": "Deployment",
+        "severity": "High",
+        "complexity": "Medium",
+        "suggested_fix": "Add a rollback section",
+    }
+    issue.update(overrides)
+    return issue
+
+
+class TestParseIssues:
+    def test_object(self):
+        issues, error = parse_issues(json.dumps({"issues": [_issue()]}))
+        assert error is None
+        assert issues == [_issue()]
+
+    def test_code_fence_and_bare_list(self):
+        text = "```json\n" + json.dumps([_issue()]) + "\n```"
+        issues, error = parse_issues(text)
+        assert error is None
+        assert issues[0]["section"] == "Deployment"
+
+    def test_normalizes_and_drops_invalid(self):
+        raw = {"issues": [
+            _issue(severity="critical", complexity=" low "),
+            _issue(severity="Blocker", complexity=None, section=None, suggested_fix=None),
+            {"description": "  "},
+            "not an object",
+        ]}
+        issues, error = parse_issues(json.dumps(raw))
+        assert error is None
+        assert len(issues) == 2
+        assert (issues[0]["severity"], issues[0]["complexity"]) == ("Critical", "Low")
+        assert issues[1]["severity"] is None
+        assert issues[1]["complexity"] is None
+        assert issues[1]["section"] == ""
+        assert issues[1]["suggested_fix"] == ""
+
+    def test_not_json(self):
+        issues, error = parse_issues("## Review\n- looks fine")
+        assert issues is None
+        assert "not valid JSON" in error
+
+    def test_no_issue_list(self):
+        assert parse_issues('{"findings": []}') == (None, "Response has no `issues` list")
+        assert parse_issues(None)[0] is None
+
+
+def test_schema_requires_every_field():
+    item = ISSUES_SCHEMA["properties"]["issues"]["items"]
+    assert item["required"] == list(ISSUE_FIELDS)
+    assert set(item["properties"]) == set(ISSUE_FIELDS)
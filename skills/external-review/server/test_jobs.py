@@ -0,0 +1,96 @@
+"""Tests for the background job store."""
+
+import asyncio
+
+import pytest
+
+from jobs import JobStore
+
+
+async def _result(value, delay=0.0):
+    await asyncio.sleep(delay)
+    return value
+
+
+class TestJobStore:
+    @pytest.mark.asyncio
+    async def test_job_lifecycle(self):
+        store = JobStore()
+        release = asyncio.Event()
+
+        async def run():
+            await release.wait()
+            return {"reviews": [], "models_called": ["m"]}
+
+        job = store.submit(run, {"models": ["m"]})
+        assert job.status()["state"] == "running"
+        assert job.status()["models"] == ["m"]
+        assert store.get(job.id) is job
+        assert store.running() == 1
+
+        await store.wait(job, 0.01)
+        assert job.state == "running"
+        release.set()
+        await store.wait(job, 1)
+        assert job.state == "succeeded"
+        assert job.result == {"reviews": [], "models_called": ["m"]}
+        assert store.running() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_jobs(self):
+        store = JobStore()
+
+        async def boom():
+            raise RuntimeError("provider exploded")
+
+        raised = store.submit(boom, {})
+        reported = store.submit(lambda: _result({"error": "Invalid format: xml"}), {})
+        await asyncio.gather(raised.task, reported.task, return_exceptions=True)
+        assert (raised.state, raised.error) == ("failed", "provider exploded")
+        assert (reported.state, reported.error) == ("failed", "Invalid format: xml")
+        assert reported.result == {"error": "Invalid format: xml"}
+
+    @pytest.mark.asyncio
+    async def test_cancel(self):
+        store = JobStore()
+        stopped = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(60)
+            finally:
+                stopped.set()
+
+        job = store.submit(slow, {})
+        await asyncio.sleep(0)
+        assert await store.cancel(job) is True
+        assert job.state == "cancelled"
+        assert stopped.is_set()
+        assert await store.cancel(job) is False
+
+    @pytest.mark.asyncio
+    async def test_max_running(self):
+        store = JobStore({"max_running": 1})
+        job = store.submit(lambda: _result({}, 60), {})
+        with pytest.raises(RuntimeError, match="Too many running jobs"):
+            store.submit(lambda: _result({}), {})
+        await store.cancel_all()
+        assert job.state == "cancelled"
+        store.submit(lambda: _result({}), {})
+
+    @pytest.mark.asyncio
+    async def test_retention(self):
+        store = JobStore({"max_finished": 2})
+        jobs = [store.submit(lambda n=n: _result({"n": n}), {}) for n in range(3)]
+        await asyncio.gather(*(j.task for j in jobs))
+        await asyncio.sleep(0)
+        assert store.get(jobs[0].id) is None
+        assert [store.get(j.id).result for j in jobs[1:]] == [{"n": 1}, {"n": 2}]
+
+    @pytest.mark.asyncio
+    async def test_results_expire(self):
+        store = JobStore({"result_ttl_seconds": -1})
+        job = store.submit(lambda: _result({}), {})
+        await job.task
+        await asyncio.sleep(0)
+        assert store.get(job.id) is None
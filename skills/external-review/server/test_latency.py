@@ -0,0 +1,86 @@
+"""Tests for rolling latency tracking."""
+
+from latency import AdaptiveTimeouts, LatencyTracker, percentile
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 100) == 100
+
+    def test_empty(self):
+        assert percentile([], 95) is None
+
+
+class TestLatencyTracker:
+    def test_window(self):
+        tracker = LatencyTracker(window=3)
+        for ms in (1000, 10, 20, 30):
+            tracker.record("m", ms)
+        assert tracker.count("m") == 3
+        assert tracker.percentile("m", 100) == 30
+
+    def test_min_samples(self):
+        tracker = LatencyTracker()
+        tracker.record("m", 100)
+        assert tracker.percentile("m", 95, min_samples=5) is None
+        assert tracker.percentile("m", 95) == 100
+        assert tracker.percentile("other", 95) is None
+
+
+class TestAdaptiveTimeouts:
+    SETTINGS = {"min_samples": 3, "multiplier": 2.0, "floor_seconds": 1, "ceiling_seconds": 600,
+                "output_token_weight": 10}
+
+    def test_none_until_min_samples(self):
+        timeouts = AdaptiveTimeouts()
+        timeouts.record("m", 1000, 1000, 100)
+        assert timeouts.timeout("m", 1000, self.SETTINGS) is None
+        assert timeouts.timeout("other", 1000, self.SETTINGS) is None
+
+    def test_scales_with_input_size(self):
+        timeouts = AdaptiveTimeouts()
+        # 1 ms per work unit: 1000 input + 10 × 100 output = 2000 ms
+        for _ in range(3):
+            timeouts.record("m", 2000, 1000, 100)
+        small = timeouts.timeout("m", 1000, self.SETTINGS)
+        large = timeouts.timeout("m", 21000, self.SETTINGS)
+        assert small == 4.0   # 2000 work × 1 ms × 2.0
+        assert large == 44.0  # 22000 work × 1 ms × 2.0
+
+    def test_fast_and_slow_models_differ(self):
+        timeouts = AdaptiveTimeouts()
+        for _ in range(3):
+            timeouts.record("flash", 500, 1000, 100)
+            timeouts.record("reasoner", 60000, 1000, 100)
+        assert timeouts.timeout("flash", 1000, self.SETTINGS) == 1.0
+        assert timeouts.timeout("reasoner", 1000, self.SETTINGS) == 120.0
+
+    def test_clamped_and_output_capped(self):
+        timeouts = AdaptiveTimeouts()
+        for _ in range(3):
+            timeouts.record("m", 2000, 1000, 100)
+        settings = {**self.SETTINGS, "floor_seconds": 10, "ceiling_seconds": 30}
+        assert timeouts.timeout("m", 0, settings) == 10
+        assert timeouts.timeout("m", 10**6, settings) == 30
+        # Expected output capped at max_tokens: 1000 + 10 × 10 = 1100 work
+        assert timeouts.timeout("m", 1000, self.SETTINGS, max_output_tokens=10) == 2.2
+
+    def test_timeouts_widen_the_estimate(self):
+        timeouts = AdaptiveTimeouts()
+        for _ in range(3):
+            timeouts.record("m", 2000, 1000, 100)
+        assert timeouts.timeout("m", 1000, self.SETTINGS) == 4.0
+        # Cut off at 4s: it took at least that, so the next attempt gets longer
+        timeouts.record_timeout("m", 4.0, 1000)
+        assert timeouts.timeout("m", 1000, self.SETTINGS) == 8.0
+        timeouts.record_timeout("m", 8.0, 1000)
+        assert timeouts.timeout("m", 1000, self.SETTINGS) == 16.0
+
+    def test_disabled(self):
+        timeouts = AdaptiveTimeouts()
+        for _ in range(3):
+            timeouts.record("m", 2000, 1000, 100)
+        assert timeouts.timeout("m", 1000, {**self.SETTINGS, "enabled": False}) is None
@@ -0,0 +1,115 @@
+"""Tests for the persistent call ledger."""
+
+import sqlite3
+import time
+
+import pytest
+
+from ledger import REPORTS, CallLedger, content_hash
+
+
+def _row(**overrides):
+    row = {
+        "project": "/p",
+        "artifact": "/p/docs/design.md",
+        "artifact_hash": content_hash("doc"),
+        "model": "a",
+        "endpoint": "https://a",
+        "status": "success",
+        "input_tokens": 100,
+        "output_tokens": 10,
+        "cost_usd": 0.01,
+        "latency_ms": 100,
+        "retries": 0,
+        "cycle": 1,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = CallLedger({"path": str(tmp_path / "sub" / "ledger.db")})
+    yield ledger
+    ledger.close()
+
+
+class TestCallLedger:
+    @pytest.mark.asyncio
+    async def test_append_uses_wal(self, ledger):
+        assert await ledger.append(_row()) is True
+        conn = sqlite3.connect(ledger.path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("SELECT model, day, cycle FROM calls").fetchone() == (
+            "a", time.strftime("%Y-%m-%d", time.gmtime()), 1,
+        )
+        conn.close()
+
+    @pytest.mark.asyncio
+    async def test_cost_by_day(self, ledger):
+        day = 86400
+        now = time.time()
+        await ledger.append(_row(ts=now, cost_usd=0.25))
+        await ledger.append(_row(ts=now, cost_usd=0.5, model="b"))
+        await ledger.append(_row(ts=now - day, cost_usd=1.0))
+        await ledger.append(_row(ts=now, project="/q", cost_usd=None))
+        await ledger.append(_row(ts=now - 90 * day, cost_usd=9.0))
+
+        rows = await ledger.query("cost_by_day", since_days=30)
+        by_key = {(r["day"], r["project"]): r for r in rows}
+        today = time.strftime("%Y-%m-%d", time.gmtime(now))
+        assert by_key[(today, "/p")]["cost_usd"] == 0.75
+        assert by_key[(today, "/p")]["calls"] == 2
+        assert by_key[(today, "/q")]["cost_usd"] == 0
+        assert len(rows) == 3
+
+        assert len(await ledger.query("cost_by_day", since_days=30, project="/q")) == 1
+
+    @pytest.mark.asyncio
+    async def test_latency_percentiles(self, ledger):
+        for ms in range(1, 101):
+            await ledger.append(_row(latency_ms=ms))
+        await ledger.append(_row(latency_ms=99999, status="error"))
+        await ledger.append(_row(model="b", latency_ms=7))
+
+        rows = {r["model"]: r for r in await ledger.query("latency_by_model")}
+        assert rows["a"]["calls"] == 100
+        assert rows["a"]["p50_ms"] == 50
+        assert rows["a"]["p95_ms"] == 95
+        assert rows["a"]["max_ms"] == 100
+        assert rows["b"]["p95_ms"] == 7
+
+    @pytest.mark.asyncio
+    async def test_errors_by_endpoint(self, ledger):
+        await ledger.append(_row())
+        await ledger.append(_row(status="error", retries=2))
+        await ledger.append(_row(endpoint="https://b"))
+
+        rows = {r["endpoint"]: r for r in await ledger.query("errors_by_endpoint")}
+        assert rows["https://a"]["error_rate"] == 0.5
+        assert rows["https://a"]["retries"] == 2
+        assert rows["https://b"]["errors"] == 0
+
+    @pytest.mark.parametrize("report", REPORTS)
+    @pytest.mark.parametrize("filters", [{}, {"project": "/p"}, {"model": "a"}])
+    def test_reports_search_an_index(self, ledger, report, filters):
+        ledger._append(_row())
+        plans = []
+        query = ledger._query
+        ledger._query = lambda sql, params: plans.extend(
+            row[-1] for row in ledger._connect().execute("EXPLAIN QUERY PLAN " + sql, params)
+        ) or query(sql, params)
+        ledger.report(report, since_days=7, **filters)
+        calls_plan = [p for p in plans if " calls " in f" {p} "]
+        assert calls_plan and all(p.startswith("SEARCH calls USING INDEX") for p in calls_plan), plans
+
+    def test_unknown_report(self, ledger):
+        with pytest.raises(ValueError):
+            ledger.report("nope")
+
+    @pytest.mark.asyncio
+    async def test_unwritable_path_does_not_raise(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        ledger = CallLedger({"path": str(blocker / "ledger.db")})
+        assert await ledger.append(_row()) is False
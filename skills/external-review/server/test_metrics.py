@@ -0,0 +1,70 @@
+"""Tests for hot-path metrics."""
+
+from metrics import Histogram, Metrics, summarize
+
+
+class TestHistogram:
+    def test_cumulative_buckets(self):
+        h = Histogram(buckets=(10, 100))
+        for ms in (5, 50, 500):
+            h.observe(ms)
+        assert h.bucket_counts == [1, 2]
+        assert h.count == 3
+        assert h.sum == 555
+
+    def test_summarize(self):
+        a, b = Histogram(), Histogram()
+        for ms in range(1, 51):
+            a.observe(ms)
+        for ms in range(51, 101):
+            b.observe(ms)
+        summary = summarize([a, b])
+        assert summary["count"] == 100
+        assert summary["mean_ms"] == 50.5
+        assert summary["p50_ms"] == 50
+        assert summary["p99_ms"] == 99
+
+    def test_summarize_empty(self):
+        assert summarize([])["p95_ms"] is None
+
+
+class TestMetrics:
+    def test_snapshot_groups_by_model_and_endpoint(self):
+        m = Metrics()
+        m.observe("config_load", 2)
+        m.observe("ttfb", 100, model="a", endpoint="https://x")
+        m.observe("ttfb", 300, model="b", endpoint="https://x")
+        for model in ("a", "a", "b"):
+            m.increment("calls", model=model, endpoint="https://x")
+        m.increment("errors", model="a", endpoint="https://x")
+        m.increment("retries", 2, model="a", endpoint="https://x")
+
+        snap = m.snapshot()
+        assert set(snap["phases"]) == {"config_load", "ttfb"}
+        assert snap["phases"]["ttfb"]["count"] == 2
+        assert snap["models"]["a"]["calls"] == 2
+        assert snap["models"]["a"]["error_rate"] == 0.5
+        assert snap["models"]["a"]["retries"] == 2
+        assert snap["models"]["b"]["error_rate"] == 0
+        assert snap["models"]["b"]["phases"]["ttfb"]["p50_ms"] == 300
+        assert snap["endpoints"]["https://x"]["calls"] == 3
+        assert "config_load" not in snap["endpoints"]["https://x"]["phases"]
+
+    def test_prometheus_text(self):
+        m = Metrics()
+        m.observe("review", 40)
+        m.observe("ttfb", 7, model="a", endpoint="https://x")
+        m.increment("calls", model="a", endpoint="https://x")
+        text = m.to_prometheus()
+        assert "# TYPE external_review_phase_ms histogram" in text
+        assert 'external_review_phase_ms_bucket{phase="review",le="50"} 1' in text
+        assert 'external_review_phase_ms_bucket{phase="review",le="25"} 0' in text
+        assert 'external_review_phase_ms_count{phase="ttfb",model="a",endpoint="https://x"} 1' in text
+        assert 'external_review_calls_total{model="a",endpoint="https://x"} 1' in text
+
+    def test_clear(self):
+        m = Metrics()
+        m.observe("review", 1)
+        m.increment("calls")
+        m.clear()
+        assert m.snapshot()["phases"] == {}
@@ -1,10 +1,14 @@
 """Tests for OpenAI-compatible provider — mocked HTTP."""
 
 import json
+import time
 import pytest
 import httpx
 
+from providers.base import BaseProvider, ReviewResponse
+from providers.circuit_breaker import CLOSED, BreakerRegistry
 from providers.openai_compat import OpenAICompatProvider
+from providers.retry import RetryBudget, RetryPolicy
 
 
 @pytest.fixture
@@ -31,6 +35,17 @@ def mock_auth_error_response():
 
 
 class TestOpenAICompatProvider:
+    def test_subclass_must_implement_response_parsing(self):
+        class Incomplete(BaseProvider):
+            async def review(self, *args, **kwargs):
+                ...
+
+            async def health_check(self):
+                return True
+
+        with pytest.raises(TypeError, match="_parse_completion.*_read_stream|_read_stream.*_parse_completion"):
+            Incomplete(endpoint="https://api.example.com/v1", api_key="sk-test")
+
     @pytest.mark.asyncio
     async def test_success(self, provider):
         transport = httpx.MockTransport(lambda req: mock_success_response())
@@ -159,3 +174,409 @@ class TestOpenAICompatProvider:
             assert "timed out" in result.error.lower()
         finally:
             httpx.AsyncClient.__init__ = original_init
+
+
+def mock_stream_response():
+    events = [
+        {"choices": [{"delta": {"role": "assistant"}}]},
+        {"choices": [{"delta": {"content": "## Review "}}]},
+        {"choices": [{"delta": {"content": "Feedback"}}]},
+        {"choices": [], "usage": {"prompt_tokens": 100, "completion_tokens": 50}},
+    ]
+    body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+    return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+
+class TestOpenAICompatStreaming:
+    @pytest.mark.asyncio
+    async def test_stream_success(self, provider):
+        captured_body = {}
+        chunks = []
+
+        def handler(req):
+            captured_body.update(json.loads(req.content))
+            return mock_stream_response()
+
+        async def on_chunk(delta):
+            chunks.append(delta)
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            result = await provider.review("content", "prompt", "test-model", on_chunk=on_chunk)
+            assert result.status == "success"
+            assert result.response == "## Review Feedback"
+            assert chunks == ["## Review ", "Feedback"]
+            assert result.tokens_used == {"input": 100, "output": 50}
+            assert result.ttft_ms is not None
+            assert result.truncated is False
+            assert captured_body["stream"] is True
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tail, error", [
+        ('data: {"error": {"message": "upstream overloaded"}}\n\ndata: [DONE]\n\n', "upstream overloaded"),
+        ("", "before [DONE]"),
+    ])
+    async def test_stream_error_or_cut_off_is_retried(self, provider, tail, error):
+        partial = 'data: {"choices": [{"delta": {"content": "Partial rev"}}]}\n\n' + tail
+        responses = iter([partial, mock_stream_response().text])
+        transport = httpx.MockTransport(lambda req: httpx.Response(
+            200, text=next(responses), headers={"Content-Type": "text/event-stream"},
+        ))
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        async def on_chunk(delta):
+            pass
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            result = await provider.review(
+                "content", "prompt", "test-model", on_chunk=on_chunk,
+                settings={"_retry_attempts": 1, "_retry_policy": RetryPolicy(base_delay=0.001, max_delay=0.01)},
+            )
+            assert result.status == "success"
+            assert result.response == "## Review Feedback"
+            assert error in result.retry_reasons[0]
+
+            responses = iter([partial])
+            result = await provider.review(
+                "content", "prompt", "test-model", on_chunk=on_chunk, settings={"_retry_attempts": 0},
+            )
+            assert result.status == "error"
+            assert error in result.error
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    async def test_stream_byte_cap_truncates(self, provider):
+        transport = httpx.MockTransport(lambda req: mock_stream_response())
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        async def on_chunk(delta):
+            pass
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            result = await provider.review(
+                "content", "prompt", "test-model",
+                settings={"_max_response_bytes": 10},
+                on_chunk=on_chunk,
+            )
+            assert result.status == "success"
+            assert result.truncated is True
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    async def test_stream_auth_error_no_retry(self, provider):
+        call_count = 0
+
+        def handler(req):
+            nonlocal call_count
+            call_count += 1
+            return mock_auth_error_response()
+
+        async def on_chunk(delta):
+            pass
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            result = await provider.review(
+                "content", "prompt", "test-model",
+                settings={"_retry_attempts": 2},
+                on_chunk=on_chunk,
+            )
+            assert result.status == "error"
+            assert "401" in result.error
+            assert call_count == 1
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+
+class TestOpenAICompatPromptCaching:
+    @pytest.mark.asyncio
+    async def test_cached_tokens_recorded_and_discounted(self, provider):
+        captured_body = {}
+
+        def handler(req):
+            captured_body.update(json.loads(req.content))
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": "ok"}}],
+                "usage": {
+                    "prompt_tokens": 1_000_000,
+                    "completion_tokens": 0,
+                    "prompt_tokens_details": {"cached_tokens": 800_000},
+                },
+            })
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            result = await provider.review(
+                "content", "prompt", "test-model",
+                pricing={"input_per_1m": 1.0, "output_per_1m": 2.0, "cached_input_per_1m": 0.1},
+            )
+            assert result.tokens_used["cached_input"] == 800_000
+            assert result.cost_usd == pytest.approx(0.2 + 0.08)
+            # Stable system prompt leads, artifact follows
+            assert [m["role"] for m in captured_body["messages"]] == ["system", "user"]
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    def test_deepseek_cache_hit_field(self):
+        tokens = OpenAICompatProvider._parse_usage(
+            {"prompt_tokens": 10, "completion_tokens": 5, "prompt_cache_hit_tokens": 8}
+        )
+        assert tokens == {"input": 10, "output": 5, "cached_input": 8}
+
+    def test_cost_without_cached_rate_uses_input_rate(self):
+        cost = ReviewResponse.calculate_cost(
+            {"input": 1_000_000, "output": 0, "cached_input": 500_000},
+            {"input_per_1m": 1.0, "output_per_1m": 2.0},
+        )
+        assert cost == 1.0
+
+
+class TestOpenAICompatCircuitBreaker:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("reply, healthy", [
+        (httpx.Response(200, json={"data": []}), True),
+        # Gateways without /models, or a key the route rejects: the server is still up
+        (httpx.Response(404, text="Not Found"), True),
+        (httpx.Response(401, text="Unauthorized"), True),
+        (httpx.Response(503, text="Unavailable"), False),
+        (httpx.ConnectError("refused"), False),
+    ])
+    async def test_health_check_judged_like_requests(self, provider, reply, healthy):
+        def handler(req):
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            assert await provider.health_check() is healthy
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, provider):
+        calls = 0
+
+        def handler(req):
+            nonlocal calls
+            calls += 1
+            return httpx.Response(503, text="Unavailable")
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            provider.breakers = BreakerRegistry({"failure_threshold": 1})
+            result = await provider.review(
+                "content", "prompt", "test-model", settings={"_retry_attempts": 2}
+            )
+            assert result.status == "error"
+            assert "Circuit open" in result.error
+            assert "HTTP 503" in result.error
+            assert calls == 1
+            assert result.retries_attempted == 1
+
+            result = await provider.review("content", "prompt", "test-model")
+            assert "Circuit open" in result.error
+            assert calls == 1
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_does_not_trip_circuit(self, provider):
+        transport = httpx.MockTransport(lambda req: mock_rate_limit_response())
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            provider.breakers = BreakerRegistry({"failure_threshold": 1})
+            result = await provider.review(
+                "content", "prompt", "test-model", settings={"_retry_attempts": 0}
+            )
+            assert result.error == "HTTP 429"
+            assert provider.circuit_breaker.state == CLOSED
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+
+class TestOpenAICompatStructuredOutput:
+    async def _sent_body(self, provider, settings):
+        sent = {}
+
+        def handler(req):
+            sent.update(json.loads(req.content))
+            return mock_success_response()
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            await provider.review("content", "prompt", "test-model", settings=settings)
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+        return sent
+
+    @pytest.mark.asyncio
+    async def test_json_schema_response_format(self, provider):
+        schema = {"type": "object", "properties": {}}
+        body = await self._sent_body(provider, {"_response_schema": schema})
+        assert body["response_format"]["type"] == "json_schema"
+        assert body["response_format"]["json_schema"]["schema"] == schema
+        assert body["response_format"]["json_schema"]["strict"] is True
+
+    @pytest.mark.asyncio
+    async def test_json_object_and_prompt_modes(self, provider):
+        body = await self._sent_body(
+            provider, {"_response_schema": {}, "_structured_output": "json_object"},
+        )
+        assert body["response_format"] == {"type": "json_object"}
+        body = await self._sent_body(provider, {"_response_schema": {}, "_structured_output": "prompt"})
+        assert "response_format" not in body
+        body = await self._sent_body(provider, {})
+        assert "response_format" not in body
+
+
+class TestOpenAICompatRetryPolicy:
+    FAST = RetryPolicy(base_delay=0.001, max_delay=0.01)
+
+    @pytest.mark.asyncio
+    async def test_retry_reasons_reported(self, provider):
+        responses = iter([httpx.Response(503, text="down"), httpx.Response(502, text="bad"), mock_success_response()])
+        transport = httpx.MockTransport(lambda req: next(responses))
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            result = await provider.review(
+                "content", "prompt", "test-model",
+                settings={"_retry_attempts": 2, "_retry_policy": self.FAST},
+            )
+            assert result.status == "success"
+            assert result.retries_attempted == 2
+            assert result.retry_reasons == ["HTTP 503", "HTTP 502"]
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_stops_retries(self, provider):
+        calls = 0
+
+        def handler(req):
+            nonlocal calls
+            calls += 1
+            return httpx.Response(503, text="down")
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            provider.retry_budget = RetryBudget(ratio=0.0, min_retries=1)
+            result = await provider.review(
+                "content", "prompt", "test-model",
+                settings={"_retry_attempts": 3, "_retry_policy": self.FAST},
+            )
+            assert result.status == "error"
+            assert "retry budget exhausted" in result.error
+            assert calls == 2
+            assert result.retries_attempted == 1
+            assert result.retry_reasons == ["HTTP 503"]
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+
+class TestOpenAICompatDeadline:
+    @pytest.mark.asyncio
+    async def test_backoff_past_deadline_stops(self, provider):
+        timeouts = []
+
+        def handler(req):
+            timeouts.append(req.extensions["timeout"]["read"])
+            return httpx.Response(503, text="Unavailable")
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            start = time.monotonic()
+            result = await provider.review(
+                "content", "prompt", "test-model",
+                settings={"_retry_attempts": 2, "_timeout_seconds": 120, "_deadline": start + 0.5},
+            )
+            assert result.status == "deadline_exceeded"
+            assert "HTTP 503" in result.error
+            assert time.monotonic() - start < 0.5
+            # The attempt's timeout was capped to the time left
+            assert timeouts[0] <= 0.5
+            assert len(timeouts) == 1
+        finally:
+            httpx.AsyncClient.__init__ = original_init
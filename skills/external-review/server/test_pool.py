@@ -0,0 +1,105 @@
+"""Tests for the shared HTTP client pool."""
+
+import httpx
+import pytest
+
+from providers.openai_compat import OpenAICompatProvider
+from providers.pool import ClientPool, endpoint_key
+
+
+class TestEndpointKey:
+    def test_strips_path(self):
+        assert endpoint_key("https://api.example.com/v1") == "https://api.example.com"
+
+    def test_keeps_port(self):
+        assert endpoint_key("http://localhost:8080/v1/") == "http://localhost:8080"
+
+    def test_case_insensitive_host(self):
+        assert endpoint_key("https://API.Example.com/v1") == "https://api.example.com"
+
+
+class TestClientPool:
+    @pytest.mark.asyncio
+    async def test_same_origin_shares_client(self):
+        pool = ClientPool()
+        try:
+            a = pool.get("https://api.example.com/v1")
+            b = pool.get("https://api.example.com/v2")
+            assert a is b
+            assert pool.endpoints() == ["https://api.example.com"]
+        finally:
+            await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_different_origin_separate_clients(self):
+        pool = ClientPool()
+        try:
+            a = pool.get("https://api.a.com/v1")
+            b = pool.get("https://api.b.com/v1")
+            assert a is not b
+        finally:
+            await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_clients(self):
+        pool = ClientPool()
+        client = pool.get("https://api.example.com/v1")
+        await pool.aclose()
+        assert client.is_closed
+        assert pool.endpoints() == []
+        assert pool.get("https://api.example.com/v1") is not client
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_retain_closes_only_unused_origins(self):
+        pool = ClientPool()
+        kept = pool.get("https://api.a.com/v1")
+        dropped = pool.get("https://api.b.com/v1")
+        closed = await pool.retain(["https://api.a.com/v2"])
+        assert closed == ["https://api.b.com"]
+        assert dropped.is_closed
+        assert not kept.is_closed
+        assert pool.get("https://api.a.com/v1") is kept
+        await pool.aclose()
+
+    def test_limits_from_settings(self):
+        pool = ClientPool({"max_connections": 5, "max_keepalive_connections": 2, "http2": False})
+        assert pool.limits.max_connections == 5
+        assert pool.limits.max_keepalive_connections == 2
+        assert pool.http2 is False
+
+    @pytest.mark.asyncio
+    async def test_provider_reuses_client_across_retries(self):
+        created = 0
+        call_count = 0
+        original_init = httpx.AsyncClient.__init__
+
+        def handler(req):
+            nonlocal call_count
+            call_count += 1
+            if call_count < 2:
+                return httpx.Response(503, text="Unavailable")
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": "ok"}}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1},
+            })
+
+        def patched_init(self_client, **kwargs):
+            nonlocal created
+            created += 1
+            kwargs["transport"] = httpx.MockTransport(handler)
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        pool = ClientPool()
+        try:
+            provider = OpenAICompatProvider(
+                endpoint="https://api.example.com/v1", api_key="sk-test", client_pool=pool,
+            )
+            result = await provider.review("content", "prompt", "m", settings={"_retry_attempts": 2})
+            assert result.status == "success"
+            assert call_count == 2
+            assert created == 1
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+            await pool.aclose()
@@ -0,0 +1,176 @@
+"""Tests for provider rate limiting."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from providers.openai_compat import OpenAICompatProvider
+from providers.rate_limit import RateLimiter, TokenBucket, parse_duration, retry_after_seconds
+
+
+class TestParsing:
+    def test_parse_duration(self):
+        assert parse_duration("20ms") == pytest.approx(0.02)
+        assert parse_duration("1s") == 1
+        assert parse_duration("6m0s") == 360
+        assert parse_duration("2.5") == 2.5
+        assert parse_duration("soon") is None
+
+    def test_retry_after_seconds(self):
+        assert retry_after_seconds(httpx.Headers({"Retry-After": "7"})) == 7
+        assert retry_after_seconds(httpx.Headers({"retry-after-ms": "250"})) == 0.25
+        assert retry_after_seconds(httpx.Headers({})) is None
+
+    def test_retry_after_http_date(self):
+        wait = retry_after_seconds(httpx.Headers({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}))
+        assert wait == 0.0
+
+    def test_ratelimit_reset_headers(self):
+        headers = httpx.Headers({
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "2s",
+            "x-ratelimit-remaining-tokens": "100",
+            "x-ratelimit-reset-tokens": "30s",
+        })
+        assert retry_after_seconds(headers) == 2
+
+
+class TestTokenBucket:
+    def test_wait_time(self):
+        bucket = TokenBucket(60)  # 1 per second
+        bucket.take(60)
+        assert bucket.wait_time(1) == pytest.approx(1, abs=0.05)
+
+    def test_amount_capped_at_capacity(self):
+        bucket = TokenBucket(10)
+        assert bucket.wait_time(1000) == 0
+
+
+class TestRateLimiter:
+    def test_aimd(self):
+        limiter = RateLimiter(max_concurrency=8)
+        limiter.on_response(429)
+        assert limiter.concurrency_limit == 4
+        limiter.on_response(429)
+        limiter.on_response(429)
+        limiter.on_response(429)
+        assert limiter.concurrency_limit == 1
+        limiter.on_response(200)
+        assert limiter.concurrency_limit == 2
+        for _ in range(100):
+            limiter.on_response(200)
+        assert limiter.concurrency_limit == 8
+
+    def test_retry_after_pauses(self):
+        limiter = RateLimiter()
+        assert limiter.on_response(429, httpx.Headers({"Retry-After": "5"})) == 5
+        assert limiter.blocked_until > time.monotonic() + 4
+
+    @pytest.mark.asyncio
+    async def test_slot_bounds_concurrency(self):
+        limiter = RateLimiter(max_concurrency=2)
+        active = peak = 0
+
+        async def work():
+            nonlocal active, peak
+            async with limiter.slot():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(work() for _ in range(6)))
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_slot_waits_for_pause(self):
+        limiter = RateLimiter()
+        limiter.pause(0.1)
+        start = time.monotonic()
+        async with limiter.slot():
+            pass
+        assert time.monotonic() - start >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_rpm_enforced(self):
+        limiter = RateLimiter(rpm=600)  # 10 per second, bucket of 600
+        limiter.requests.take(600)
+        start = time.monotonic()
+        async with limiter.slot():
+            pass
+        assert time.monotonic() - start >= 0.09
+
+
+class TestProviderLimiters:
+    def test_rebuilt_when_limits_change(self):
+        provider = OpenAICompatProvider(endpoint="https://api.example.com/v1", api_key="sk-test")
+        limiter = provider.rate_limiter("m", {"rpm": 60})
+        assert provider.rate_limiter("m", {"rpm": 60}) is limiter
+        limiter.blocked_until = time.monotonic() + 30
+
+        tuned = provider.rate_limiter("m", {"rpm": 5})
+        assert tuned is not limiter
+        assert tuned.requests.capacity == 5
+        assert tuned.blocked_until == limiter.blocked_until
+        assert provider.rate_limiter("m", None).requests is None
+
+
+class TestProviderHonoursRetryAfter:
+    @pytest.mark.asyncio
+    async def test_retry_after_replaces_backoff(self):
+        call_count = 0
+
+        def handler(req):
+            nonlocal call_count
+            call_count += 1
+            if call_count == 1:
+                return httpx.Response(429, headers={"Retry-After": "0.1"}, text="slow down")
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": "ok"}}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1},
+            })
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            provider = OpenAICompatProvider(endpoint="https://api.example.com/v1", api_key="sk-test")
+            start = time.monotonic()
+            result = await provider.review("content", "prompt", "m", settings={"_retry_attempts": 2})
+            elapsed = time.monotonic() - start
+            assert result.status == "success"
+            assert call_count == 2
+            assert 0.09 <= elapsed < 1.5  # server wait, not the 2s+ exponential backoff
+            assert provider.rate_limiter("m").concurrency_limit < 8
+        finally:
+            httpx.AsyncClient.__init__ = original_init
+
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_budget_fails_fast(self):
+        def handler(req):
+            return httpx.Response(429, headers={"Retry-After": "3600"}, text="quota")
+
+        transport = httpx.MockTransport(handler)
+        original_init = httpx.AsyncClient.__init__
+
+        def patched_init(self_client, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self_client, **kwargs)
+
+        httpx.AsyncClient.__init__ = patched_init
+        try:
+            provider = OpenAICompatProvider(endpoint="https://api.example.com/v1", api_key="sk-test")
+            start = time.monotonic()
+            result = await provider.review("content", "prompt", "m", settings={"_retry_attempts": 2})
+            assert result.status == "error"
+            assert "429" in result.error
+            assert time.monotonic() - start < 1
+        finally:
+            httpx.AsyncClient.__init__ = original_init
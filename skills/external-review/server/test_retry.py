@@ -0,0 +1,54 @@
+"""Tests for retry backoff and the process-wide retry budget."""
+
+import random
+
+from providers.retry import RetryBudget, RetryPolicy
+
+
+class TestRetryPolicy:
+    def test_decorrelated_jitter_bounds(self):
+        random.seed(0)
+        policy = RetryPolicy(base_delay=1.0, max_delay=30.0)
+        delay = None
+        for _ in range(50):
+            previous = delay
+            delay = policy.next_delay(previous)
+            assert 1.0 <= delay <= min(30.0, max((previous or 1.0) * 3, 1.0))
+
+    def test_capped(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        assert all(policy.next_delay(100.0) <= 5.0 for _ in range(20))
+
+    def test_from_config(self):
+        policy = RetryPolicy.from_config({"base_delay_seconds": 0.5, "max_total_seconds": 10})
+        assert policy.base_delay == 0.5
+        assert policy.max_delay == 30.0
+        assert policy.max_total_seconds == 10.0
+
+
+class TestRetryBudget:
+    def test_min_retries_when_idle(self):
+        budget = RetryBudget(ratio=0.2, min_retries=2)
+        assert budget.try_retry() is True
+        assert budget.try_retry() is True
+        assert budget.try_retry() is False
+        assert budget.snapshot() == {"requests": 0, "retries": 2, "denied": 1}
+
+    def test_ratio_of_requests(self):
+        budget = RetryBudget(ratio=0.2, min_retries=0)
+        for _ in range(50):
+            budget.record_request()
+        allowed = sum(budget.try_retry() for _ in range(30))
+        assert allowed == 10
+
+    def test_window_expires(self):
+        budget = RetryBudget(ratio=0.0, window_seconds=0.0, min_retries=1)
+        assert budget.try_retry() is True
+        # Zero-length window: the previous retry has already aged out
+        assert budget.try_retry() is True
+
+    def test_requests_pruned_without_retries(self):
+        budget = RetryBudget(window_seconds=0.0)
+        for _ in range(1000):
+            budget.record_request()
+        assert len(budget._requests) <= 1
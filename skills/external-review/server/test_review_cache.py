@@ -0,0 +1,87 @@
+"""Tests for the review response cache."""
+
+import json
+import os
+import time
+
+import pytest
+
+from review_cache import ReviewCache, cache_key
+
+
+def _entry(text="## Review"):
+    return {"model": "m", "status": "success", "response": text, "tokens_used": {"input": 1, "output": 1}}
+
+
+class TestCacheKey:
+    def test_stable(self):
+        assert cache_key("m", "v1", {"temperature": 0.5}, "p", "a") == cache_key("m", "v1", {"temperature": 0.5}, "p", "a")
+
+    def test_content_changes_key(self):
+        base = cache_key("m", "v1", {}, "p", "a")
+        assert cache_key("m", "v1", {}, "p", "b") != base
+        assert cache_key("m", "v1", {}, "q", "a") != base
+        assert cache_key("m", "v2", {}, "p", "a") != base
+        assert cache_key("m", "v1", {"temperature": 1}, "p", "a") != base
+
+    def test_private_settings_ignored(self):
+        assert cache_key("m", "v1", {"_timeout_seconds": 5}, "p", "a") == cache_key("m", "v1", {}, "p", "a")
+
+    def test_no_boundary_collisions(self):
+        assert cache_key("m", "v1", {}, "ab", "c") != cache_key("m", "v1", {}, "a", "bc")
+
+
+class TestReviewCache:
+    @pytest.mark.asyncio
+    async def test_memory_roundtrip(self):
+        cache = ReviewCache({"disk_dir": None})
+        await cache.put("k", _entry())
+        assert (await cache.get("k"))["response"] == "## Review"
+        assert await cache.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_memory_lru_eviction(self):
+        cache = ReviewCache({"disk_dir": None, "memory_entries": 2})
+        await cache.put("a", _entry("a"))
+        await cache.put("b", _entry("b"))
+        await cache.get("a")
+        await cache.put("c", _entry("c"))
+        assert await cache.get("b") is None
+        assert await cache.get("a") is not None
+        assert await cache.get("c") is not None
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_memory_clear(self, tmp_path):
+        cache = ReviewCache({"disk_dir": str(tmp_path)})
+        await cache.put("k", _entry())
+        cache.clear_memory()
+        assert (await cache.get("k"))["response"] == "## Review"
+        assert (tmp_path / "k.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, tmp_path):
+        cache = ReviewCache({"disk_dir": str(tmp_path), "ttl_seconds": 60})
+        await cache.put("k", _entry())
+        record = json.loads((tmp_path / "k.json").read_text())
+        record["stored_at"] = time.time() - 120
+        (tmp_path / "k.json").write_text(json.dumps(record))
+        cache.clear_memory()
+        assert await cache.get("k") is None
+        assert not (tmp_path / "k.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_disk_size_cap_evicts_oldest(self, tmp_path):
+        cache = ReviewCache({"disk_dir": str(tmp_path), "max_disk_mb": 0.004})
+        await cache.put("old", _entry("x" * 2000))
+        old = tmp_path / "old.json"
+        os.utime(old, (time.time() - 10, time.time() - 10))
+        await cache.put("new", _entry("y" * 2000))
+        assert not old.exists()
+        assert (tmp_path / "new.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_returned_entries_are_copies(self):
+        cache = ReviewCache({"disk_dir": None})
+        await cache.put("k", _entry())
+        (await cache.get("k"))["response"] = "mutated"
+        assert (await cache.get("k"))["response"] == "## Review"
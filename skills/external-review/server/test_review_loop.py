@@ -0,0 +1,71 @@
+"""Tests for review loop cycle rules and issue tracking."""
+
+from review_loop import ReviewLoop
+
+
+def _issue(description, severity="High"):
+    return {"description": description, "severity": severity, "sources": ["model-a"]}
+
+
+ROLLBACK = "The deployment plan has no rollback procedure"
+RATE_LIMIT = "Public API endpoints have no rate limiting"
+
+
+class TestReviewLoop:
+    def test_complete_when_no_actionable_issues(self):
+        loop = ReviewLoop("/a.md")
+        assert loop.record_cycle([_issue(ROLLBACK)], "h1") == "continue"
+        assert not loop.stopped
+        assert loop.record_cycle([_issue("Typo in the glossary heading", "Low")], "h2") == "complete"
+        assert loop.stopped
+        assert loop.open_issues == []
+        assert [h["decision"] for h in loop.history] == ["continue", "complete"]
+        assert loop.history[1]["issues"] == {"Critical": 0, "High": 0, "Low": 1}
+
+    def test_minimum_cycles(self):
+        loop = ReviewLoop("/a.md", {"min": 2})
+        assert loop.record_cycle([], "h1") == "continue"
+        assert "Minimum" in loop.reason
+        assert loop.record_cycle([], "h2") == "complete"
+
+    def test_stuck_when_issue_persists(self):
+        loop = ReviewLoop("/a.md", {"stuck_signal": 3})
+        loop.record_cycle([_issue(ROLLBACK), _issue(RATE_LIMIT)], "h1")
+        loop.record_cycle([_issue("Rollback procedure missing from the deployment plan")], "h2")
+        assert loop.open_issues[0]["cycles_open"] == 2
+        assert loop.open_issues[0]["first_cycle"] == 1
+        assert loop.record_cycle([_issue("No rollback procedure in the deployment plan")], "h3") == "stuck"
+        assert "1 issue(s)" in loop.reason
+
+    def test_fixed_and_new_issues_reset_streak(self):
+        loop = ReviewLoop("/a.md", {"stuck_signal": 2})
+        loop.record_cycle([_issue(ROLLBACK)], "h1")
+        assert loop.record_cycle([_issue(RATE_LIMIT)], "h2") == "continue"
+        assert loop.open_issues[0]["cycles_open"] == 1
+
+    def test_low_issues_never_stuck(self):
+        loop = ReviewLoop("/a.md", {"min": 5, "stuck_signal": 2})
+        for n in range(3):
+            assert loop.record_cycle([_issue(ROLLBACK, "Low")], f"h{n}") == "continue"
+
+    def test_structural_problem(self):
+        loop = ReviewLoop("/a.md", {"structural_problem_signal": 2, "stuck_signal": 10})
+        issues = ["Data model cannot represent tenants", "Auth design has no session expiry",
+                  "Queue semantics lose messages on restart"]
+        for n, description in enumerate(issues[:2]):
+            assert loop.record_cycle([_issue(description, "Critical")], f"h{n}") == "continue"
+        assert loop.record_cycle([_issue(issues[2], "Critical")], "h3") == "structural_problem"
+
+    def test_max_cycles(self):
+        loop = ReviewLoop("/a.md", {"max": 2, "stuck_signal": 10})
+        loop.record_cycle([_issue(ROLLBACK)], "h1")
+        assert loop.record_cycle([_issue(RATE_LIMIT)], "h2") == "max_cycles"
+
+    def test_summary(self):
+        loop = ReviewLoop("/a.md")
+        loop.record_cycle([_issue(ROLLBACK)], "h1", cost_usd=0.02)
+        summary = loop.summary()
+        assert summary["cycle"] == 1
+        assert summary["stop"] is False
+        assert summary["history"][0]["cost_usd"] == 0.02
+        assert summary["open_issues"][0]["sources"] == ["model-a"]
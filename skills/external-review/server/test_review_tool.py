@@ -1,6 +1,8 @@
 """Tests for review tool — mocked providers, TDD."""
 
+import asyncio
 import os
+import time
 import pytest
 import yaml
 from pathlib import Path
@@ -183,3 +185,1106 @@ class TestReviewTool:
             assert len(result["reviews"]) == 1
             assert result["reviews"][0]["status"] == "error"
             assert "Unknown model" in result["reviews"][0]["error"]
+
+
+class TestReviewStreaming:
+    @pytest.mark.asyncio
+    async def test_streams_with_progress(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+
+            async def fake_review(self, **kwargs):
+                assert kwargs["on_chunk"] is not None
+                await kwargs["on_chunk"]("## Review")
+                return ReviewResponse(
+                    status="success", response="## Review", latency_ms=10, ttft_ms=5,
+                    tokens_used={"input": 1, "output": 1},
+                )
+
+            ctx = AsyncMock()
+            with patch("providers.openai_compat.OpenAICompatProvider.review", fake_review):
+                result = await srv.review(
+                    models=["model-a"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    ctx=ctx,
+                )
+
+            assert result["reviews"][0]["ttft_ms"] == 5
+            ctx.report_progress.assert_awaited_once()
+            assert "model-a" in ctx.report_progress.await_args.kwargs["message"]
+
+    @pytest.mark.asyncio
+    async def test_stream_disabled(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+
+            mock_openai = AsyncMock(return_value=_make_success_response("model-a"))
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_openai):
+                result = await srv.review(
+                    models=["model-a"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    stream=False,
+                )
+
+            assert mock_openai.await_args.kwargs["on_chunk"] is None
+            assert "ttft_ms" not in result["reviews"][0]
+
+
+@pytest.fixture
+def cache_env(setup_env, tmp_path):
+    """setup_env plus an enabled response cache rooted in tmp_path."""
+    config_data = {
+        "version": "1.0.0",
+        "execution": {"timeout_seconds": 60, "retry_attempts": 1, "parallel": True},
+        "cache": {"enabled": True, "disk_dir": str(tmp_path / "cache")},
+    }
+    setup_env["skill_config_path"].write_text(yaml.dump(config_data))
+    import external_review_server as srv
+    srv._review_cache = None
+    yield setup_env
+    srv._review_cache = None
+
+
+class TestReviewCacheModes:
+    async def _review(self, srv, env, cache, cycle=1):
+        return await srv.review(
+            models=["model-a"],
+            artifact_path=env["artifact_path"],
+            prompt="Review this.",
+            cache=cache,
+            cycle=cycle,
+        )
+
+    @pytest.mark.asyncio
+    async def test_second_call_hits_cache(self, cache_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", cache_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(cache_env["models_path"])
+
+            mock_openai = AsyncMock(return_value=_make_success_response("model-a"))
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_openai):
+                first = await self._review(srv, cache_env, "read")
+                second = await self._review(srv, cache_env, "read", cycle=2)
+
+            assert mock_openai.await_count == 1
+            assert first["cache"]["misses"] == 1
+            assert second["cache"] == {"mode": "read", "enabled": True, "hits": 1, "misses": 0}
+            assert second["reviews"][0]["cached"] is True
+            assert second["reviews"][0]["response"] == first["reviews"][0]["response"]
+            assert second["total_tokens"] == {"input": 0, "output": 0, "cached_input": 0}
+            # A hit reports the cycle it was served in, not the one that filled the cache
+            assert first["reviews"][0]["cycle"] == 1
+            assert second["reviews"][0]["cycle"] == 2
+
+    @pytest.mark.asyncio
+    async def test_write_and_bypass_skip_lookup(self, cache_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", cache_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(cache_env["models_path"])
+
+            mock_openai = AsyncMock(return_value=_make_success_response("model-a"))
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_openai):
+                await self._review(srv, cache_env, "read")
+                written = await self._review(srv, cache_env, "write")
+                bypassed = await self._review(srv, cache_env, "bypass")
+
+            assert mock_openai.await_count == 3
+            assert written["cache"]["misses"] == 1
+            assert bypassed["cache"]["enabled"] is False
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self, cache_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", cache_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(cache_env["models_path"])
+
+            mock_fail = AsyncMock(return_value=_make_error_response())
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_fail):
+                await self._review(srv, cache_env, "read")
+                result = await self._review(srv, cache_env, "read")
+
+            assert mock_fail.await_count == 2
+            assert result["cache"]["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_mode(self, cache_env):
+        import external_review_server as srv
+        result = await self._review(srv, cache_env, "sometimes")
+        assert "Invalid cache mode" in result["error"]
+
+
+class TestReviewDeltaMode:
+    @pytest.mark.asyncio
+    async def test_delta_sends_changed_sections(self, setup_env):
+        artifact = Path(setup_env["artifact_path"])
+        body = "\n".join(f"## Section {i}\n" + "Detailed content. " * 20 for i in range(5))
+        artifact.write_text("# Design\n" + body)
+
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+            srv._snapshots.clear()
+
+            mock_openai = AsyncMock(return_value=_make_success_response("model-a"))
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_openai):
+                first = await srv.review(
+                    models=["model-a"], artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.", mode="delta",
+                )
+                artifact.write_text(artifact.read_text().replace("## Section 3\n", "## Section 3\nNew paragraph.\n"))
+                second = await srv.review(
+                    models=["model-a"], artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.", mode="delta", prior_issues=["Section 3 is vague"],
+                )
+
+            assert first["delta"]["applied"] is False
+            assert first["delta"]["reason"] == "no previous snapshot"
+            assert second["delta"]["applied"] is True
+            assert second["delta"]["changed_sections"] == ["Design > Section 3"]
+            assert second["delta"]["sent_chars"] < second["delta"]["full_chars"]
+            sent = mock_openai.await_args.kwargs["artifact_content"]
+            assert "New paragraph." in sent
+            assert "Section 3 is vague" in sent
+            assert sent.count("Detailed content.") == 20
+
+    @pytest.mark.asyncio
+    async def test_delta_unchanged_sends_full(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+            srv._snapshots.clear()
+
+            mock_openai = AsyncMock(return_value=_make_success_response("model-a"))
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_openai):
+                await srv.review(models=["model-a"], artifact_path=setup_env["artifact_path"], prompt="p")
+                result = await srv.review(
+                    models=["model-a"], artifact_path=setup_env["artifact_path"], prompt="p", mode="delta",
+                )
+
+            assert result["delta"]["applied"] is False
+            assert result["delta"]["reason"] == "artifact unchanged"
+            assert mock_openai.await_args.kwargs["artifact_content"] == Path(setup_env["artifact_path"]).read_text()
+
+    @pytest.mark.asyncio
+    async def test_invalid_mode(self, setup_env):
+        import external_review_server as srv
+        result = await srv.review(
+            models=["model-a"], artifact_path=setup_env["artifact_path"], prompt="p", mode="partial",
+        )
+        assert "Invalid review mode" in result["error"]
+
+
+class TestReviewChunking:
+    @pytest.mark.asyncio
+    async def test_oversized_artifact_chunked_per_model_limits(self, setup_env):
+        models_data = yaml.safe_load(setup_env["models_path"].read_text())
+        models_data["models"]["model-a"]["limits"] = {"chunk_tokens": 200, "max_parallel_chunks": 2}
+        setup_env["models_path"].write_text(yaml.dump(models_data))
+        artifact = Path(setup_env["artifact_path"])
+        artifact.write_text("# Design\n" + "".join(f"## S{i}\n" + "text " * 100 + "\n" for i in range(6)))
+
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+
+            mock_openai = AsyncMock(return_value=_make_success_response("model-a"))
+            mock_google = AsyncMock(return_value=_make_success_response("model-b"))
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_openai), \
+                 patch("providers.google.GoogleProvider.review", mock_google):
+                result = await srv.review(
+                    models=["model-a", "model-b"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                )
+
+            reviews = {r["model"]: r for r in result["reviews"]}
+            assert mock_openai.await_count > 1
+            assert reviews["model-a"]["chunks"]["total"] == mock_openai.await_count
+            assert reviews["model-a"]["tokens_used"]["input"] == 100 * mock_openai.await_count
+            assert "## Part 1 of" in reviews["model-a"]["response"]
+            assert mock_google.await_count == 1
+            assert "chunks" not in reviews["model-b"]
+
+
+class TestReviewFallbacks:
+    @pytest.mark.asyncio
+    async def test_fallback_serves_when_primary_fails(self, setup_env):
+        models_data = yaml.safe_load(setup_env["models_path"].read_text())
+        models_data["models"]["model-a"]["fallbacks"] = ["model-b"]
+        setup_env["models_path"].write_text(yaml.dump(models_data))
+
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+
+            mock_openai = AsyncMock(return_value=_make_error_response())
+            mock_google = AsyncMock(return_value=_make_success_response("model-b"))
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_openai), \
+                 patch("providers.google.GoogleProvider.review", mock_google):
+                result = await srv.review(
+                    models=["model-a"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                )
+
+            entry = result["reviews"][0]
+            assert entry["model"] == "model-a"
+            assert entry["status"] == "success"
+            assert entry["served_by"] == "model-b"
+            assert entry["hedged"] is True
+            assert "model-b" in entry["response"]
+
+    @pytest.mark.asyncio
+    async def test_no_fallbacks_no_served_by(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+
+            mock_openai = AsyncMock(return_value=_make_success_response("model-a"))
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_openai):
+                result = await srv.review(
+                    models=["model-a"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                )
+
+            assert "served_by" not in result["reviews"][0]
+
+    def test_hedge_threshold_config_then_p95(self, setup_env):
+        models_data = yaml.safe_load(setup_env["models_path"].read_text())
+        models_data["models"]["model-a"]["hedge_after_ms"] = 1500
+        setup_env["models_path"].write_text(yaml.dump(models_data))
+
+        from config import load_models_config
+        import external_review_server as srv
+        srv._models_config = load_models_config(setup_env["models_path"])
+        srv._latency_tracker.clear()
+
+        assert srv._hedge_threshold_ms("model-a") == 1500
+        assert srv._hedge_threshold_ms("model-b") is None
+        for ms in range(100, 1100, 100):
+            srv._latency_tracker.record("model-b", ms)
+        assert srv._hedge_threshold_ms("model-b") == 1000
+
+
+class TestRetryReporting:
+    @pytest.mark.asyncio
+    async def test_retry_reasons_in_entries(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+
+            ok = _make_success_response("model-a")
+            ok.retries_attempted = 1
+            ok.retry_reasons = ["HTTP 503"]
+            failed = _make_error_response()
+            failed.retry_reasons = ["HTTP 429", "Request timed out"]
+            with patch("providers.openai_compat.OpenAICompatProvider.review", AsyncMock(return_value=ok)), \
+                 patch("providers.google.GoogleProvider.review", AsyncMock(return_value=failed)):
+                result = await srv.review(
+                    models=["model-a", "model-b"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    cache="bypass",
+                )
+
+        by_model = {r["model"]: r for r in result["reviews"]}
+        assert by_model["model-a"]["retries_attempted"] == 1
+        assert by_model["model-a"]["retry_reasons"] == ["HTTP 503"]
+        assert by_model["model-b"]["retry_reasons"] == ["HTTP 429", "Request timed out"]
+
+
+class TestStatsTool:
+    @pytest.mark.asyncio
+    async def test_review_phases_recorded(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+            srv._metrics.clear()
+
+            ok = _make_success_response("model-a")
+            ok.timings = {"connect": 3.0, "ttfb": 40.0, "body": 1.0}
+            with patch("providers.openai_compat.OpenAICompatProvider.review", AsyncMock(return_value=ok)), \
+                 patch("providers.google.GoogleProvider.review", AsyncMock(return_value=_make_error_response())):
+                await srv.review(
+                    models=["model-a", "model-b"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    cache="bypass",
+                )
+
+            stats = srv.stats()
+            for phase in ("config_load", "path_validation", "artifact_read", "aggregation", "review",
+                          "provider", "connect", "ttfb", "body"):
+                assert stats["phases"][phase]["count"] >= 1, phase
+            assert stats["models"]["model-a"]["phases"]["ttfb"]["p50_ms"] == 40.0
+            assert stats["models"]["model-b"]["error_rate"] == 1.0
+            assert stats["models"]["model-b"]["retries"] == 2
+            assert stats["endpoints"]["https://api.a.com"]["calls"] == 1
+            assert set(stats["retry_budget"]) == {"requests", "retries", "denied"}
+
+            prom = srv.stats(format="prometheus")
+            assert 'external_review_errors_total{model="model-b",endpoint="https://api.b.com"} 1' in prom["text"]
+            assert "error" in srv.stats(format="xml")
+
+
+class TestReviewLedger:
+    @pytest.mark.asyncio
+    async def test_calls_recorded_and_queried(self, setup_env, tmp_path):
+        config = yaml.safe_load(setup_env["skill_config_path"].read_text())
+        config["ledger"] = {"enabled": True, "path": str(tmp_path / "ledger.db")}
+        setup_env["skill_config_path"].write_text(yaml.dump(config))
+
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+
+            ok = _make_success_response("model-a")
+            ok.cost_usd = 0.02
+            with patch("providers.openai_compat.OpenAICompatProvider.review", AsyncMock(return_value=ok)), \
+                 patch("providers.google.GoogleProvider.review", AsyncMock(return_value=_make_error_response())):
+                result = await srv.review(
+                    models=["model-a", "model-b"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    cache="bypass",
+                    cycle=3,
+                )
+            assert result["reviews"][0]["cycle"] == 3
+
+            cost = await srv.query_ledger("cost_by_day")
+            assert cost["rows"][0]["calls"] == 2
+            assert cost["rows"][0]["cost_usd"] == 0.02
+            assert cost["rows"][0]["project"] == str(setup_env["project_dir"])
+
+            errors = {r["endpoint"]: r for r in (await srv.query_ledger("errors_by_endpoint"))["rows"]}
+            assert errors["https://api.b.com"]["error_rate"] == 1.0
+            assert errors["https://api.b.com"]["retries"] == 2
+
+            latency = (await srv.query_ledger("latency_by_model", model="model-a"))["rows"]
+            assert latency == [{"model": "model-a", "calls": 1, "p50_ms": 1000, "p95_ms": 1000, "max_ms": 1000}]
+
+            assert "error" in await srv.query_ledger("bogus")
+            srv._ledger.close()
+            srv._ledger = None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_calls_recorded(self, setup_env, tmp_path):
+        config = yaml.safe_load(setup_env["skill_config_path"].read_text())
+        config["ledger"] = {"enabled": True, "path": str(tmp_path / "ledger.db")}
+        setup_env["skill_config_path"].write_text(yaml.dump(config))
+
+        async def hanging_review(*args, **kwargs):
+            await asyncio.sleep(60)
+
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+            srv._jobs = None
+
+            with patch("providers.openai_compat.OpenAICompatProvider.review", hanging_review):
+                result = await srv.review(
+                    models=["model-a"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    cache="bypass",
+                    deadline=1,
+                )
+                assert result["reviews"][0]["status"] == "deadline_exceeded"
+
+                job = await srv.submit_review(models=["model-a"], artifact_path=setup_env["artifact_path"],
+                                              prompt="Review this.", cache="bypass")
+                await asyncio.sleep(0.1)
+                await srv.cancel_review(job["job_id"])
+
+            rows = srv._ledger._query("SELECT model, status, latency_ms FROM calls ORDER BY id", [])
+            assert [r["status"] for r in rows] == ["deadline_exceeded", "cancelled"]
+            assert rows[0]["latency_ms"] >= 900
+            errors = (await srv.query_ledger("errors_by_endpoint"))["rows"]
+            assert errors[0]["errors"] == 2
+            srv._ledger.close()
+            srv._ledger = None
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            import external_review_server as srv
+            result = await srv.query_ledger("cost_by_day")
+        assert "disabled" in result["error"]
+
+
+@pytest.fixture
+def budget_env(setup_env):
+    """model-a priced at $1/$10 per 1M tokens with max_tokens 1000, and a skill budget."""
+    models = yaml.safe_load(setup_env["models_path"].read_text())
+    models["models"]["model-a"]["pricing"] = {"input_per_1m": 1.0, "output_per_1m": 10.0}
+    models["settings"] = {"model-a": {"max_tokens": 1000}}
+    setup_env["models_path"].write_text(yaml.dump(models))
+
+    def configure(**budget):
+        config = yaml.safe_load(setup_env["skill_config_path"].read_text())
+        config["budget"] = budget
+        setup_env["skill_config_path"].write_text(yaml.dump(config))
+
+    setup_env["configure_budget"] = configure
+    return setup_env
+
+
+class TestReviewBudget:
+    async def _review(self, env, provider_mock):
+        from budget import SpendTracker
+        from config import load_models_config
+        import external_review_server as srv
+        srv._models_config = load_models_config(env["models_path"])
+        srv._spend = SpendTracker()
+        with patch("external_review_server.SKILL_CONFIG_YAML", env["skill_config_path"]), \
+             patch("providers.openai_compat.OpenAICompatProvider.review", provider_mock):
+            return await srv.review(
+                models=["model-a"],
+                artifact_path=env["artifact_path"],
+                prompt="Review this.",
+                cache="bypass",
+            )
+
+    @pytest.mark.asyncio
+    async def test_preflight_reported(self, budget_env):
+        result = await self._review(budget_env, AsyncMock(return_value=_make_success_response("model-a")))
+        estimate = result["preflight"]["model-a"]
+        assert estimate["parts"] == 1
+        assert estimate["max_output_tokens"] == 1000
+        assert estimate["token_count"] == "local"
+        assert estimate["projected_cost_usd"] > 0.01
+        assert result["reviews"][0]["status"] == "success"
+
+    @pytest.mark.asyncio
+    async def test_per_call_budget_refuses_before_dispatch(self, budget_env):
+        budget_env["configure_budget"](max_call_usd=0.001)
+        mock = AsyncMock(return_value=_make_success_response("model-a"))
+        result = await self._review(budget_env, mock)
+        assert result["reviews"][0]["status"] == "budget_exceeded"
+        assert "per-call budget" in result["reviews"][0]["error"]
+        mock.assert_not_called()
+
+    @staticmethod
+    def _enable_ledger(env, path):
+        config = yaml.safe_load(env["skill_config_path"].read_text())
+        config["ledger"] = {"enabled": True, "path": str(path)}
+        env["skill_config_path"].write_text(yaml.dump(config))
+
+    @pytest.mark.asyncio
+    async def test_daily_budget_counts_actual_spend(self, budget_env, tmp_path):
+        budget_env["configure_budget"](max_daily_usd=0.05)
+        self._enable_ledger(budget_env, tmp_path / "ledger.db")
+        spent = _make_success_response("model-a")
+        spent.cost_usd = 0.04
+        import external_review_server as srv
+        try:
+            result = await self._review(budget_env, AsyncMock(return_value=spent))
+            assert result["reviews"][0]["status"] == "success"
+
+            # Second call on the same day: $0.04 spent + ~$0.01 projected > $0.05
+            assert srv._spend.spent == 0.04
+            with patch("external_review_server.SKILL_CONFIG_YAML", budget_env["skill_config_path"]), \
+                 patch("providers.openai_compat.OpenAICompatProvider.review", AsyncMock(return_value=spent)):
+                second = await srv.review(
+                    models=["model-a"],
+                    artifact_path=budget_env["artifact_path"],
+                    prompt="Review this.",
+                    cache="bypass",
+                )
+            assert second["reviews"][0]["status"] == "budget_exceeded"
+            assert "daily budget" in second["reviews"][0]["error"]
+        finally:
+            srv._ledger.close()
+            srv._ledger = None
+
+    @pytest.mark.asyncio
+    async def test_daily_budget_counts_other_processes(self, budget_env, tmp_path):
+        from ledger import CallLedger
+        budget_env["configure_budget"](max_daily_usd=0.05)
+        self._enable_ledger(budget_env, tmp_path / "ledger.db")
+        # Another session's server recorded spend today
+        other = CallLedger({"path": str(tmp_path / "ledger.db")})
+        await other.append({"project": "/other", "artifact": "/other/a.md", "artifact_hash": "h", "model": "x",
+                            "endpoint": "https://x", "status": "success", "cost_usd": 0.045})
+        other.close()
+
+        import external_review_server as srv
+        mock = AsyncMock(return_value=_make_success_response("model-a"))
+        try:
+            result = await self._review(budget_env, mock)
+        finally:
+            srv._ledger.close()
+            srv._ledger = None
+        assert result["reviews"][0]["status"] == "budget_exceeded"
+        mock.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_call_counts_its_projected_cost(self, budget_env, tmp_path):
+        from budget import SpendTracker, utc_day
+        from ledger import CallLedger
+        budget_env["configure_budget"](max_daily_usd=5.0)
+        self._enable_ledger(budget_env, tmp_path / "ledger.db")
+
+        async def hanging_review(*args, **kwargs):
+            await asyncio.sleep(60)
+
+        import external_review_server as srv
+        real_append = CallLedger.append
+
+        async def slow_append(self, row):
+            await asyncio.sleep(0.2)
+            await real_append(self, row)
+
+        try:
+            with patch.object(CallLedger, "append", slow_append):
+                task = asyncio.create_task(self._review(budget_env, hanging_review))
+                await asyncio.sleep(0.1)
+                task.cancel()
+                await asyncio.sleep(0.05)
+                # Cancelled again while the ledger row is being written
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                await asyncio.sleep(0.3)
+
+            assert srv._spend.reserved == 0
+            rows = srv._ledger._query("SELECT status, cost_usd FROM calls", [])
+            assert rows[0]["status"] == "cancelled"
+            assert rows[0]["cost_usd"] > 0.01
+            # Another process syncing from the ledger sees the cost too
+            other = SpendTracker()
+            other.sync(utc_day(), await srv._ledger.spent_on(utc_day()))
+            assert other.spent == rows[0]["cost_usd"]
+        finally:
+            srv._ledger.close()
+            srv._ledger = None
+
+    @pytest.mark.asyncio
+    async def test_daily_budget_requires_ledger(self, budget_env):
+        budget_env["configure_budget"](max_daily_usd=5.0)
+        mock = AsyncMock(return_value=_make_success_response("model-a"))
+        result = await self._review(budget_env, mock)
+        assert result["reviews"][0]["status"] == "budget_exceeded"
+        assert "ledger" in result["reviews"][0]["error"]
+        mock.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalid_count_tokens_mode(self, budget_env):
+        budget_env["configure_budget"](count_tokens="remote")
+        result = await self._review(budget_env, AsyncMock())
+        assert "Invalid budget.count_tokens" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_prompt_exceeding_context_refused(self, budget_env):
+        models = yaml.safe_load(budget_env["models_path"].read_text())
+        models["models"]["model-a"]["limits"] = {"context_tokens": 500}
+        budget_env["models_path"].write_text(yaml.dump(models))
+        mock = AsyncMock(return_value=_make_success_response("model-a"))
+        result = await self._review(budget_env, mock)
+        assert result["reviews"][0]["status"] == "error"
+        assert "context" in result["reviews"][0]["error"]
+        mock.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_context_with_too_little_room_refused(self, budget_env):
+        # max_tokens 1000 fits, but leaves ~100 tokens per part: refuse rather than split into slivers
+        models = yaml.safe_load(budget_env["models_path"].read_text())
+        models["models"]["model-a"]["limits"] = {"context_tokens": 1100}
+        budget_env["models_path"].write_text(yaml.dump(models))
+        mock = AsyncMock(return_value=_make_success_response("model-a"))
+        result = await self._review(budget_env, mock)
+        assert result["reviews"][0]["status"] == "error"
+        assert "at least 512 needed" in result["reviews"][0]["error"]
+        mock.assert_not_called()
+
+
+class TestAdaptiveTimeout:
+    async def _review(self, env, mock, **kwargs):
+        import external_review_server as srv
+        with patch("external_review_server.SKILL_CONFIG_YAML", env["skill_config_path"]), \
+             patch("providers.openai_compat.OpenAICompatProvider.review", mock):
+            return await srv.review(
+                models=["model-a"],
+                artifact_path=env["artifact_path"],
+                prompt="Review this.",
+                cache="bypass",
+                **kwargs,
+            )
+
+    @pytest.mark.asyncio
+    async def test_timeout_adapts_after_samples(self, setup_env):
+        from config import load_models_config
+        from latency import AdaptiveTimeouts
+        import external_review_server as srv
+        srv._models_config = load_models_config(setup_env["models_path"])
+        srv._adaptive_timeouts = AdaptiveTimeouts()
+
+        fast = _make_success_response("model-a")
+        fast.latency_ms = 100
+        mock = AsyncMock(return_value=fast)
+        for _ in range(10):
+            await self._review(setup_env, mock)
+        # Config default until there are enough samples
+        assert mock.call_args_list[0].kwargs["settings"]["_timeout_seconds"] == 60
+
+        result = await self._review(setup_env, mock)
+        assert mock.call_args.kwargs["settings"]["_timeout_seconds"] == 15  # floor
+        assert result["preflight"]["model-a"]["timeout_seconds"] == 15
+
+        await self._review(setup_env, mock, timeout=7)
+        assert mock.call_args.kwargs["settings"]["_timeout_seconds"] == 7
+
+    @pytest.mark.asyncio
+    async def test_timeout_recovers_after_slowdown(self, setup_env):
+        from config import load_models_config
+        from latency import AdaptiveTimeouts
+        import external_review_server as srv
+        srv._models_config = load_models_config(setup_env["models_path"])
+        srv._adaptive_timeouts = AdaptiveTimeouts()
+
+        fast = _make_success_response("model-a")
+        fast.latency_ms = 100
+        for _ in range(10):
+            await self._review(setup_env, AsyncMock(return_value=fast))
+
+        # The model now needs 40s: every attempt at the 15s floor times out
+        def slow(**kwargs):
+            if kwargs["settings"]["_timeout_seconds"] < 40:
+                return ReviewResponse(status="error", error="Request timed out", retry_reasons=["Request timed out"])
+            return _make_success_response("model-a")
+
+        mock = AsyncMock(side_effect=slow)
+        statuses = [(await self._review(setup_env, mock))["reviews"][0]["status"] for _ in range(4)]
+        assert mock.call_args_list[0].kwargs["settings"]["_timeout_seconds"] == 15
+        assert statuses[-1] == "success"
+        assert statuses.index("success") <= 2
+
+    @pytest.mark.asyncio
+    async def test_model_timeout_overrides(self, setup_env):
+        from config import load_models_config
+        import external_review_server as srv
+        models = yaml.safe_load(setup_env["models_path"].read_text())
+        models["models"]["model-a"]["timeout_seconds"] = 300
+        setup_env["models_path"].write_text(yaml.dump(models))
+        srv._models_config = load_models_config(setup_env["models_path"])
+
+        mock = AsyncMock(return_value=_make_success_response("model-a"))
+        await self._review(setup_env, mock)
+        assert mock.call_args.kwargs["settings"]["_timeout_seconds"] == 300
+
+
+class TestReviewIssuesFormat:
+    @pytest.mark.asyncio
+    async def test_responses_parsed_into_issues(self, setup_env):
+        import json
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+
+            issue = {"description": "No rollback", "section": "Deploy", "severity": "high",
+                     "complexity": "Low", "suggested_fix": "Add one"}
+            structured = ReviewResponse(status="success", response=json.dumps({"issues": [issue]}),
+                                        tokens_used={"input": 1, "output": 1}, latency_ms=10)
+            prose = ReviewResponse(status="success", response="## Review\nLooks fine.",
+                                   tokens_used={"input": 1, "output": 1}, latency_ms=10)
+            mock_a = AsyncMock(return_value=structured)
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_a), \
+                 patch("providers.google.GoogleProvider.review", AsyncMock(return_value=prose)):
+                result = await srv.review(
+                    models=["model-a", "model-b"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    cache="bypass",
+                    format="issues",
+                )
+
+        by_model = {r["model"]: r for r in result["reviews"]}
+        assert by_model["model-a"]["issues"] == [{**issue, "severity": "High"}]
+        assert "issues_error" in by_model["model-b"]
+        assert by_model["model-b"]["response"].startswith("## Review")
+
+        kwargs = mock_a.call_args.kwargs
+        assert kwargs["settings"]["_response_schema"]["required"] == ["issues"]
+        assert kwargs["settings"]["_structured_output"] == "json_schema"
+        assert "Output format" in kwargs["prompt"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_format(self, setup_env):
+        import external_review_server as srv
+        result = await srv.review(models=["model-a"], artifact_path=setup_env["artifact_path"],
+                                  prompt="p", format="xml")
+        assert "Invalid format" in result["error"]
+
+
+class TestSynthesizeTool:
+    @pytest.mark.asyncio
+    async def test_synthesizes_review_output(self, setup_env):
+        import json
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+
+            structured = ReviewResponse(status="success", tokens_used={"input": 1, "output": 1}, latency_ms=10,
+                                        response=json.dumps({"issues": [{
+                                            "description": "The deployment section has no rollback plan",
+                                            "section": "Deploy", "severity": "High", "complexity": "Low",
+                                            "suggested_fix": "Add one",
+                                        }]}))
+            prose = ReviewResponse(status="success", tokens_used={"input": 1, "output": 1}, latency_ms=10,
+                                   response="## Deploy\n- No rollback plan in the deployment section\n")
+            with patch("providers.openai_compat.OpenAICompatProvider.review", AsyncMock(return_value=structured)), \
+                 patch("providers.google.GoogleProvider.review", AsyncMock(return_value=prose)):
+                result = await srv.review(
+                    models=["model-a", "model-b"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    cache="bypass",
+                    format="issues",
+                )
+
+            synthesis = srv.synthesize(result["reviews"])
+
+        assert synthesis["counts"]["groups"] == 1
+        assert synthesis["issues"][0]["sources"] == ["model-a", "model-b"]
+        assert synthesis["issues"][0]["consensus"] == 2
+        assert synthesis["elapsed_ms"] >= 0
+        assert srv.stats()["phases"]["synthesize"]["count"] >= 1
+
+    def test_invalid_similarity(self):
+        import external_review_server as srv
+        assert "Invalid similarity" in srv.synthesize([], similarity=0)["error"]
+        assert "Invalid similarity" in srv.synthesize([], similarity=1.5)["error"]
+
+
+class TestRunReviewLoop:
+    @staticmethod
+    def _issues_response(*issues):
+        import json
+        return ReviewResponse(status="success", tokens_used={"input": 1, "output": 1}, latency_ms=10,
+                              response=json.dumps({"issues": [
+                                  {"description": d, "section": "", "severity": sev, "complexity": "Low",
+                                   "suggested_fix": ""} for d, sev in issues
+                              ]}))
+
+    @pytest.mark.asyncio
+    async def test_cycles_until_complete(self, setup_env):
+        config = yaml.safe_load(setup_env["skill_config_path"].read_text())
+        config["default_models"] = ["model-a", "model-b"]
+        config["cycles"] = {"min": 1, "max": 10, "structural_problem_signal": 4, "stuck_signal": 3}
+        setup_env["skill_config_path"].write_text(yaml.dump(config))
+        artifact = Path(setup_env["artifact_path"])
+
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+            srv._review_loops.clear()
+
+            found = self._issues_response(("The deployment plan has no rollback procedure", "High"))
+            clean = self._issues_response(("Glossary heading has a typo", "Low"))
+            mock_a, mock_b = AsyncMock(return_value=found), AsyncMock(return_value=found)
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_a), \
+                 patch("providers.google.GoogleProvider.review", mock_b):
+                first = await srv.run_review_loop(setup_env["artifact_path"], "Review this.", cache="bypass")
+                assert first["cycle"] == 1
+                assert first["decision"] == "continue"
+                assert first["stop"] is False
+                assert first["issues"][0]["consensus"] == 2
+                assert "members" not in first["issues"][0]
+                assert "response" not in first["reviews"][0]
+                assert first["open_issues"][0]["cycles_open"] == 1
+                assert "Output format" in mock_a.call_args.kwargs["prompt"]
+
+                # Nothing fixed yet: no models called
+                waiting = await srv.run_review_loop(setup_env["artifact_path"], "Review this.", cache="bypass")
+                assert waiting["decision"] == "awaiting_changes"
+                assert waiting["cycle"] == 1
+                assert mock_a.call_count == 1
+
+                artifact.write_text("# Test Artifact\nNow with a rollback procedure.")
+                mock_a.return_value = mock_b.return_value = clean
+                second = await srv.run_review_loop(setup_env["artifact_path"], "Review this.", cache="bypass")
+                assert second["cycle"] == 2
+                assert second["decision"] == "complete"
+                assert second["stop"] is True
+                assert [h["decision"] for h in second["history"]] == ["continue", "complete"]
+
+                stopped = await srv.run_review_loop(setup_env["artifact_path"], "Review this.", cache="bypass")
+                assert "reset=true" in stopped["note"]
+                assert mock_a.call_count == 2
+
+                restarted = await srv.run_review_loop(setup_env["artifact_path"], "Review this.",
+                                                      cache="bypass", reset=True)
+                assert restarted["cycle"] == 1
+                assert restarted["decision"] == "complete"
+
+    @pytest.mark.asyncio
+    async def test_failed_cycle_not_counted(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+            srv._review_loops.clear()
+
+            with patch("providers.openai_compat.OpenAICompatProvider.review",
+                       AsyncMock(return_value=_make_error_response())):
+                result = await srv.run_review_loop(setup_env["artifact_path"], "Review this.",
+                                                   models=["model-a"], cache="bypass")
+
+        assert result["error"] == "No model returned a review"
+        assert result["cycle"] == 0
+        assert result["reviews"][0]["status"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            import external_review_server as srv
+            assert "No models" in (await srv.run_review_loop(setup_env["artifact_path"], "p"))["error"]
+            assert "error" in await srv.run_review_loop("/nonexistent/file.md", "p", models=["model-a"])
+            assert "Invalid similarity" in (await srv.run_review_loop(
+                setup_env["artifact_path"], "p", models=["model-a"], similarity=0))["error"]
+
+
+class TestReviewJobs:
+    @pytest.mark.asyncio
+    async def test_submit_poll_fetch(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+            srv._jobs = None
+
+            release = asyncio.Event()
+
+            async def slow_review(*args, **kwargs):
+                await release.wait()
+                return _make_success_response("model-a")
+
+            with patch("providers.openai_compat.OpenAICompatProvider.review", slow_review):
+                submitted = await srv.submit_review(
+                    models=["model-a"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    cache="bypass",
+                )
+                job_id = submitted["job_id"]
+                assert submitted["state"] == "running"
+                assert srv.get_review_status(job_id)["state"] == "running"
+
+                pending = await srv.get_review_result(job_id, wait=0.01)
+                assert pending["state"] == "running"
+                assert "result" not in pending
+
+                release.set()
+                done = await srv.get_review_result(job_id, wait=5)
+
+        assert done["state"] == "succeeded"
+        assert done["result"]["reviews"][0]["status"] == "success"
+        assert srv.get_review_status(job_id)["state"] == "succeeded"
+        assert (await srv.cancel_review(job_id))["cancelled"] is False
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_model_calls(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+            srv._jobs = None
+
+            started, stopped = asyncio.Event(), asyncio.Event()
+
+            async def hanging_review(*args, **kwargs):
+                started.set()
+                try:
+                    await asyncio.sleep(60)
+                finally:
+                    stopped.set()
+
+            with patch("providers.openai_compat.OpenAICompatProvider.review", hanging_review):
+                submitted = await srv.submit_review(
+                    models=["model-a"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    cache="bypass",
+                )
+                await asyncio.wait_for(started.wait(), 5)
+                cancelled = await srv.cancel_review(submitted["job_id"])
+
+        assert cancelled["cancelled"] is True
+        assert cancelled["state"] == "cancelled"
+        assert stopped.is_set()
+        assert "result" not in await srv.get_review_result(submitted["job_id"])
+
+    @pytest.mark.asyncio
+    async def test_errors(self, setup_env):
+        import external_review_server as srv
+        srv._jobs = None
+        assert "error" in await srv.submit_review(models=["model-a"], artifact_path="/nonexistent/file.md",
+                                                  prompt="p")
+        assert "Unknown job" in srv.get_review_status("nope")["error"]
+        assert "Unknown job" in (await srv.get_review_result("nope"))["error"]
+        assert "Unknown job" in (await srv.cancel_review("nope"))["error"]
+
+    @pytest.mark.asyncio
+    async def test_submit_validates_off_the_event_loop(self, setup_env):
+        import external_review_server as srv
+        srv._jobs = None
+        with patch("external_review_server.validate_artifact_path",
+                   side_effect=AssertionError("validated on the event loop")), \
+                patch("external_review_server.review", new=AsyncMock(return_value={"reviews": []})):
+            job = await srv.submit_review(models=["model-a"], artifact_path=setup_env["artifact_path"], prompt="p")
+        assert "error" not in job
+        assert job["artifact_path"] == os.path.realpath(setup_env["artifact_path"])
+
+
+class TestReviewDeadline:
+    @pytest.mark.asyncio
+    async def test_deadline_returns_finished_reviews(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+
+            async def slow_review(*args, **kwargs):
+                await asyncio.sleep(10)
+                return _make_success_response("model-b")
+
+            mock_openai = AsyncMock(return_value=_make_success_response("model-a"))
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_openai), \
+                 patch("providers.google.GoogleProvider.review", slow_review):
+                result = await srv.review(
+                    models=["model-a", "model-b"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    deadline=1,
+                )
+
+            statuses = {r["model"]: r["status"] for r in result["reviews"]}
+            assert statuses == {"model-a": "success", "model-b": "deadline_exceeded"}
+            assert result["total_latency_ms"] < 5000
+
+    @pytest.mark.asyncio
+    async def test_deadline_propagated_to_provider(self, setup_env):
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+
+            mock_openai = AsyncMock(return_value=_make_success_response("model-a"))
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_openai):
+                await srv.review(
+                    models=["model-a"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                    deadline=30,
+                )
+                await srv.review(
+                    models=["model-a"],
+                    artifact_path=setup_env["artifact_path"],
+                    prompt="Review this.",
+                )
+
+            with_deadline = mock_openai.call_args_list[0].kwargs["settings"]
+            assert 0 < with_deadline["_deadline"] - time.monotonic() <= 30
+            assert "_deadline" not in mock_openai.call_args_list[1].kwargs["settings"]
+
+
+class TestReviewBatch:
+    @pytest.mark.asyncio
+    async def test_globs_times_models(self, setup_env):
+        docs = setup_env["project_dir"] / "docs"
+        (docs / "design.md").write_text("# Design\nMore content.")
+        (docs / "notes.txt").write_text("not markdown")
+
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+            srv._batch_scheduler = None
+
+            mock_openai = AsyncMock(return_value=_make_success_response("model-a"))
+            mock_google = AsyncMock(return_value=_make_error_response())
+            ctx = AsyncMock()
+            with patch("providers.openai_compat.OpenAICompatProvider.review", mock_openai), \
+                 patch("providers.google.GoogleProvider.review", mock_google):
+                result = await srv.review_batch(
+                    artifacts=["docs/*.md", setup_env["artifact_path"], "missing/*.md"],
+                    models=["model-a", "model-b"],
+                    prompt="Review this.",
+                    ctx=ctx,
+                )
+
+            paths = [Path(a["artifact_path"]).name for a in result["artifacts"]]
+            assert paths == ["brief.md", "design.md"]
+            assert result["pairs"] == 4
+            assert result["succeeded"] == 2
+            for artifact in result["artifacts"]:
+                assert [r["model"] for r in artifact["reviews"]] == ["model-a", "model-b"]
+            assert result["total_tokens"]["input"] == 200
+            assert result["errors"] == [{"artifact_path": "missing/*.md", "error": "No files match: missing/*.md"}]
+            assert mock_openai.call_count == 2
+            assert ctx.report_progress.call_count == 4
+            assert ctx.report_progress.call_args_list[-1].args[:2] == (4, 4)
+
+    @pytest.mark.asyncio
+    async def test_per_provider_limit(self, setup_env):
+        docs = setup_env["project_dir"] / "docs"
+        for i in range(4):
+            (docs / f"part{i}.md").write_text(f"# Part {i}\n")
+        config = yaml.safe_load(setup_env["skill_config_path"].read_text())
+        config["batch"] = {"max_concurrency": 8, "max_per_provider": 2}
+        setup_env["skill_config_path"].write_text(yaml.dump(config))
+
+        with patch("external_review_server.SKILL_CONFIG_YAML", setup_env["skill_config_path"]):
+            from config import load_models_config
+            import external_review_server as srv
+            srv._models_config = load_models_config(setup_env["models_path"])
+            srv._batch_scheduler = None
+
+            in_flight = {"now": 0, "peak": 0}
+
+            async def slow_review(*args, **kwargs):
+                in_flight["now"] += 1
+                in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+                await asyncio.sleep(0.02)
+                in_flight["now"] -= 1
+                return _make_success_response("model-a")
+
+            with patch("providers.openai_compat.OpenAICompatProvider.review", slow_review):
+                result = await srv.review_batch(
+                    artifacts=["docs/*.md"],
+                    models=["model-a"],
+                    prompt="Review this.",
+                    cache="bypass",
+                )
+
+            assert result["succeeded"] == 5
+            assert in_flight["peak"] == 2
+            assert result["scheduler"] == {"max_concurrency": 8, "max_per_provider": 2}
+            srv._batch_scheduler = None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cache_mode(self, setup_env):
+        import external_review_server as srv
+        result = await srv.review_batch(artifacts=["docs/*.md"], models=["model-a"], prompt="x", cache="nope")
+        assert "Invalid cache mode" in result["error"]
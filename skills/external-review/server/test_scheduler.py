@@ -0,0 +1,58 @@
+"""Tests for the batch review scheduler."""
+
+import asyncio
+
+import pytest
+
+from scheduler import BatchScheduler
+
+
+async def _run(scheduler, keys, hold=0.02):
+    peak = {"global": 0}
+    per_key: dict[str, int] = {}
+    peaks: dict[str, int] = {}
+
+    async def job(key):
+        async with scheduler.slot(key):
+            per_key[key] = per_key.get(key, 0) + 1
+            peaks[key] = max(peaks.get(key, 0), per_key[key])
+            peak["global"] = max(peak["global"], scheduler.in_flight)
+            await asyncio.sleep(hold)
+            per_key[key] -= 1
+
+    await asyncio.gather(*(job(k) for k in keys))
+    return peak["global"], peaks
+
+
+class TestBatchScheduler:
+    @pytest.mark.asyncio
+    async def test_global_limit(self):
+        scheduler = BatchScheduler({"max_concurrency": 3, "max_per_provider": 10})
+        peak, _ = await _run(scheduler, [f"p{i}" for i in range(10)])
+        assert peak == 3
+        assert scheduler.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_per_provider_limit(self):
+        scheduler = BatchScheduler({"max_concurrency": 10, "max_per_provider": 2})
+        peak, peaks = await _run(scheduler, ["a"] * 6 + ["b"] * 2)
+        assert peaks == {"a": 2, "b": 2}
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_saturated_provider_does_not_block_others(self):
+        scheduler = BatchScheduler({"max_concurrency": 2, "max_per_provider": 1})
+        order = []
+
+        async def job(key, hold):
+            async with scheduler.slot(key):
+                order.append(key)
+                await asyncio.sleep(hold)
+
+        await asyncio.gather(job("a", 0.05), job("a", 0.05), job("b", 0))
+        assert order[:2] == ["a", "b"]
+
+    def test_defaults(self):
+        scheduler = BatchScheduler()
+        assert scheduler.max_concurrency == 8
+        assert scheduler.max_per_provider == 4
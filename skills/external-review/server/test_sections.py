@@ -0,0 +1,73 @@
+"""Tests for markdown section splitting and delta payloads."""
+
+from sections import build_delta_content, diff_sections, split_sections
+
+DOC = """Intro line.
+
+# Design
+Overview.
+
+## API
+GET /items
+
+```bash
+# not a heading
+```
+
+## Storage
+SQLite.
+"""
+
+
+class TestSplitSections:
+    def test_splits_on_headings(self):
+        sections = split_sections(DOC)
+        assert [s.label for s in sections] == [
+            "(preamble)", "Design", "Design > API", "Design > Storage",
+        ]
+
+    def test_ignores_headings_in_code_fences(self):
+        api = split_sections(DOC)[2]
+        assert "# not a heading" in api.text
+
+    def test_roundtrip(self):
+        assert "".join(s.text for s in split_sections(DOC)) == DOC
+
+    def test_no_headings(self):
+        sections = split_sections("just text\n")
+        assert len(sections) == 1
+        assert sections[0].level == 0
+
+
+class TestDiffSections:
+    def test_unchanged(self):
+        assert not diff_sections(DOC, DOC).has_changes
+
+    def test_modified_and_added(self):
+        new = DOC.replace("SQLite.", "Postgres.") + "\n## Security\nTLS.\n"
+        diff = diff_sections(DOC, new)
+        assert [s.label for s in diff.changed] == ["Design > Storage", "Design > Security"]
+        assert diff.removed == []
+
+    def test_removed(self):
+        new = DOC.replace("## Storage\nSQLite.\n", "")
+        diff = diff_sections(DOC, new)
+        assert [s.label for s in diff.removed] == ["Design > Storage"]
+
+    def test_repeated_headings_keyed_by_occurrence(self):
+        old = "# A\n## Notes\none\n## Notes\ntwo\n"
+        new = "# A\n## Notes\none\n## Notes\nthree\n"
+        diff = diff_sections(old, new)
+        assert len(diff.changed) == 1
+        assert "three" in diff.changed[0].text
+
+
+class TestBuildDeltaContent:
+    def test_contains_changed_only_plus_outline(self):
+        new = DOC.replace("SQLite.", "Postgres.")
+        content = build_delta_content(diff_sections(DOC, new), ["Storage choice unjustified"])
+        assert "Postgres." in content
+        assert "GET /items" not in content
+        assert "## API [unchanged]" in content
+        assert "## Storage [CHANGED]" in content
+        assert "1. Storage choice unjustified" in content
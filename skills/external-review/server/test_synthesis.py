@@ -0,0 +1,138 @@
+"""Tests for cross-model issue deduplication."""
+
+import time
+
+from benchmarks.synthesis_bench import make_reviews
+from synthesis import extract_text_issues, match_issues, synthesize_reviews
+
+
+def _review(model, *issues, **extra):
+    return {"model": model, "status": "success", "issues": list(issues), **extra}
+
+
+def _issue(description, severity="High", complexity="Low", section="", suggested_fix=""):
+    return {
+        "description": description, "section": section, "severity": severity,
+        "complexity": complexity, "suggested_fix": suggested_fix,
+    }
+
+
+class TestSynthesizeReviews:
+    def test_groups_paraphrases_across_models(self):
+        result = synthesize_reviews([
+            _review("model-a",
+                    _issue("The design lacks a rollback plan for failed deployments", "High", "Medium",
+                           section="Deployment"),
+                    _issue("No rate limiting on the public API endpoints", "Critical")),
+            _review("model-b",
+                    _issue("Missing rollback plan when a deployment fails", "Critical", "Low",
+                           suggested_fix="Document rollback steps")),
+            _review("model-c", _issue("Rollback plan for failed deployments is missing", "Low", "High")),
+        ])
+
+        assert result["counts"]["input_issues"] == 4
+        assert result["counts"]["groups"] == 2
+        assert result["counts"]["multi_model"] == 1
+        top = result["issues"][0]
+        assert top["id"] == 1
+        assert top["sources"] == ["model-a", "model-b", "model-c"]
+        assert top["consensus"] == 3
+        # Most severe and most complex member wins; the fix comes from whoever gave one
+        assert (top["severity"], top["complexity"]) == ("Critical", "High")
+        assert top["description"] == "Missing rollback plan when a deployment fails"
+        assert top["suggested_fix"] == "Document rollback steps"
+        assert top["section"] == "Deployment"
+        assert len(top["members"]) == 3
+        assert result["issues"][1]["consensus"] == 1
+        assert result["counts"]["severity"] == {"Critical": 2, "High": 0, "Low": 0, "unclassified": 0}
+
+    def test_unrelated_issues_stay_apart(self):
+        result = synthesize_reviews([
+            _review("model-a", _issue("Cache invalidation strategy is undefined")),
+            _review("model-b", _issue("Error messages leak stack traces to clients")),
+        ])
+        assert [g["consensus"] for g in result["issues"]] == [1, 1]
+
+    def test_same_model_findings_not_merged(self):
+        result = synthesize_reviews([
+            _review("model-a", _issue("Missing index on the orders table"),
+                    _issue("Missing index on the orders table lookups")),
+        ])
+        assert result["counts"]["groups"] == 2
+
+    def test_similarity_threshold(self):
+        reviews = [
+            _review("model-a", _issue("Token budget not enforced for batch reviews")),
+            _review("model-b", _issue("Batch reviews can exceed the configured spend limit")),
+        ]
+        assert synthesize_reviews(reviews)["counts"]["groups"] == 2
+        assert synthesize_reviews(reviews, threshold=0.1)["counts"]["groups"] == 1
+
+    def test_failed_reviews_skipped_and_text_fallback(self):
+        text = "## Security\n- Secrets are logged in plain text. Severity: Critical\n- ok\n"
+        result = synthesize_reviews([
+            {"model": "model-a", "status": "error", "error": "timeout"},
+            {"model": "model-b", "status": "success", "response": text},
+            {"model": "model-c", "status": "success", "response": '{"issues": []}'},
+            _review("model-d", {"description": "Secrets written to the logs as plain text"}, {"section": "x"}),
+        ])
+        assert result["skipped"] == [{"model": "model-a", "reason": "error"}]
+        assert result["models"] == [
+            {"model": "model-b", "issues": 1, "source": "text"},
+            {"model": "model-c", "issues": 0, "source": "issues"},
+            {"model": "model-d", "issues": 1, "source": "issues"},
+        ]
+        assert result["counts"]["groups"] == 1
+        group = result["issues"][0]
+        assert group["sources"] == ["model-b", "model-d"]
+        assert group["severity"] == "Critical"
+        assert group["section"] == "Security"
+
+    def test_empty(self):
+        result = synthesize_reviews([])
+        assert result["issues"] == []
+        assert result["counts"]["groups"] == 0
+
+    def test_dozens_of_reviews_in_milliseconds(self):
+        reviews, expected = make_reviews(models=36, issues=15, distinct=60)
+        start = time.perf_counter()
+        result = synthesize_reviews(reviews)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        assert result["counts"]["groups"] == expected
+        assert all(g["consensus"] == len(g["members"]) for g in result["issues"])
+        # Generous bound for slow CI; typically well under 50ms
+        assert elapsed_ms < 1000
+
+
+class TestExtractTextIssues:
+    def test_list_items_with_sections_and_tags(self):
+        text = (
+            "# Review\n"
+            "Overall solid.\n"
+            "## Data model\n"
+            "1. **Orders table** has no index on customer_id (Severity: High, Complexity: Low).\n"
+            "   Lookups will scan the table.\n"
+            "2. Nit\n"
+            "* Retention policy for audit rows is missing\n"
+        )
+        issues = extract_text_issues(text)
+        assert [i["description"] for i in issues] == [
+            "Orders table has no index on customer_id Lookups will scan the table.",
+            "Retention policy for audit rows is missing",
+        ]
+        assert issues[0]["section"] == "Data model"
+        assert (issues[0]["severity"], issues[0]["complexity"]) == ("High", "Low")
+        assert issues[1]["severity"] is None
+
+    def test_no_list(self):
+        assert extract_text_issues("Looks good to me.") == []
+        assert extract_text_issues(None) == []
+
+
+def test_match_issues():
+    previous = ["The deployment plan has no rollback procedure", "Public API endpoints have no rate limiting"]
+    current = ["Rate limiting is missing on the public API endpoints", "Glossary terms are undefined",
+               "Rollback procedure missing from the deployment plan"]
+    assert match_issues(previous, current) == [1, None, 0]
+    assert match_issues([], current) == [None, None, None]
+    assert match_issues(previous, []) == []
@@ -0,0 +1,53 @@
+"""Tests for JSON wire helpers and request body templates."""
+
+import json
+
+import pytest
+
+from providers import wire
+from providers.wire import BodyTemplate, Slot, TemplateCache, encode_string
+
+
+class TestEncodeString:
+    def test_matches_json(self):
+        text = 'quote " backslash \\ newline \n tab \t unicode é 漢 \x00'
+        assert json.loads(encode_string(text)) == text
+
+    def test_large_strings_cached_by_identity(self):
+        text = "x" * wire.ENCODE_CACHE_MIN_CHARS
+        first = encode_string(text)
+        assert encode_string(text) is first
+        # Equal but distinct object: encoded again (no hashing of large strings)
+        other = "".join(["x"] * wire.ENCODE_CACHE_MIN_CHARS)
+        assert encode_string(other) is not first
+        assert encode_string(other) == first
+
+
+class TestBodyTemplate:
+    def test_render_round_trips(self):
+        body = {
+            "model": "m",
+            "messages": [{"role": "system", "content": Slot("prompt")},
+                         {"role": "user", "content": Slot("artifact")}],
+            "temperature": 0.2,
+        }
+        artifact = "# Doc\n" + "line with \"quotes\"\n" * 500
+        rendered = BodyTemplate(body).render(prompt="Review.", artifact=artifact)
+        assert json.loads(rendered) == {
+            "model": "m",
+            "messages": [{"role": "system", "content": "Review."},
+                         {"role": "user", "content": artifact}],
+            "temperature": 0.2,
+        }
+
+    def test_missing_slot_value(self):
+        template = BodyTemplate({"a": Slot("x")})
+        with pytest.raises(KeyError):
+            template.render()
+
+    def test_cache_reuses_templates(self):
+        cache = TemplateCache(max_entries=1)
+        body = {"model": "m", "content": Slot("artifact")}
+        assert cache.get(body) is cache.get(dict(body))
+        other = cache.get({"model": "n", "content": Slot("artifact")})
+        assert cache.get(body) is not other